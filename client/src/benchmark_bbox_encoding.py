@@ -0,0 +1,123 @@
+import os
+import time
+
+import numpy as np
+from statistics import mean
+
+from protos import inference_pb2 as pb2
+from utils.packed_bbox import packed_bbox_to_numpy, packed_labels
+
+
+# ===== CONFIG =====
+BOX_COUNTS = [int(n) for n in os.getenv("BOX_COUNTS", "10,100,1000").split(",")]
+ITERATIONS = int(os.getenv("ITERATIONS", "500"))
+NUM_CLASSES = int(os.getenv("NUM_CLASSES", "20"))
+# ==================
+
+
+def make_boxes(n: int):
+    rng = np.random.default_rng(n)
+    xywh = (rng.random((n, 4)) * [1800, 1000, 200, 200]).astype(np.float32)
+    conf = rng.random(n).astype(np.float32)
+    cls = rng.integers(0, NUM_CLASSES, n).astype(np.int32)
+    return xywh, conf, cls
+
+
+def class_table() -> dict:
+    # o cliente guarda a tabela (GetModelInfo); a resposta só traz o etag
+    return {i: f"defeito_{i}" for i in range(NUM_CLASSES)}
+
+
+def encode_list(xywh, conf, cls) -> bytes:
+    # forma atual: uma submensagem BBox (com label string) por box
+    resp = pb2.InferResponse(model_name="bench", model_info_etag="0123456789abcdef")
+    resp.list_bbox.extend(
+        pb2.BBox(x=x, y=y, w=w, h=h, label=f"defeito_{c}", class_id=c, confidence=s)
+        for (x, y, w, h), s, c in zip(xywh.tolist(), conf.tolist(), cls.tolist())
+    )
+    return resp.SerializeToString()
+
+
+def encode_packed(xywh, conf, cls) -> bytes:
+    resp = pb2.InferResponse(model_name="bench", model_info_etag="0123456789abcdef")
+    resp.packed_bbox.CopyFrom(
+        pb2.PackedBBoxes(
+            x=xywh[:, 0].tolist(),
+            y=xywh[:, 1].tolist(),
+            w=xywh[:, 2].tolist(),
+            h=xywh[:, 3].tolist(),
+            confidence=conf.tolist(),
+            class_id=cls.tolist(),
+        )
+    )
+    return resp.SerializeToString()
+
+
+def decode_list(data: bytes):
+    resp = pb2.InferResponse.FromString(data)
+    return [(b.x, b.y, b.w, b.h, b.confidence, b.class_id, b.label) for b in resp.list_bbox]
+
+
+def decode_packed(data: bytes, names: dict):
+    resp = pb2.InferResponse.FromString(data)
+    xywh, conf, cls = packed_bbox_to_numpy(resp)
+    return xywh, conf, cls, packed_labels(cls, names)
+
+
+def timed_ms(fn) -> float:
+    out = []
+    for _ in range(ITERATIONS):
+        t0 = time.perf_counter()
+        fn()
+        out.append(time.perf_counter() - t0)
+    return mean(out) * 1000.0
+
+
+def bench_defect_list(xywh, conf, cls) -> None:
+    """Custo de repetir o defect_list em toda resposta vs só o model_info_etag."""
+    defects = [
+        pb2.DefectInfo(
+            name=f"defeito_{i}", class_id=i, ui_color=pb2.RGB(r=255, g=i, b=0), mask_color=pb2.RGB(r=i, g=i, b=i)
+        )
+        for i in range(NUM_CLASSES)
+    ]
+    packed = pb2.InferResponse.FromString(encode_packed(xywh, conf, cls)).packed_bbox
+
+    def with_defects():
+        return pb2.InferResponse(model_name="bench", packed_bbox=packed, defect_list=defects).SerializeToString()
+
+    def with_etag():
+        return pb2.InferResponse(model_name="bench", packed_bbox=packed, model_info_etag="0123456789abcdef").SerializeToString()
+
+    print(f"\n-- defect_list ({NUM_CLASSES} classes) por resposta, boxes={len(cls)} --")
+    for name, fn in (("defect_list", with_defects), ("etag", with_etag)):
+        print(f"{name:<12} bytes={len(fn()):<8} serialize={timed_ms(fn):8.3f} ms")
+
+
+def main():
+    names = class_table()
+    print(f"\n=== Encoding das bboxes (list_bbox vs packed_bbox) | {ITERATIONS} iterações ===")
+    for n in BOX_COUNTS:
+        xywh, conf, cls = make_boxes(n)
+        list_bytes = encode_list(xywh, conf, cls)
+        packed_bytes = encode_packed(xywh, conf, cls)
+
+        # os dois formatos carregam as mesmas boxes
+        decoded_xywh, _, decoded_cls, _ = decode_packed(packed_bytes, names)
+        if not (np.array_equal(decoded_xywh, xywh) and np.array_equal(decoded_cls, cls)):
+            raise RuntimeError("packed_bbox não reproduz as boxes de entrada")
+
+        print(f"\n-- boxes={n} --")
+        for name, enc, dec, data in (
+            ("list_bbox", encode_list, decode_list, list_bytes),
+            ("packed_bbox", encode_packed, lambda d: decode_packed(d, names), packed_bytes),
+        ):
+            enc_ms = timed_ms(lambda: enc(xywh, conf, cls))
+            dec_ms = timed_ms(lambda: dec(data))
+            print(f"{name:<12} bytes={len(data):<8} encode={enc_ms:8.3f} ms  decode={dec_ms:8.3f} ms")
+
+    bench_defect_list(*make_boxes(BOX_COUNTS[0]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import os
+import time
+from statistics import mean
+
+import numpy as np
+
+from schemas.cam_module_schema import VALIDATION_MODES, CamModuleMetadata
+
+
+# ===== CONFIG =====
+# WxH das câmeras da linha (20 MP e 24 MP por padrão)
+FRAME_SIZES = [tuple(int(v) for v in s.split("x")) for s in os.getenv("FRAME_SIZES", "5472x3648,5120x4800").split(",")]
+ITERATIONS = int(os.getenv("ITERATIONS", "20"))
+MODES = os.getenv("MODES", "Mono12,Mono12Packed").split(",")
+# ==================
+
+
+def timed_ms(fn) -> float:
+    fn()  # warmup
+    out = []
+    for _ in range(ITERATIONS):
+        t0 = time.perf_counter()
+        fn()
+        out.append(time.perf_counter() - t0)
+    return mean(out) * 1000.0
+
+
+def legacy_set(image_matrix: np.ndarray) -> np.ndarray:
+    # setter antigo: min() + max() (duas passadas) e reshape(-1), que copia view não contígua
+    vmin, vmax = int(image_matrix.min()), int(image_matrix.max())
+    if vmin < 0 or vmax > 4095:
+        raise ValueError("fora do range")
+    return image_matrix.reshape(-1)
+
+
+def main():
+    rng = np.random.default_rng(0)
+    for w, h in FRAME_SIZES:
+        # buffer da câmera com 64 px de padding por linha: o frame útil é uma view não contígua
+        buf = rng.integers(0, 4096, (h, w + 64), dtype=np.uint16)
+        inputs = {"contíguo": np.ascontiguousarray(buf[:, :w]), "view c/ stride": buf[:, :w]}
+
+        print(f"\n=== CamModuleMetadata.set_image_matrix {w}x{h} ({w * h / 1e6:.1f} MP) | {ITERATIONS} iterações ===")
+        for label, frame in inputs.items():
+            print(f"{'Mono12 legado (min+max)':<32} {label:<15} {timed_ms(lambda: legacy_set(frame)):8.2f} ms")
+            for mode in MODES:
+                for validation in VALIDATION_MODES:
+                    meta = CamModuleMetadata(mode, validation=validation)
+                    ms = timed_ms(lambda: meta.set_image_matrix(frame))
+                    print(f"{mode + ' ' + validation:<32} {label:<15} {ms:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+import os
+import time
+import grpc
+import cv2
+import numpy as np
+from statistics import mean
+
+from protos import inference_pb2 as pb2
+from protos import inference_pb2_grpc as pb2_grpc
+from schemas.cam_module_schema import CamModuleMetadata
+from utils.raw_image import cam_metadata_to_raw_image, ndarray_to_raw_image
+
+
+# ===== CONFIG =====
+TARGET = os.getenv("TARGET", "server_grcp_gpu:50051")
+
+IMAGE_DIR = os.getenv("IMAGE_DIR", "/workspaces/Client-Server-gRCP/client/src/img/")
+IMAGE_NAME = os.getenv("IMAGE_NAME", "test.jpg")
+
+ITERATIONS = int(os.getenv("ITERATIONS", "200"))
+JPEG_QUALITY = int(os.getenv("JPEG_QUALITY", "90"))
+CONFIDENCE = float(os.getenv("CONFIDENCE", "0.10"))
+TIMEOUT = float(os.getenv("GRPC_TIMEOUT_SEC", "10.0"))
+BENCH_REMOTE = os.getenv("BENCH_REMOTE", "false").lower() in ("1", "true", "yes", "y")
+MODEL_IMGSZ = int(os.getenv("MODEL_IMGSZ", "640"))
+
+MAX_MSG = 64 * 1024 * 1024
+# ==================
+
+
+def percentile(sorted_vals, p: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    idx = int(p * (len(sorted_vals) - 1))
+    return sorted_vals[idx]
+
+
+def timed(fn, n: int):
+    out = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        fn()
+        out.append(time.perf_counter() - t0)
+    return sorted(out)
+
+
+def report(name: str, lat_sorted) -> None:
+    print(
+        f"{name:<34} avg={mean(lat_sorted) * 1000:8.3f} ms  "
+        f"p50={percentile(lat_sorted, 0.50) * 1000:8.3f} ms  "
+        f"p99={percentile(lat_sorted, 0.99) * 1000:8.3f} ms"
+    )
+
+
+def bench_local(img: np.ndarray) -> None:
+    """
+    Custo de preparar a imagem nos dois lados, sem rede:
+      JPEG: imencode no cliente + imdecode no servidor
+      RAW : tobytes no cliente + np.ndarray sobre os bytes no servidor (zero-copy)
+    """
+    jpg = cv2.imencode(".jpg", img, [int(cv2.IMWRITE_JPEG_QUALITY), JPEG_QUALITY])[1].tobytes()
+    raw = ndarray_to_raw_image(img)
+
+    def server_raw_view():
+        # mesmo caminho do servidor (image_decoder.raw_image_to_ndarray)
+        return np.ndarray(
+            shape=(raw.height, raw.width, raw.channels),
+            dtype=np.uint8,
+            buffer=raw.data,
+            strides=(raw.stride, raw.channels, 1),
+        )
+
+    print(f"\n=== Preparo da imagem ({img.shape[1]}x{img.shape[0]}x{img.shape[2]}) ===")
+    print(f"Bytes no fio: jpeg={len(jpg)}  raw={len(raw.data)}")
+    report("client jpeg encode", timed(
+        lambda: cv2.imencode(".jpg", img, [int(cv2.IMWRITE_JPEG_QUALITY), JPEG_QUALITY]), ITERATIONS))
+    report("server jpeg decode", timed(
+        lambda: cv2.imdecode(np.frombuffer(jpg, np.uint8), cv2.IMREAD_COLOR), ITERATIONS))
+    report("client raw build", timed(lambda: ndarray_to_raw_image(img), ITERATIONS))
+    report("server raw view", timed(server_raw_view, ITERATIONS))
+
+
+def bench_mono(img: np.ndarray) -> None:
+    """
+    Frame Mono12 (CamModuleMetadata) no servidor:
+      antes: 12->8 bits + GRAY2BGR em resolução cheia (o letterbox reduz depois)
+      agora: resize em 1 canal até MODEL_IMGSZ, 12->8 bits e GRAY2BGR só na imagem pequena
+    """
+    mono12 = (cv2.cvtColor(img, cv2.COLOR_BGR2GRAY).astype(np.uint16) << 4)
+    meta = CamModuleMetadata("Mono12")
+    meta.set_image_matrix(mono12)
+    raw = cam_metadata_to_raw_image(meta)
+    h, w = mono12.shape
+    r = MODEL_IMGSZ / max(h, w)
+
+    def old_path():
+        view = np.frombuffer(raw.data, dtype="<u2").reshape(h, w)
+        bgr = cv2.cvtColor((view >> 4).astype(np.uint8), cv2.COLOR_GRAY2BGR)
+        return cv2.resize(bgr, (int(round(w * r)), int(round(h * r))), interpolation=cv2.INTER_LINEAR)
+
+    def new_path():
+        # mesmo caminho do servidor (image_decoder.mono_to_bgr)
+        view = np.frombuffer(raw.data, dtype="<u2").reshape(h, w)
+        small = cv2.resize(view, (int(round(w * r)), int(round(h * r))), interpolation=cv2.INTER_LINEAR)
+        return cv2.cvtColor(cv2.convertScaleAbs(small, alpha=255.0 / 4095), cv2.COLOR_GRAY2BGR)
+
+    print(f"\n=== Mono12 {w}x{h} -> BGR {MODEL_IMGSZ} ===")
+    print(f"Bytes no fio: mono12={len(raw.data)}  bgr8={h * w * 3}")
+    report("server mono full-res BGR", timed(old_path, ITERATIONS))
+    report("server mono resize-first", timed(new_path, ITERATIONS))
+
+
+def bench_remote(img: np.ndarray) -> None:
+    channel = grpc.insecure_channel(
+        TARGET,
+        options=[
+            ("grpc.max_send_message_length", MAX_MSG),
+            ("grpc.max_receive_message_length", MAX_MSG),
+        ],
+    )
+    stub = pb2_grpc.InferenceMethodsStub(channel)
+
+    def jpeg_call():
+        jpg = cv2.imencode(".jpg", img, [int(cv2.IMWRITE_JPEG_QUALITY), JPEG_QUALITY])[1].tobytes()
+        stub.Infer(pb2.InferRequest(image_bytes=jpg, confidence_threshold=CONFIDENCE), timeout=TIMEOUT)
+
+    def raw_call():
+        raw = ndarray_to_raw_image(img)
+        stub.Infer(pb2.InferRequest(raw_image=raw, confidence_threshold=CONFIDENCE), timeout=TIMEOUT)
+
+    # warmup
+    for _ in range(10):
+        jpeg_call()
+        raw_call()
+
+    print(f"\n=== Infer ponta a ponta ({TARGET}) ===")
+    report("Infer image_bytes (jpeg)", timed(jpeg_call, ITERATIONS))
+    report("Infer raw_image", timed(raw_call, ITERATIONS))
+
+    channel.close()
+
+
+def main():
+    image_path = os.path.join(IMAGE_DIR, IMAGE_NAME)
+    img = cv2.imread(image_path)
+    if img is None:
+        raise RuntimeError(f"Não consegui abrir a imagem em {image_path}")
+
+    bench_local(img)
+    bench_mono(img)
+    if BENCH_REMOTE:
+        bench_remote(img)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import os
+import time
+from statistics import median
+
+import grpc
+
+from protos import service_pb2, service_pb2_grpc
+
+
+# ===== CONFIG =====
+TARGET = os.getenv("TARGET", "server_grcp:50051")
+# bytes de payload por mensagem (16 B .. 4 MB)
+PAYLOAD_SIZES = [int(n) for n in os.getenv("PAYLOAD_SIZES", "16,256,4096,65536,1048576,4194304").split(",")]
+# mensagens por chamada: o suficiente para ~TARGET_MB por chamada, entre MIN e MAX
+TARGET_MB = float(os.getenv("TARGET_MB", "64"))
+MIN_MESSAGES = int(os.getenv("MIN_MESSAGES", "16"))
+MAX_MESSAGES = int(os.getenv("MAX_MESSAGES", "20000"))
+REPEATS = int(os.getenv("REPEATS", "5"))
+TIMEOUT = float(os.getenv("TIMEOUT", "120"))
+
+MAX_MSG = 64 * 1024 * 1024
+# ==================
+
+
+def messages_for(size: int) -> int:
+    return max(MIN_MESSAGES, min(MAX_MESSAGES, int(TARGET_MB * 1e6 / max(size, 1))))
+
+
+def bench_server_streaming(stub, size: int, n: int):
+    """1 request -> N respostas, sem pausa no servidor (interval_ms=0)."""
+    received = nbytes = 0
+    for msg in stub.StreamNumbers(
+        service_pb2.StreamRequest(max=n, payload_bytes=size, interval_ms=0), timeout=TIMEOUT
+    ):
+        received += 1
+        nbytes += len(msg.payload)
+    if received != n:
+        raise RuntimeError(f"StreamNumbers devolveu {received}/{n} mensagens")
+    return n, nbytes
+
+
+def bench_client_streaming(stub, size: int, n: int):
+    """N requests -> 1 resposta."""
+    payload = bytes(size)
+
+    def gen():
+        for i in range(n):
+            yield service_pb2.UploadRequest(value=i, payload=payload)
+
+    resp = stub.UploadNumbers(gen(), timeout=TIMEOUT)
+    if resp.count != n or resp.payload_bytes != n * size:
+        raise RuntimeError(f"UploadNumbers recebeu {resp.count}/{n} mensagens, {resp.payload_bytes} bytes")
+    return n, n * size
+
+
+def bench_bidi(stub, size: int, n: int):
+    """N mensagens <-> N ecos no mesmo stream (pipelined); bytes contam nos dois sentidos."""
+    payload = bytes(size)
+
+    def gen():
+        for i in range(n):
+            yield service_pb2.ChatMessage(text=str(i), payload=payload)
+
+    received = nbytes = 0
+    for reply in stub.Chat(gen(), timeout=TIMEOUT):
+        received += 1
+        nbytes += len(reply.payload)
+    if received != n:
+        raise RuntimeError(f"Chat devolveu {received}/{n} mensagens")
+    return n, n * size + nbytes
+
+
+def run_bench(name: str, fn, stub, size: int) -> None:
+    n = messages_for(size)
+    fn(stub, size, min(n, MIN_MESSAGES))  # warmup
+
+    walls = []
+    for _ in range(REPEATS):
+        t0 = time.perf_counter()
+        msgs, nbytes = fn(stub, size, n)
+        walls.append(time.perf_counter() - t0)
+
+    wall = median(walls)
+    print(
+        f"{name:<18} payload={size:>8} B  msgs={msgs:>6}  "
+        f"{msgs / wall:>10.0f} msgs/s  {nbytes / 1e6 / wall:>9.1f} MB/s  ({wall * 1000:.1f} ms/chamada)"
+    )
+
+
+def main():
+    channel = grpc.insecure_channel(
+        TARGET,
+        options=[
+            ("grpc.max_send_message_length", MAX_MSG),
+            ("grpc.max_receive_message_length", MAX_MSG),
+        ],
+    )
+    stub = service_pb2_grpc.CoreServicesStub(channel)
+
+    print(f"\n=== Streaming CoreServices | {TARGET} | mediana de {REPEATS} chamadas ===")
+    for name, fn in (
+        ("server-streaming", bench_server_streaming),
+        ("client-streaming", bench_client_streaming),
+        ("bidi (Chat)", bench_bidi),
+    ):
+        print(f"\n-- {name} --")
+        for size in PAYLOAD_SIZES:
+            run_bench(name, fn, stub, size)
+
+    channel.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,531 @@
+"""
+Gerador de carga gRPC (CoreServices e InferenceMethods).
+
+Modos:
+  closed  concorrência fixa: cada worker manda o próximo request quando o anterior volta
+  open    taxa de chegada fixa (--rate req/s): os requests saem no horário, independente
+          das respostas; a latência conta a partir do horário planejado
+
+Engines:
+  threads  uma thread por worker (closed) / por request em voo (open); bom até dezenas
+  aio      grpc.aio num event loop: milhares de chamadas em voo sem thread por chamada;
+           --processes N divide a carga em N processos (cada um com seu loop e seus canais)
+
+Exemplos (dentro de client/src):
+  python loadgen.py run --scenario infer --mode closed --concurrency 16 --duration 30 --json a.json --label build-a
+  python loadgen.py run --scenario ping --mode open --rate 2000 --duration 30
+  python loadgen.py run --scenario ping --engine aio --concurrency 4000 --processes 4 --channels 4
+  python loadgen.py compare a.json b.json
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from utils.latency_histogram import LatencyHistogram
+from utils.load_scenarios import (
+    SCENARIOS,
+    build_request,
+    make_aio_channel,
+    make_call,
+    make_call_async,
+    make_channel,
+)
+
+
+# =========================
+# COLETA
+# =========================
+class Recorder:
+    """
+    Latências de todos os workers:
+      latency    resposta - envio (closed) ou resposta - horário planejado (open)
+      corrected  closed: latency com correção de coordinated omission; open: igual a latency
+      service    resposta - envio real (open: sem a fila do lado do cliente)
+    mais uma série por segundo (ok, erros, bytes, p50/p99).
+    """
+
+    def __init__(self, start: float, co_interval: float = 0.0):
+        self.start = start
+        self.co_interval = co_interval
+        self.latency = LatencyHistogram()
+        self.corrected = LatencyHistogram()
+        self.service = LatencyHistogram()
+        self.errors = Counter()
+        self.ok = 0
+        self.bytes = 0
+        self.end = start
+        self._seconds = {}
+        self._lock = threading.Lock()
+
+    def record(self, intended: float, sent: float, done: float, nbytes: int = 0, error: str = "") -> None:
+        second = int(done - self.start)
+        with self._lock:
+            self.end = max(self.end, done)
+            slot = self._seconds.get(second)
+            if slot is None:
+                slot = self._seconds[second] = {"ok": 0, "errors": 0, "bytes": 0, "hist": LatencyHistogram()}
+            if error:
+                self.errors[error] += 1
+                slot["errors"] += 1
+                return
+
+            self.ok += 1
+            self.bytes += nbytes
+            slot["ok"] += 1
+            slot["bytes"] += nbytes
+            slot["hist"].record(done - intended)
+            self.latency.record(done - intended)
+            self.service.record(done - sent)
+            if self.co_interval > 0:
+                self.corrected.record_corrected(done - intended, self.co_interval)
+            else:
+                self.corrected.record(done - intended)
+
+    # vai de volta para o processo principal com --processes (o lock não é picklable)
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def merge(self, other: "Recorder") -> None:
+        """Soma o resultado de outro shard (mesmo instante de início, ver run_sharded)."""
+        self.latency.merge(other.latency)
+        self.corrected.merge(other.corrected)
+        self.service.merge(other.service)
+        self.errors.update(other.errors)
+        self.ok += other.ok
+        self.bytes += other.bytes
+        self.end = max(self.end, self.start + other.wall)
+        self.co_interval = max(self.co_interval, other.co_interval)
+        for second, slot in other._seconds.items():
+            mine = self._seconds.get(second)
+            if mine is None:
+                self._seconds[second] = slot
+                continue
+            for key in ("ok", "errors", "bytes"):
+                mine[key] += slot[key]
+            mine["hist"].merge(slot["hist"])
+
+    @property
+    def wall(self) -> float:
+        return max(self.end - self.start, 1e-9)
+
+    def timeseries(self) -> list:
+        out = []
+        for second in sorted(self._seconds):
+            slot = self._seconds[second]
+            out.append(
+                {
+                    "second": second,
+                    "ok": slot["ok"],
+                    "errors": slot["errors"],
+                    "mb": round(slot["bytes"] / 1e6, 3),
+                    "p50_ms": slot["hist"].percentile_ms(50),
+                    "p99_ms": slot["hist"].percentile_ms(99),
+                }
+            )
+        return out
+
+    def to_dict(self) -> dict:
+        return {
+            "ok": self.ok,
+            "errors": sum(self.errors.values()),
+            "error_kinds": dict(self.errors.most_common(10)),
+            "wall_s": round(self.wall, 3),
+            "throughput_rps": round(self.ok / self.wall, 1),
+            "throughput_mbps": round(self.bytes / 1e6 / self.wall, 3),
+            "co_interval_ms": round(self.co_interval * 1000.0, 3),
+            "latency": self.latency.to_dict(),
+            "latency_corrected": self.corrected.to_dict(),
+            "service_time": self.service.to_dict(),
+            "timeseries": self.timeseries(),
+        }
+
+
+def error_kind(e: Exception) -> str:
+    code = getattr(e, "code", None)
+    if callable(code):
+        try:
+            return str(code())
+        except Exception:
+            pass
+    return type(e).__name__
+
+
+def timed_call(call, recorder: Recorder, intended: float) -> None:
+    sent = time.perf_counter()
+    try:
+        nbytes = call()
+    except Exception as e:
+        recorder.record(intended, sent, time.perf_counter(), error=error_kind(e))
+        return
+    recorder.record(intended, sent, time.perf_counter(), nbytes)
+
+
+# =========================
+# MODOS
+# =========================
+def run_closed(calls: list, concurrency: int, duration: float, max_requests: int, think: float, recorder: Recorder) -> None:
+    deadline = recorder.start + duration if duration > 0 else float("inf")
+    remaining = [max_requests if max_requests > 0 else float("inf")]
+    lock = threading.Lock()
+
+    def take() -> bool:
+        with lock:
+            if remaining[0] <= 0:
+                return False
+            remaining[0] -= 1
+            return True
+
+    def worker(i: int):
+        call = calls[i % len(calls)]
+        while time.perf_counter() < deadline and take():
+            now = time.perf_counter()
+            timed_call(call, recorder, now)
+            if think > 0:
+                time.sleep(think)
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+def run_open(calls: list, rate: float, duration: float, max_requests: int, max_in_flight: int, recorder: Recorder) -> None:
+    if rate <= 0:
+        raise ValueError("--rate deve ser > 0 no modo open.")
+    total = max_requests if max_requests > 0 else int(rate * duration)
+    interval = 1.0 / rate
+
+    # a fila do executor segura o excesso: o tempo na fila entra na latência (horário planejado)
+    with ThreadPoolExecutor(max_workers=max_in_flight) as pool:
+        for i in range(total):
+            intended = recorder.start + i * interval
+            delay = intended - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(timed_call, calls[i % len(calls)], recorder, intended)
+
+
+def warmup_interval(calls: list, concurrency: int, seconds: float) -> float:
+    """Roda o aquecimento (descartado) e devolve a latência mediana, usada como intervalo da correção de CO."""
+    if seconds <= 0:
+        return 0.0
+    recorder = Recorder(time.perf_counter())
+    run_closed(calls, concurrency, seconds, 0, 0.0, recorder)
+    return recorder.latency.percentile_ms(50) / 1000.0
+
+
+async def timed_call_async(call, recorder: Recorder, intended: float) -> None:
+    sent = time.perf_counter()
+    try:
+        nbytes = await call()
+    except Exception as e:
+        recorder.record(intended, sent, time.perf_counter(), error=error_kind(e))
+        return
+    recorder.record(intended, sent, time.perf_counter(), nbytes)
+
+
+async def run_closed_async(
+    calls: list, concurrency: int, duration: float, max_requests: int, think: float, recorder: Recorder
+) -> None:
+    # mesma lógica do run_closed, com tasks no lugar de threads (um único loop, sem lock)
+    deadline = recorder.start + duration if duration > 0 else float("inf")
+    remaining = [max_requests if max_requests > 0 else float("inf")]
+
+    async def worker(i: int):
+        call = calls[i % len(calls)]
+        while time.perf_counter() < deadline and remaining[0] > 0:
+            remaining[0] -= 1
+            await timed_call_async(call, recorder, time.perf_counter())
+            if think > 0:
+                await asyncio.sleep(think)
+
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+
+
+async def run_open_async(
+    calls: list, rate: float, duration: float, max_requests: int, max_in_flight: int, recorder: Recorder
+) -> None:
+    if rate <= 0:
+        raise ValueError("--rate deve ser > 0 no modo open.")
+    total = max_requests if max_requests > 0 else int(rate * duration)
+    interval = 1.0 / rate
+    in_flight = asyncio.Semaphore(max_in_flight)
+
+    async def send(call, intended: float):
+        # espera por vaga conta na latência (horário planejado), como a fila do executor no run_open
+        async with in_flight:
+            await timed_call_async(call, recorder, intended)
+
+    tasks = set()
+    for i in range(total):
+        intended = recorder.start + i * interval
+        delay = intended - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        task = asyncio.create_task(send(calls[i % len(calls)], intended))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+    if tasks:
+        await asyncio.gather(*tasks)
+
+
+async def warmup_interval_async(calls: list, concurrency: int, seconds: float) -> float:
+    if seconds <= 0:
+        return 0.0
+    recorder = Recorder(time.perf_counter())
+    await run_closed_async(calls, concurrency, seconds, 0, 0.0, recorder)
+    return recorder.latency.percentile_ms(50) / 1000.0
+
+
+# =========================
+# EXECUÇÃO (shards)
+# =========================
+def co_interval_from_args(args, warmup_median: float) -> float:
+    if args.mode == "open" or args.co_interval_ms == 0:
+        return 0.0  # open loop já mede a partir do horário planejado
+    if args.co_interval_ms > 0:
+        return args.co_interval_ms / 1000.0
+    return warmup_median
+
+
+def wait_start(barrier) -> None:
+    # shards começam juntos: os segundos da série temporal se alinham na soma
+    if barrier is not None:
+        barrier.wait()
+
+
+def run_shard_threads(args, request, barrier=None) -> Recorder:
+    channels = [make_channel(args.target) for _ in range(max(1, args.channels))]
+    calls = [make_call(args.scenario, ch, request, args.timeout) for ch in channels]
+    try:
+        co_interval = co_interval_from_args(args, warmup_interval(calls, args.concurrency, args.warmup))
+        wait_start(barrier)
+        recorder = Recorder(time.perf_counter(), co_interval)
+        if args.mode == "closed":
+            run_closed(calls, args.concurrency, args.duration, args.requests, args.think_ms / 1000.0, recorder)
+        else:
+            run_open(calls, args.rate, args.duration, args.requests, args.max_in_flight, recorder)
+    finally:
+        for ch in channels:
+            ch.close()
+    return recorder
+
+
+async def run_shard_async(args, request, barrier=None) -> Recorder:
+    channels = [make_aio_channel(args.target) for _ in range(max(1, args.channels))]
+    calls = [make_call_async(args.scenario, ch, request, args.timeout) for ch in channels]
+    try:
+        warmup_median = await warmup_interval_async(calls, args.concurrency, args.warmup)
+        co_interval = co_interval_from_args(args, warmup_median)
+        wait_start(barrier)  # nada rodando no loop aqui; bloquear é ok
+        recorder = Recorder(time.perf_counter(), co_interval)
+        if args.mode == "closed":
+            await run_closed_async(calls, args.concurrency, args.duration, args.requests, args.think_ms / 1000.0, recorder)
+        else:
+            await run_open_async(calls, args.rate, args.duration, args.requests, args.max_in_flight, recorder)
+    finally:
+        for ch in channels:
+            await ch.close()
+    return recorder
+
+
+def run_shard(args, barrier=None) -> Recorder:
+    request = build_request(args)
+    if args.engine == "aio":
+        return asyncio.run(run_shard_async(args, request, barrier))
+    return run_shard_threads(args, request, barrier)
+
+
+def shard_args(args, shard: int, shards: int):
+    """Parte `shard` da carga: concorrência, taxa, total e limite em voo divididos entre os processos."""
+    def split(total):
+        return total // shards + (1 if shard < total % shards else 0)
+
+    out = argparse.Namespace(**vars(args))
+    out.concurrency = max(1, split(args.concurrency))
+    out.max_in_flight = max(1, split(args.max_in_flight))
+    out.requests = split(args.requests) if args.requests > 0 else 0
+    out.rate = args.rate / shards
+    return out
+
+
+def _shard_process(args, barrier, results) -> None:
+    try:
+        results.put(run_shard(args, barrier))
+    except Exception as e:
+        barrier.abort()
+        results.put(e)
+
+
+def run_sharded(args) -> Recorder:
+    # spawn: o gRPC não suporta fork com canais/threads já criados
+    ctx = multiprocessing.get_context("spawn")
+    barrier = ctx.Barrier(args.processes)
+    results = ctx.Queue()
+    procs = [
+        ctx.Process(target=_shard_process, args=(shard_args(args, i, args.processes), barrier, results), daemon=True)
+        for i in range(args.processes)
+    ]
+    for p in procs:
+        p.start()
+
+    outs = [results.get() for _ in procs]
+    for p in procs:
+        p.join()
+    errors = [o for o in outs if isinstance(o, Exception)]
+    if errors:
+        raise RuntimeError(f"{len(errors)} shard(s) falharam: {errors[0]!r}")
+
+    recorder = outs[0]
+    for other in outs[1:]:
+        recorder.merge(other)
+    return recorder
+
+
+# =========================
+# SAÍDA
+# =========================
+def print_result(result: dict) -> None:
+    cfg, res = result["config"], result["result"]
+    print(f"\n===== LOADGEN {cfg['label'] or ''} =====")
+    print(
+        f"Target: {cfg['target']} | scenario={cfg['scenario']} mode={cfg['mode']} "
+        f"engine={cfg['engine']} processes={cfg['processes']} channels={cfg['channels']}",
+        end="",
+    )
+    if cfg["mode"] == "open":
+        print(f" rate={cfg['rate']} req/s max_in_flight={cfg['max_in_flight']}")
+    else:
+        print(f" concurrency={cfg['concurrency']} think_ms={cfg['think_ms']}")
+
+    print(f"\n{'seg':>4} {'ok':>8} {'erros':>6} {'MB':>9} {'p50 ms':>9} {'p99 ms':>9}")
+    for row in res["timeseries"]:
+        print(
+            f"{row['second']:>4} {row['ok']:>8} {row['errors']:>6} {row['mb']:>9.3f} "
+            f"{row['p50_ms']:>9.2f} {row['p99_ms']:>9.2f}"
+        )
+
+    print(f"\nOK: {res['ok']}  Erros: {res['errors']} {res['error_kinds'] or ''}")
+    print(f"Wall: {res['wall_s']:.3f}s  Throughput: {res['throughput_rps']:.1f} req/s  {res['throughput_mbps']:.3f} MB/s")
+    for name in ("latency", "latency_corrected", "service_time"):
+        s = res[name]["summary_ms"]
+        print(
+            f"{name:<18} mean={s['mean']:8.2f}  p50={s['p50']:8.2f}  p90={s['p90']:8.2f}  "
+            f"p99={s['p99']:8.2f}  p99.9={s['p99.9']:8.2f}  max={s['p100']:8.2f} ms"
+        )
+    if cfg["mode"] == "closed":
+        print(f"(correção de CO com intervalo esperado de {res['co_interval_ms']:.2f} ms)")
+
+
+def compare(paths: list) -> None:
+    """Tabela lado a lado de resultados JSON (ex: duas builds do servidor), delta contra o primeiro."""
+    rows = []
+    for path in paths:
+        with open(path) as f:
+            data = json.load(f)
+        s = data["result"]["latency_corrected"]["summary_ms"]
+        rows.append((data["config"]["label"] or os.path.basename(path), data["result"], s))
+
+    base_rps, base_p99 = rows[0][1]["throughput_rps"], rows[0][2]["p99"]
+    print(f"\n{'label':<24} {'req/s':>10} {'erros':>7} {'p50 ms':>9} {'p99 ms':>9} {'p99.9 ms':>9} {'d req/s':>8} {'d p99':>8}")
+    for label, res, s in rows:
+        d_rps = (res["throughput_rps"] / base_rps - 1) * 100 if base_rps else 0.0
+        d_p99 = (s["p99"] / base_p99 - 1) * 100 if base_p99 else 0.0
+        print(
+            f"{label:<24} {res['throughput_rps']:>10.1f} {res['errors']:>7} {s['p50']:>9.2f} {s['p99']:>9.2f} "
+            f"{s['p99.9']:>9.2f} {d_rps:>+7.1f}% {d_p99:>+7.1f}%"
+        )
+
+
+# =========================
+# CLI
+# =========================
+def parse_args():
+    parser = argparse.ArgumentParser(description="Gerador de carga gRPC (closed/open loop, histograma HDR, JSON).")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="roda um cenário de carga")
+    run.add_argument("--target", default=os.getenv("TARGET", "server_grcp_gpu:50051"))
+    run.add_argument("--scenario", choices=tuple(SCENARIOS), default="infer")
+    run.add_argument("--mode", choices=("closed", "open"), default="closed")
+    run.add_argument("--concurrency", type=int, default=16, help="closed: workers simultâneos")
+    run.add_argument("--think-ms", type=float, default=0.0, help="closed: pausa entre requests de cada worker")
+    run.add_argument("--rate", type=float, default=0.0, help="open: requests por segundo")
+    run.add_argument("--max-in-flight", type=int, default=256, help="open: requests em voo ao mesmo tempo (threads ou tasks)")
+    run.add_argument("--duration", type=float, default=30.0, help="segundos de medição")
+    run.add_argument("--requests", type=int, default=0, help="total de requests (0 = usa --duration)")
+    run.add_argument("--warmup", type=float, default=5.0, help="segundos de aquecimento (descartados)")
+    run.add_argument(
+        "--co-interval-ms", type=float, default=-1.0,
+        help="closed: intervalo esperado da correção de CO (-1 = mediana do aquecimento, 0 = sem correção)",
+    )
+    run.add_argument("--engine", choices=("threads", "aio"), default="threads", help="threads ou grpc.aio (milhares em voo)")
+    run.add_argument("--processes", type=int, default=1, help="processos dividindo a carga (ideal com --engine aio)")
+    run.add_argument("--channels", type=int, default=1, help="canais gRPC (conexões HTTP/2) por processo, em round-robin")
+    run.add_argument("--timeout", type=float, default=10.0)
+    run.add_argument("--stream-messages", type=int, default=50, help="upload/stream/chat: mensagens por chamada")
+    run.add_argument("--payload-bytes", type=int, default=0, help="upload/stream/chat: payload de cada mensagem")
+    run.add_argument("--image-dir", default=os.getenv("IMAGE_DIR", "/workspaces/Client-Server-gRCP/client/src/img/"))
+    run.add_argument("--image-name", default=os.getenv("IMAGE_NAME", "test.jpg"))
+    run.add_argument("--raw", action="store_true", help="infer: manda RawImage em vez de JPEG")
+    run.add_argument("--packed-bbox", action="store_true", help="infer: pede packed_bbox")
+    run.add_argument("--model", default="", help="infer: model_name (vazio = padrão do servidor)")
+    run.add_argument("--confidence", type=float, default=0.10)
+    run.add_argument(
+        "--source-id", default="", help="infer: source_id (o servidor descarta frames superados da mesma origem)"
+    )
+    run.add_argument(
+        "--priority", choices=("fast", "slow"), default="fast", help="infer: fila no batcher (slow = save/audit)"
+    )
+    run.add_argument("--chunk-bytes", type=int, default=1024 * 1024, help="infer_upload: bytes por ImageChunk")
+    run.add_argument("--label", default="", help="nome da build/config no JSON (compare)")
+    run.add_argument("--json", default="", help="arquivo de saída com config + resultados")
+
+    cmp_ = sub.add_parser("compare", help="compara resultados JSON")
+    cmp_.add_argument("paths", nargs="+")
+    return parser.parse_args()
+
+
+def run(args) -> dict:
+    started_at = datetime.now(timezone.utc).isoformat()
+    recorder = run_sharded(args) if args.processes > 1 else run_shard(args)
+
+    config = {k: v for k, v in vars(args).items() if k not in ("command", "json")}
+    return {
+        "config": config,
+        "meta": {"started_at": started_at, "host": socket.gethostname()},
+        "result": recorder.to_dict(),
+    }
+
+
+def main():
+    args = parse_args()
+    if args.command == "compare":
+        compare(args.paths)
+        return
+
+    result = run(args)
+    print_result(result)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"\nResultados em {args.json}")
+
+
+if __name__ == "__main__":
+    main()
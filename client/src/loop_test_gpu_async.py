@@ -11,8 +11,11 @@ from google.protobuf.json_format import MessageToDict
 # =========================
 # CONFIG
 # =========================
-TARGET_1 = os.getenv("TARGET_1", "server_grcp_gpu:50051")
-TARGET_2 = os.getenv("TARGET_2", "server_grcp_gpu:50051")
+TARGET = os.getenv("TARGET", "server_grcp_gpu:50051")
+
+# os dois modelos vivem no mesmo servidor (ModelRegistry); "" = modelo padrão
+MODEL_1 = os.getenv("MODEL_1", "")
+MODEL_2 = os.getenv("MODEL_2", "")
 
 IMAGE_DIR = os.getenv("IMAGE_DIR", "/workspaces/Client-Server-gRCP/client/src/img/")
 IMAGE_NAME = os.getenv("IMAGE_NAME", "test.jpg")
@@ -132,6 +135,10 @@ def safe_call(fn, target_name: str) -> None:
     try:
         fn()
     except grpc.RpcError as e:
+        if e.code() == grpc.StatusCode.RESOURCE_EXHAUSTED:
+            # servidor saturado ou prazo curto demais: descarta este frame, o próximo já vem
+            logger.warning("[%s] frame descartado pelo servidor: %s", target_name, e.details())
+            return
         logger.error("[%s] gRPC error: code=%s details=%s", target_name, e.code(), e.details())
     except Exception as e:
         logger.error("[%s] error: %s", target_name, str(e))
@@ -194,12 +201,12 @@ def infer_and_parse(stub, image_bytes: bytes, timeout=10.0):
 # =========================
 # MAIN
 # =========================
-def loop_async(stub1, stub2, image_bytes):
+def loop_async(stub, image_bytes):
     print("\n====== LOOP ASYNC ======")
     t_loop = time.perf_counter()
 
-    f1 = infer_future(stub1, image_bytes)
-    f2 = infer_future(stub2, image_bytes)
+    f1 = infer_future(stub, image_bytes, MODEL_1)
+    f2 = infer_future(stub, image_bytes, MODEL_2)
 
     resp1 = f1.result()
     resp2 = f2.result()
@@ -211,22 +218,44 @@ def loop_async(stub1, stub2, image_bytes):
     print(f"⏱ Tempo total ASYNC: {dt:.1f} ms")
 
 
-def loop_sync(stub1, stub2, image_bytes):
+def loop_multi(stub, image_bytes):
+    """Uma chamada InferMulti: imagem enviada/decodificada uma vez para os dois modelos."""
+    print("\n====== LOOP MULTI ======")
+    t_loop = time.perf_counter()
+
+    resp = stub.InferMulti(
+        pb2.InferMultiRequest(
+            image_bytes=image_bytes,
+            confidence_threshold=CONFIDENCE,
+            model_names=[MODEL_1, MODEL_2],
+        ),
+        timeout=TIMEOUT_SEC,
+    )
+    if resp.error:
+        logger.error("InferMulti error: %s", resp.error)
+    for name, r in resp.results.items():
+        print(f"{name} recebeu bboxes={len(r.list_bbox)} error={r.error!r}")
+
+    dt = (time.perf_counter() - t_loop) * 1000
+    print(f"⏱ Tempo total MULTI: {dt:.1f} ms")
+
+
+def loop_sync(stub, image_bytes):
     print("\n====== LOOP SYNC ======")
     t_loop = time.perf_counter()
 
-    resp1 = stub1.Infer(pb2.InferRequest(image_bytes=image_bytes, confidence_threshold=CONFIDENCE))
+    resp1 = stub.Infer(pb2.InferRequest(image_bytes=image_bytes, confidence_threshold=CONFIDENCE, model_name=MODEL_1))
     print("MODEL_1 recebeu")
 
-    resp2 = stub2.Infer(pb2.InferRequest(image_bytes=image_bytes, confidence_threshold=CONFIDENCE))
+    resp2 = stub.Infer(pb2.InferRequest(image_bytes=image_bytes, confidence_threshold=CONFIDENCE, model_name=MODEL_2))
     print("MODEL_2 recebeu")
 
     dt = (time.perf_counter() - t_loop) * 1000
     print(f"⏱ Tempo total SYNC: {dt:.1f} ms")
 
 
-def infer_future(stub, image_bytes):
-    req = pb2.InferRequest(image_bytes=image_bytes, confidence_threshold=CONFIDENCE)
+def infer_future(stub, image_bytes, model_name: str = ""):
+    req = pb2.InferRequest(image_bytes=image_bytes, confidence_threshold=CONFIDENCE, model_name=model_name)
     return stub.Infer.future(req, timeout=TIMEOUT_SEC)
 
 
@@ -234,12 +263,12 @@ def infer_future(stub, image_bytes):
 def main():
     image_bytes = load_image_bytes()
 
-    stub1 = pb2_grpc.InferenceMethodsStub(make_channel(TARGET_1))
-    stub2 = pb2_grpc.InferenceMethodsStub(make_channel(TARGET_2))
+    stub = pb2_grpc.InferenceMethodsStub(make_channel(TARGET))
 
     while True:
-        loop_async(stub1, stub2, image_bytes)
-        loop_sync(stub1, stub2, image_bytes)
+        loop_async(stub, image_bytes)
+        loop_multi(stub, image_bytes)
+        loop_sync(stub, image_bytes)
 
         time.sleep(2)
 
@@ -0,0 +1,136 @@
+import os
+import time
+import logging
+import threading
+import grpc
+import cv2
+
+from protos import inference_pb2 as pb2
+from protos import inference_pb2_grpc as pb2_grpc
+
+
+# =========================
+# CONFIG
+# =========================
+TARGET = os.getenv("TARGET", "server_grcp_gpu:50051")
+
+IMAGE_DIR = os.getenv("IMAGE_DIR", "/workspaces/Client-Server-gRCP/client/src/img/")
+IMAGE_NAME = os.getenv("IMAGE_NAME", "test.jpg")
+
+CONFIDENCE = float(os.getenv("CONFIDENCE", "0.10"))
+
+TOTAL_FRAMES = int(os.getenv("TOTAL_FRAMES", "200"))
+MAX_IN_FLIGHT = int(os.getenv("MAX_IN_FLIGHT", "16"))   # frames enviados sem resposta ainda
+FRAME_INTERVAL_SEC = float(os.getenv("FRAME_INTERVAL_SEC", "0.0"))
+# câmera de origem: com o servidor atrasado, só o frame mais novo dela roda ("" = todos rodam)
+SOURCE_ID = os.getenv("SOURCE_ID", "")
+# fast = show ao vivo (entra no lote primeiro); slow = save/audit
+PRIORITY = pb2.PRIORITY_SLOW if os.getenv("PRIORITY", "fast").lower() == "slow" else pb2.PRIORITY_FAST
+
+MAX_MSG = 64 * 1024 * 1024
+
+
+# =========================
+# LOG
+# =========================
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(message)s",
+)
+logger = logging.getLogger("client_infer_stream")
+
+
+# =========================
+# HELPERS
+# =========================
+def load_image_bytes() -> bytes:
+    image_path = os.path.join(IMAGE_DIR, IMAGE_NAME)
+    img = cv2.imread(image_path)
+    if img is None:
+        raise RuntimeError(f"Não consegui abrir a imagem: {image_path}")
+
+    ok, buf = cv2.imencode(".jpg", img, [int(cv2.IMWRITE_JPEG_QUALITY), 90])
+    if not ok:
+        raise RuntimeError("Falha ao codificar JPEG.")
+    return buf.tobytes()
+
+
+def make_channel(target: str) -> grpc.Channel:
+    return grpc.insecure_channel(
+        target,
+        options=[
+            ("grpc.max_send_message_length", MAX_MSG),
+            ("grpc.max_receive_message_length", MAX_MSG),
+        ],
+    )
+
+
+# =========================
+# MAIN
+# =========================
+def run_stream(stub: pb2_grpc.InferenceMethodsStub, image_bytes: bytes) -> None:
+    """
+    Pipeline de frames num único InferStream: o gerador envia até MAX_IN_FLIGHT
+    frames sem esperar resposta; cada resposta libera um slot. As respostas
+    podem chegar fora de ordem, então a latência é casada pelo request_id.
+    """
+    slots = threading.Semaphore(MAX_IN_FLIGHT)
+    sent_at = {}
+
+    def frames():
+        for i in range(TOTAL_FRAMES):
+            slots.acquire()
+            request_id = f"frame-{i}"
+            sent_at[request_id] = time.perf_counter()
+            yield pb2.InferRequest(
+                image_bytes=image_bytes,
+                confidence_threshold=CONFIDENCE,
+                request_id=request_id,
+                source_id=SOURCE_ID,
+                priority=PRIORITY,
+            )
+            if FRAME_INTERVAL_SEC > 0:
+                time.sleep(FRAME_INTERVAL_SEC)
+
+    latencies_ms = []
+    t0 = time.perf_counter()
+
+    for resp in stub.InferStream(frames()):
+        dt_ms = (time.perf_counter() - sent_at.pop(resp.request_id)) * 1000.0
+        latencies_ms.append(dt_ms)
+        slots.release()
+
+        if resp.error:
+            logger.error("[%s] Server error payload: %s", resp.request_id, resp.error)
+            continue
+        logger.info(
+            "[%s] OK model=%s bboxes=%d latency=%.1fms",
+            resp.request_id, resp.model_name, len(resp.list_bbox), dt_ms,
+        )
+
+    wall = time.perf_counter() - t0
+    latencies_ms.sort()
+    logger.info(
+        "frames=%d wall=%.2fs throughput=%.1f fps p50=%.1fms max=%.1fms",
+        len(latencies_ms),
+        wall,
+        len(latencies_ms) / wall if wall > 0 else 0.0,
+        latencies_ms[len(latencies_ms) // 2] if latencies_ms else 0.0,
+        latencies_ms[-1] if latencies_ms else 0.0,
+    )
+
+
+def main():
+    image_bytes = load_image_bytes()
+    stub = pb2_grpc.InferenceMethodsStub(make_channel(TARGET))
+
+    while True:
+        try:
+            run_stream(stub, image_bytes)
+        except grpc.RpcError as e:
+            logger.error("gRPC error: code=%s details=%s", e.code(), e.details())
+        time.sleep(2)
+
+
+if __name__ == "__main__":
+    main()
@@ -24,23 +24,49 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x16protos/inference.proto\x12\x0fmodel.inference\"A\n\x0cInferRequest\x12\x13\n\x0bimage_bytes\x18\x01 \x01(\x0c\x12\x1c\n\x14\x63onfidence_threshold\x18\x02 \x01(\x02\"&\n\x03RGB\x12\t\n\x01r\x18\x01 \x01(\r\x12\t\n\x01g\x18\x02 \x01(\r\x12\t\n\x01\x62\x18\x03 \x01(\r\"~\n\nDefectInfo\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x10\n\x08\x63lass_id\x18\x02 \x01(\x05\x12&\n\x08ui_color\x18\x03 \x01(\x0b\x32\x14.model.inference.RGB\x12(\n\nmask_color\x18\x04 \x01(\x0b\x32\x14.model.inference.RGB\"g\n\x04\x42\x42ox\x12\t\n\x01x\x18\x01 \x01(\x02\x12\t\n\x01y\x18\x02 \x01(\x02\x12\t\n\x01w\x18\x03 \x01(\x02\x12\t\n\x01h\x18\x04 \x01(\x02\x12\r\n\x05label\x18\x05 \x01(\t\x12\x10\n\x08\x63lass_id\x18\x06 \x01(\x05\x12\x12\n\nconfidence\x18\x07 \x01(\x02\"\xa8\x01\n\rInferResponse\x12\x12\n\nmodel_name\x18\x01 \x01(\t\x12(\n\tlist_bbox\x18\x02 \x03(\x0b\x32\x15.model.inference.BBox\x12\x18\n\x10img_segmentation\x18\x03 \x01(\x0c\x12\x30\n\x0b\x64\x65\x66\x65\x63t_list\x18\x04 \x03(\x0b\x32\x1b.model.inference.DefectInfo\x12\r\n\x05\x65rror\x18\x05 \x01(\t2Z\n\x10InferenceMethods\x12\x46\n\x05Infer\x12\x1d.model.inference.InferRequest\x1a\x1e.model.inference.InferResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x16protos/inference.proto\x12\x0fmodel.inference\"\xaf\x02\n\x0cInferRequest\x12\x15\n\x0bimage_bytes\x18\x01 \x01(\x0cH\x00\x12.\n\traw_image\x18\x04 \x01(\x0b\x32\x19.model.inference.RawImageH\x00\x12\x34\n\x0cshared_frame\x18\x07 \x01(\x0b\x32\x1c.model.inference.SharedFrameH\x00\x12\x1c\n\x14\x63onfidence_threshold\x18\x02 \x01(\x02\x12\x12\n\nrequest_id\x18\x03 \x01(\t\x12\x12\n\nmodel_name\x18\x05 \x01(\t\x12\x13\n\x0bpacked_bbox\x18\x06 \x01(\x08\x12\x11\n\tsource_id\x18\x08 \x01(\t\x12+\n\x08priority\x18\t \x01(\x0e\x32\x19.model.inference.PriorityB\x07\n\x05image\"\xa2\x02\n\x11InferMultiRequest\x12\x15\n\x0bimage_bytes\x18\x01 \x01(\x0cH\x00\x12.\n\traw_image\x18\x02 \x01(\x0b\x32\x19.model.inference.RawImageH\x00\x12\x34\n\x0cshared_frame\x18\x07 \x01(\x0b\x32\x1c.model.inference.SharedFrameH\x00\x12\x1c\n\x14\x63onfidence_threshold\x18\x03 \x01(\x02\x12\x12\n\nrequest_id\x18\x04 \x01(\t\x12\x13\n\x0bmodel_names\x18\x05 \x03(\t\x12\x13\n\x0bpacked_bbox\x18\x06 \x01(\x08\x12+\n\x08priority\x18\x08 \x01(\x0e\x32\x19.model.inference.PriorityB\x07\n\x05image\"\xca\x01\n\x12InferMultiResponse\x12\x41\n\x07results\x18\x01 \x03(\x0b\x32\x30.model.inference.InferMultiResponse.ResultsEntry\x12\x12\n\nrequest_id\x18\x02 \x01(\t\x12\r\n\x05\x65rror\x18\x03 \x01(\t\x1aN\n\x0cResultsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12-\n\x05value\x18\x02 \x01(\x0b\x32\x1e.model.inference.InferResponse:\x02\x38\x01\"&\n\x10ModelInfoRequest\x12\x12\n\nmodel_name\x18\x01 \x01(\t\"_\n\tModelInfo\x12\x12\n\nmodel_name\x18\x01 \x01(\t\x12\x0c\n\x04\x65tag\x18\x02 \x01(\t\x12\x30\n\x0b\x64\x65\x66\x65\x63t_list\x18\x03 \x03(\x0b\x32\x1b.model.inference.DefectInfo\"K\n\x18SharedMemoryRegistration\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\r\n\x05slots\x18\x02 \x01(\r\x12\x12\n\nslot_bytes\x18\x03 \x01(\x04\"5\n\x10SharedMemoryInfo\x12\x12\n\nsegment_id\x18\x01 \x01(\t\x12\r\n\x05\x65rror\x18\x02 \x01(\t\"g\n\x0bSharedFrame\x12\x12\n\nsegment_id\x18\x01 \x01(\t\x12\x0c\n\x04slot\x18\x02 \x01(\r\x12\x0b\n\x03seq\x18\x03 \x01(\x04\x12)\n\x06layout\x18\x04 \x01(\x0b\x32\x19.model.inference.RawImage\"n\n\nImageChunk\x12-\n\x06header\x18\x01 \x01(\x0b\x32\x1d.model.inference.InferRequest\x12\x13\n\x0btotal_bytes\x18\x02 \x01(\x04\x12\x0e\n\x06offset\x18\x03 \x01(\x04\x12\x0c\n\x04\x64\x61ta\x18\x04 \x01(\x0c\"{\n\x08RawImage\x12\r\n\x05width\x18\x01 \x01(\r\x12\x0e\n\x06height\x18\x02 \x01(\r\x12\x10\n\x08\x63hannels\x18\x03 \x01(\r\x12\r\n\x05\x64type\x18\x04 \x01(\t\x12\x0e\n\x06stride\x18\x05 \x01(\r\x12\x0c\n\x04\x64\x61ta\x18\x06 \x01(\x0c\x12\x11\n\tbit_depth\x18\x07 \x01(\r\"&\n\x03RGB\x12\t\n\x01r\x18\x01 \x01(\r\x12\t\n\x01g\x18\x02 \x01(\r\x12\t\n\x01\x62\x18\x03 \x01(\r\"~\n\nDefectInfo\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x10\n\x08\x63lass_id\x18\x02 \x01(\x05\x12&\n\x08ui_color\x18\x03 \x01(\x0b\x32\x14.model.inference.RGB\x12(\n\nmask_color\x18\x04 \x01(\x0b\x32\x14.model.inference.RGB\"g\n\x04\x42\x42ox\x12\t\n\x01x\x18\x01 \x01(\x02\x12\t\n\x01y\x18\x02 \x01(\x02\x12\t\n\x01w\x18\x03 \x01(\x02\x12\t\n\x01h\x18\x04 \x01(\x02\x12\r\n\x05label\x18\x05 \x01(\t\x12\x10\n\x08\x63lass_id\x18\x06 \x01(\x05\x12\x12\n\nconfidence\x18\x07 \x01(\x02\"`\n\x0cPackedBBoxes\x12\t\n\x01x\x18\x01 \x03(\x02\x12\t\n\x01y\x18\x02 \x03(\x02\x12\t\n\x01w\x18\x03 \x03(\x02\x12\t\n\x01h\x18\x04 \x03(\x02\x12\x12\n\nconfidence\x18\x05 \x03(\x02\x12\x10\n\x08\x63lass_id\x18\x06 \x03(\x05\"\x89\x02\n\rInferResponse\x12\x12\n\nmodel_name\x18\x01 \x01(\t\x12(\n\tlist_bbox\x18\x02 \x03(\x0b\x32\x15.model.inference.BBox\x12\x18\n\x10img_segmentation\x18\x03 \x01(\x0c\x12\x30\n\x0b\x64\x65\x66\x65\x63t_list\x18\x04 \x03(\x0b\x32\x1b.model.inference.DefectInfo\x12\r\n\x05\x65rror\x18\x05 \x01(\t\x12\x12\n\nrequest_id\x18\x06 \x01(\t\x12\x32\n\x0bpacked_bbox\x18\x07 \x01(\x0b\x32\x1d.model.inference.PackedBBoxes\x12\x17\n\x0fmodel_info_etag\x18\x08 \x01(\t*0\n\x08Priority\x12\x11\n\rPRIORITY_FAST\x10\x00\x12\x11\n\rPRIORITY_SLOW\x10\x01\x32\xe6\x04\n\x10InferenceMethods\x12\x46\n\x05Infer\x12\x1d.model.inference.InferRequest\x1a\x1e.model.inference.InferResponse\x12P\n\x0bInferStream\x12\x1d.model.inference.InferRequest\x1a\x1e.model.inference.InferResponse(\x01\x30\x01\x12U\n\nInferMulti\x12\".model.inference.InferMultiRequest\x1a#.model.inference.InferMultiResponse\x12M\n\x0cGetModelInfo\x12!.model.inference.ModelInfoRequest\x1a\x1a.model.inference.ModelInfo\x12\x64\n\x14RegisterSharedMemory\x12).model.inference.SharedMemoryRegistration\x1a!.model.inference.SharedMemoryInfo\x12^\n\x16UnregisterSharedMemory\x12!.model.inference.SharedMemoryInfo\x1a!.model.inference.SharedMemoryInfo\x12L\n\x0bInferUpload\x12\x1b.model.inference.ImageChunk\x1a\x1e.model.inference.InferResponse(\x01\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'protos.inference_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
-  _globals['_INFERREQUEST']._serialized_start=43
-  _globals['_INFERREQUEST']._serialized_end=108
-  _globals['_RGB']._serialized_start=110
-  _globals['_RGB']._serialized_end=148
-  _globals['_DEFECTINFO']._serialized_start=150
-  _globals['_DEFECTINFO']._serialized_end=276
-  _globals['_BBOX']._serialized_start=278
-  _globals['_BBOX']._serialized_end=381
-  _globals['_INFERRESPONSE']._serialized_start=384
-  _globals['_INFERRESPONSE']._serialized_end=552
-  _globals['_INFERENCEMETHODS']._serialized_start=554
-  _globals['_INFERENCEMETHODS']._serialized_end=644
+  _globals['_INFERMULTIRESPONSE_RESULTSENTRY']._loaded_options = None
+  _globals['_INFERMULTIRESPONSE_RESULTSENTRY']._serialized_options = b'8\001'
+  _globals['_PRIORITY']._serialized_start=2097
+  _globals['_PRIORITY']._serialized_end=2145
+  _globals['_INFERREQUEST']._serialized_start=44
+  _globals['_INFERREQUEST']._serialized_end=347
+  _globals['_INFERMULTIREQUEST']._serialized_start=350
+  _globals['_INFERMULTIREQUEST']._serialized_end=640
+  _globals['_INFERMULTIRESPONSE']._serialized_start=643
+  _globals['_INFERMULTIRESPONSE']._serialized_end=845
+  _globals['_INFERMULTIRESPONSE_RESULTSENTRY']._serialized_start=767
+  _globals['_INFERMULTIRESPONSE_RESULTSENTRY']._serialized_end=845
+  _globals['_MODELINFOREQUEST']._serialized_start=847
+  _globals['_MODELINFOREQUEST']._serialized_end=885
+  _globals['_MODELINFO']._serialized_start=887
+  _globals['_MODELINFO']._serialized_end=982
+  _globals['_SHAREDMEMORYREGISTRATION']._serialized_start=984
+  _globals['_SHAREDMEMORYREGISTRATION']._serialized_end=1059
+  _globals['_SHAREDMEMORYINFO']._serialized_start=1061
+  _globals['_SHAREDMEMORYINFO']._serialized_end=1114
+  _globals['_SHAREDFRAME']._serialized_start=1116
+  _globals['_SHAREDFRAME']._serialized_end=1219
+  _globals['_IMAGECHUNK']._serialized_start=1221
+  _globals['_IMAGECHUNK']._serialized_end=1331
+  _globals['_RAWIMAGE']._serialized_start=1333
+  _globals['_RAWIMAGE']._serialized_end=1456
+  _globals['_RGB']._serialized_start=1458
+  _globals['_RGB']._serialized_end=1496
+  _globals['_DEFECTINFO']._serialized_start=1498
+  _globals['_DEFECTINFO']._serialized_end=1624
+  _globals['_BBOX']._serialized_start=1626
+  _globals['_BBOX']._serialized_end=1729
+  _globals['_PACKEDBBOXES']._serialized_start=1731
+  _globals['_PACKEDBBOXES']._serialized_end=1827
+  _globals['_INFERRESPONSE']._serialized_start=1830
+  _globals['_INFERRESPONSE']._serialized_end=2095
+  _globals['_INFERENCEMETHODS']._serialized_start=2148
+  _globals['_INFERENCEMETHODS']._serialized_end=2762
 # @@protoc_insertion_point(module_scope)
@@ -24,7 +24,7 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x14protos/service.proto\x12\x05proto\"\x1b\n\x0bPingRequest\x12\x0c\n\x04name\x18\x01 \x01(\t\"\x1c\n\tPingReply\x12\x0f\n\x07message\x18\x01 \x01(\t\"\x1c\n\rStreamRequest\x12\x0b\n\x03max\x18\x01 \x01(\x05\"\x1c\n\x0bStreamReply\x12\r\n\x05value\x18\x01 \x01(\x05\"\x1e\n\rUploadRequest\x12\r\n\x05value\x18\x01 \x01(\x05\"\x1d\n\x0cUploadResult\x12\r\n\x05total\x18\x01 \x01(\x05\"\x1b\n\x0b\x43hatMessage\x12\x0c\n\x04text\x18\x01 \x01(\t2\xeb\x01\n\x0c\x43oreServices\x12,\n\x04Ping\x12\x12.proto.PingRequest\x1a\x10.proto.PingReply\x12;\n\rStreamNumbers\x12\x14.proto.StreamRequest\x1a\x12.proto.StreamReply0\x01\x12<\n\rUploadNumbers\x12\x14.proto.UploadRequest\x1a\x13.proto.UploadResult(\x01\x12\x32\n\x04\x43hat\x12\x12.proto.ChatMessage\x1a\x12.proto.ChatMessage(\x01\x30\x01\x62\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x14protos/service.proto\x12\x05proto\"\x1b\n\x0bPingRequest\x12\x0c\n\x04name\x18\x01 \x01(\t\"\x1c\n\tPingReply\x12\x0f\n\x07message\x18\x01 \x01(\t\"]\n\rStreamRequest\x12\x0b\n\x03max\x18\x01 \x01(\x05\x12\x15\n\rpayload_bytes\x18\x02 \x01(\x05\x12\x18\n\x0binterval_ms\x18\x03 \x01(\x01H\x00\x88\x01\x01\x42\x0e\n\x0c_interval_ms\"-\n\x0bStreamReply\x12\r\n\x05value\x18\x01 \x01(\x05\x12\x0f\n\x07payload\x18\x02 \x01(\x0c\"/\n\rUploadRequest\x12\r\n\x05value\x18\x01 \x01(\x05\x12\x0f\n\x07payload\x18\x02 \x01(\x0c\"C\n\x0cUploadResult\x12\r\n\x05total\x18\x01 \x01(\x05\x12\r\n\x05\x63ount\x18\x02 \x01(\x05\x12\x15\n\rpayload_bytes\x18\x03 \x01(\x03\",\n\x0b\x43hatMessage\x12\x0c\n\x04text\x18\x01 \x01(\t\x12\x0f\n\x07payload\x18\x02 \x01(\x0c\x32\xeb\x01\n\x0c\x43oreServices\x12,\n\x04Ping\x12\x12.proto.PingRequest\x1a\x10.proto.PingReply\x12;\n\rStreamNumbers\x12\x14.proto.StreamRequest\x1a\x12.proto.StreamReply0\x01\x12<\n\rUploadNumbers\x12\x14.proto.UploadRequest\x1a\x13.proto.UploadResult(\x01\x12\x32\n\x04\x43hat\x12\x12.proto.ChatMessage\x1a\x12.proto.ChatMessage(\x01\x30\x01\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -36,15 +36,15 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_PINGREPLY']._serialized_start=60
   _globals['_PINGREPLY']._serialized_end=88
   _globals['_STREAMREQUEST']._serialized_start=90
-  _globals['_STREAMREQUEST']._serialized_end=118
-  _globals['_STREAMREPLY']._serialized_start=120
-  _globals['_STREAMREPLY']._serialized_end=148
-  _globals['_UPLOADREQUEST']._serialized_start=150
-  _globals['_UPLOADREQUEST']._serialized_end=180
-  _globals['_UPLOADRESULT']._serialized_start=182
-  _globals['_UPLOADRESULT']._serialized_end=211
-  _globals['_CHATMESSAGE']._serialized_start=213
-  _globals['_CHATMESSAGE']._serialized_end=240
-  _globals['_CORESERVICES']._serialized_start=243
-  _globals['_CORESERVICES']._serialized_end=478
+  _globals['_STREAMREQUEST']._serialized_end=183
+  _globals['_STREAMREPLY']._serialized_start=185
+  _globals['_STREAMREPLY']._serialized_end=230
+  _globals['_UPLOADREQUEST']._serialized_start=232
+  _globals['_UPLOADREQUEST']._serialized_end=279
+  _globals['_UPLOADRESULT']._serialized_start=281
+  _globals['_UPLOADRESULT']._serialized_end=348
+  _globals['_CHATMESSAGE']._serialized_start=350
+  _globals['_CHATMESSAGE']._serialized_end=394
+  _globals['_CORESERVICES']._serialized_start=397
+  _globals['_CORESERVICES']._serialized_end=632
 # @@protoc_insertion_point(module_scope)
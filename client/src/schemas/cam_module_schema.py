@@ -2,26 +2,47 @@ import numpy as np
 from datetime import datetime, timezone
 from typing import Tuple, Optional
 
+from utils.mono12_packed import mono12_packed_size, pack_mono12_packed, unpack_mono12_packed
+
+
+VALIDATION_MODES = ("full", "sampled", "off")
+SAMPLED_VALIDATION_PIXELS = 65536  # approx. pixels checked per frame in "sampled" mode
+
+
 class CamModuleMetadata:
     """
     Stores grayscale camera data internally as a 1D vector,
     but exposes a 2D matrix for the user.
+
+    Mono12Packed is stored packed (GigE Vision layout, 3 bytes per 2 pixels,
+    uint8 vector); `image_matrix` unpacks it to uint16 on access.
+
+    The setter never copies: a non-contiguous input (ROI, padded camera rows)
+    is kept as the 2D view and only flattened if `vector` is requested.
     """
 
-    def __init__(self, mode: str):
+    def __init__(self, mode: str, validation: str = "full"):
         """
         Initialize the CamMetadata object.
 
         Args:
             mode (str): Image mode, one of {"Mono8", "Mono12", "Mono12Packed"}.
-                Determines dtype/range (e.g., Mono8 → uint8; Mono12 → uint16 [0..4095]).
+                Determines dtype/range (e.g., Mono8 → uint8; Mono12 → uint16 [0..4095];
+                Mono12Packed → uint16 [0..4095] in, 1.5 bytes/pixel stored).
+            validation (str): Mono12 range check per frame, one of {"full", "sampled", "off"}.
+                "full" checks every pixel, "sampled" a strided grid of about
+                SAMPLED_VALIDATION_PIXELS pixels, "off" only dtype/shape.
         """
         self._ALLOWED_MODES = ("Mono8", "Mono12", "Mono12Packed")
         if mode not in self._ALLOWED_MODES:
             raise ValueError(f"mode must be one of {self._ALLOWED_MODES}")
+        if validation not in VALIDATION_MODES:
+            raise ValueError(f"validation must be one of {VALIDATION_MODES}")
 
         self._mode: str = mode
+        self._validation: str = validation
         self._vector: Optional[np.ndarray] = None  # always stored as 1D vector
+        self._matrix: Optional[np.ndarray] = None  # non-contiguous input, kept as a 2D view
         self._height: Optional[int] = None
         self._width: Optional[int] = None
         self._timestamp: datetime = datetime.now(timezone.utc)
@@ -29,7 +50,8 @@ class CamModuleMetadata:
     # ============= SETTER (input: matrix) =============
     def set_image_matrix(self, image_matrix: np.ndarray) -> None:
         """
-        Accepts a 2D matrix and stores it internally as a 1D vector.
+        Accepts a 2D matrix and stores it internally as a 1D vector
+        (a view when contiguous; otherwise the 2D view itself, see `vector`).
         """
         if not isinstance(image_matrix, np.ndarray):
             raise TypeError(f"image_matrix must be numpy.ndarray, got {type(image_matrix)}")
@@ -42,32 +64,59 @@ class CamModuleMetadata:
             if image_matrix.dtype != np.uint8:
                 raise TypeError(f"For Mono8, dtype must be uint8, got {image_matrix.dtype}")
 
-        elif self._mode == "Mono12":
+        elif self._mode in ("Mono12", "Mono12Packed"):
             if image_matrix.dtype != np.uint16:
-                raise TypeError(f"For Mono12, dtype must be uint16, got {image_matrix.dtype}")
-            if image_matrix.size:
-                vmin, vmax = int(image_matrix.min()), int(image_matrix.max())
-                if vmin < 0 or vmax > 4095:
-                    raise ValueError(
-                        f"Mono12 values must be in [0, 4095], got min={vmin}, max={vmax}"
-                    )
-
-        elif self._mode == "Mono12Packed":
-            raise ValueError("Mono12Packed is not implemented yet.")
+                raise TypeError(f"For {self._mode}, dtype must be uint16, got {image_matrix.dtype}")
+            if self._mode == "Mono12Packed":
+                self._check_packed_width(image_matrix.shape[1])
+            self._check_mono12_range(image_matrix)
 
         # ---- Store as 1D vector ----
         self._height, self._width = image_matrix.shape
-        self._vector = image_matrix.reshape(-1)  # always 1D
+        self._matrix = None
+        if self._mode == "Mono12Packed":
+            self._vector = pack_mono12_packed(image_matrix)  # reads strided views directly
+        elif image_matrix.flags.c_contiguous:
+            self._vector = image_matrix.reshape(-1)  # view, always 1D
+        else:
+            # reshape(-1) would copy here: keep the view, flatten only on demand
+            self._vector = None
+            self._matrix = image_matrix
+        self._timestamp = datetime.now(timezone.utc)
+
+    def set_packed_buffer(self, buffer, height: int, width: int) -> None:
+        """
+        Mono12Packed only: stores a packed buffer straight from the camera
+        (bytes, memoryview or uint8 ndarray) as a view, without unpacking or copying.
+        """
+        if self._mode != "Mono12Packed":
+            raise ValueError(f"set_packed_buffer requires mode Mono12Packed, got {self._mode}")
+
+        self._check_packed_width(int(width))
+        size = mono12_packed_size(int(height) * int(width))
+        vector = np.frombuffer(buffer, dtype=np.uint8)
+        if vector.size < size:
+            raise ValueError(f"Mono12Packed buffer has {vector.size} bytes, expected {size}")
+
+        self._height, self._width = int(height), int(width)
+        self._vector = vector[:size]
+        self._matrix = None
         self._timestamp = datetime.now(timezone.utc)
 
     # ============= GETTER (output: matrix) =============
     @property
     def image_matrix(self) -> np.ndarray:
         """
-        Reconstructs the 2D matrix from the stored 1D vector.
+        Reconstructs the 2D matrix from the stored 1D vector
+        (Mono12Packed is unpacked to uint16).
         """
-        if self._vector is None or self._height is None or self._width is None:
+        if not self._has_image():
             raise ValueError("No image has been set. Use set_image_matrix(...) first.")
+        if self._matrix is not None:
+            return self._matrix
+        if self._mode == "Mono12Packed":
+            pixels = unpack_mono12_packed(self._vector, self._height * self._width)
+            return pixels.reshape((self._height, self._width))
         return self._vector.reshape((self._height, self._width))
 
     # ============= METADATA =============
@@ -91,22 +140,66 @@ class CamModuleMetadata:
     def vector(self) -> np.ndarray:
         """
         Returns the internal 1D vector directly (useful for transport/storage).
+        For Mono12Packed these are the packed bytes (uint8).
+        A non-contiguous input is flattened here, once (the only copy).
         """
-        if self._vector is None:
+        if not self._has_image():
             raise ValueError("No image has been set.")
+        if self._vector is None:
+            self._vector = np.ascontiguousarray(self._matrix).reshape(-1)
+            self._matrix = None
         return self._vector
 
+    @property
+    def validation(self) -> str:
+        return self._validation
+
+    @property
+    def is_contiguous(self) -> bool:
+        """False while a non-contiguous input is held as a 2D view."""
+        return self._matrix is None
+
     # ------------ helpers ------------
+    def _has_image(self) -> bool:
+        return (self._vector is not None or self._matrix is not None) and self._height is not None
+
+    @staticmethod
+    def _check_packed_width(width: int) -> None:
+        # pixel pairs never cross a row: the stride is width * 3 / 2 bytes
+        if width % 2:
+            raise ValueError(f"Mono12Packed requires an even width, got width={width}")
+
+    def _check_mono12_range(self, image_matrix: np.ndarray) -> None:
+        if self._validation == "off" or image_matrix.size == 0:
+            return
+
+        sample = image_matrix
+        if self._validation == "sampled":
+            step = max(1, int(np.sqrt(image_matrix.size / SAMPLED_VALIDATION_PIXELS)))
+            sample = image_matrix[::step, ::step]  # view, no copy
+
+        # uint16 is never < 0, so one max() pass checks the whole [0, 4095] range
+        vmax = int(sample.max())
+        if vmax > 4095:
+            raise ValueError(f"Mono12 values must be in [0, 4095], got max={vmax}")
+
     def _dtype(self) -> Optional[np.dtype]:
+        if self._matrix is not None:
+            return self._matrix.dtype
         return None if self._vector is None else self._vector.dtype
 
     def _size(self) -> int:
-        return 0 if self._vector is None else int(self._vector.size)
+        # pixels, not bytes (Mono12Packed stores 1.5 bytes/pixel)
+        if not self._has_image():
+            return 0
+        if self._mode == "Mono12Packed" or self._matrix is not None:
+            return int(self._height * self._width)
+        return int(self._vector.size)
 
     def _preview_vector(self, n: int = 8) -> str:
-        if self._vector is None or self._vector.size == 0:
+        if not self._has_image() or self._size() == 0:
             return "[]"
-        arr = self._vector
+        arr = self._vector if self._vector is not None else self._matrix[0]
         if arr.size <= n:
             return np.array2string(arr, threshold=n)
         head = np.array2string(arr[:n], threshold=n)
@@ -0,0 +1,51 @@
+import os
+
+import numpy as np
+
+from protos import inference_pb2 as pb2
+
+
+# 1 MB por chunk: bem abaixo do GRPC_MAX_MESSAGE_MB do servidor
+CHUNK_BYTES = int(os.getenv("UPLOAD_CHUNK_BYTES", str(1024 * 1024)))
+
+
+def raw_upload_layout(img: np.ndarray):
+    """
+    (RawImage só com o layout, buffer com os pixels) para mandar uma imagem uint8 HxW/HxWx3
+    pelo InferUpload sem JPEG. Views com stride são compactadas (uma cópia); contígua vai como está.
+    """
+    if img.dtype != np.uint8:
+        raise TypeError(f"img deve ser uint8, veio {img.dtype}")
+    if img.ndim == 2:
+        img = img[:, :, None]
+    if img.ndim != 3 or img.shape[2] not in (1, 3):
+        raise ValueError(f"img deve ser HxW ou HxWx3, veio shape={img.shape}")
+
+    img = np.ascontiguousarray(img)
+    h, w, c = img.shape
+    layout = pb2.RawImage(width=w, height=h, channels=c, dtype="uint8", stride=img.strides[0])
+    return layout, img
+
+
+def image_chunks(header: pb2.InferRequest, data, chunk_bytes: int = CHUNK_BYTES):
+    """
+    ImageChunk em ordem a partir de `data` (JPEG/PNG em bytes, ou o buffer de pixels do
+    header.raw_image). O primeiro leva o header e o total; os pedaços são fatias do buffer
+    original, copiadas uma vez só para o bytes do protobuf.
+    """
+    view = memoryview(data).cast("B")
+    total = view.nbytes
+    if total == 0:
+        raise ValueError("Imagem vazia.")
+
+    for offset in range(0, total, chunk_bytes):
+        chunk = pb2.ImageChunk(offset=offset, data=bytes(view[offset:offset + chunk_bytes]))
+        if offset == 0:
+            chunk.header.CopyFrom(header)
+            chunk.total_bytes = total
+        yield chunk
+
+
+def infer_upload(stub, header: pb2.InferRequest, data, chunk_bytes: int = CHUNK_BYTES, timeout: float = 30.0) -> pb2.InferResponse:
+    """Infer de uma imagem grande via InferUpload (header = parâmetros do Infer, sem a imagem)."""
+    return stub.InferUpload(image_chunks(header, data, chunk_bytes), timeout=timeout)
@@ -0,0 +1,118 @@
+class LatencyHistogram:
+    """
+    Histograma de latência no estilo HdrHistogram, em microssegundos inteiros.
+
+    Abaixo de 2^sub_bucket_bits o valor é exato; acima, cada potência de 2 é dividida
+    em 2^(sub_bucket_bits-1) faixas lineares, então o erro relativo de qualquer percentil
+    fica abaixo de 1/2^(sub_bucket_bits-1) (0.8% com o padrão 8), sem guardar as amostras.
+    Dois histogramas com o mesmo sub_bucket_bits podem ser somados (`merge`).
+    """
+
+    def __init__(self, sub_bucket_bits: int = 8):
+        self.sub_bucket_bits = sub_bucket_bits
+        self._sub = 1 << sub_bucket_bits
+        self._half = self._sub >> 1
+        self.counts = []
+        self.count = 0
+        self.total_us = 0
+        self.min_us = None
+        self.max_us = 0
+
+    # ------------ índices ------------
+    def _index(self, value_us: int) -> int:
+        if value_us < self._sub:
+            return value_us
+        shift = value_us.bit_length() - self.sub_bucket_bits
+        return self._sub + (shift - 1) * self._half + ((value_us >> shift) - self._half)
+
+    def _highest_value(self, index: int) -> int:
+        # maior valor que cai no bucket (percentil reportado pelo lado conservador)
+        if index < self._sub:
+            return index
+        shift = (index - self._sub) // self._half + 1
+        mantissa = (index - self._sub) % self._half + self._half
+        return ((mantissa + 1) << shift) - 1
+
+    # ------------ gravação ------------
+    def record_us(self, value_us: int, n: int = 1) -> None:
+        value_us = max(int(value_us), 0)
+        index = self._index(value_us)
+        if index >= len(self.counts):
+            self.counts.extend([0] * (index + 1 - len(self.counts)))
+        self.counts[index] += n
+        self.count += n
+        self.total_us += value_us * n
+        self.min_us = value_us if self.min_us is None else min(self.min_us, value_us)
+        self.max_us = max(self.max_us, value_us)
+
+    def record(self, seconds: float) -> None:
+        self.record_us(round(seconds * 1e6))
+
+    def record_corrected(self, seconds: float, expected_interval: float) -> None:
+        """
+        Correção de coordinated omission (igual ao recordValueWithExpectedInterval do HdrHistogram):
+        num laço fechado, um request lento impede os seguintes de saírem no horário; grava
+        também os requests "que deveriam ter saído" durante a espera, com latência decrescente.
+        """
+        value_us = round(seconds * 1e6)
+        interval_us = round(expected_interval * 1e6)
+        self.record_us(value_us)
+        if interval_us <= 0:
+            return
+        missing = value_us - interval_us
+        while missing >= interval_us:
+            self.record_us(missing)
+            missing -= interval_us
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        if other.sub_bucket_bits != self.sub_bucket_bits:
+            raise ValueError("Histogramas com sub_bucket_bits diferentes não podem ser somados.")
+        if len(other.counts) > len(self.counts):
+            self.counts.extend([0] * (len(other.counts) - len(self.counts)))
+        for i, n in enumerate(other.counts):
+            self.counts[i] += n
+        self.count += other.count
+        self.total_us += other.total_us
+        if other.min_us is not None:
+            self.min_us = other.min_us if self.min_us is None else min(self.min_us, other.min_us)
+        self.max_us = max(self.max_us, other.max_us)
+
+    # ------------ leitura ------------
+    def value_at_percentile_us(self, percentile: float) -> int:
+        if self.count == 0:
+            return 0
+        rank = max(1, -(-self.count * percentile // 100))  # ceil
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(self._highest_value(index), self.max_us)
+        return self.max_us
+
+    def percentile_ms(self, percentile: float) -> float:
+        return self.value_at_percentile_us(percentile) / 1000.0
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_us / self.count / 1000.0 if self.count else 0.0
+
+    def summary_ms(self, percentiles=(50, 90, 99, 99.9, 100)) -> dict:
+        out = {"count": self.count, "mean": round(self.mean_ms, 3), "min": (self.min_us or 0) / 1000.0}
+        for p in percentiles:
+            out[f"p{p:g}"] = self.percentile_ms(p)
+        return out
+
+    def to_dict(self) -> dict:
+        """Resumo + buckets não vazios ([maior valor do bucket em us, contagem]) para o JSON."""
+        return {
+            "summary_ms": self.summary_ms(),
+            "sub_bucket_bits": self.sub_bucket_bits,
+            "buckets_us": [[self._highest_value(i), n] for i, n in enumerate(self.counts) if n],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "LatencyHistogram":
+        hist = cls(data["sub_bucket_bits"])
+        for value_us, n in data["buckets_us"]:
+            hist.record_us(value_us, n)
+        return hist
@@ -0,0 +1,169 @@
+import os
+from typing import Awaitable, Callable
+
+import cv2
+import grpc
+
+from protos import inference_pb2 as pb2
+from protos import inference_pb2_grpc as pb2_grpc
+from protos import service_pb2, service_pb2_grpc
+from utils.chunked_upload import image_chunks
+from utils.raw_image import ndarray_to_raw_image
+
+
+MAX_MSG = 64 * 1024 * 1024
+
+# cenário -> descrição (uma chamada = um request medido)
+SCENARIOS = {
+    "ping": "CoreServices.Ping (unary, RPC puro)",
+    "upload": "CoreServices.UploadNumbers (client streaming, --stream-messages msgs de --payload-bytes)",
+    "stream": "CoreServices.StreamNumbers (server streaming, sem pausa, --stream-messages msgs de --payload-bytes)",
+    "chat": "CoreServices.Chat (bidi com eco, --stream-messages msgs de --payload-bytes)",
+    "infer": "InferenceMethods.Infer (unary, imagem JPEG ou --raw)",
+    "infer_upload": "InferenceMethods.InferUpload (imagem em chunks de --chunk-bytes, JPEG ou --raw)",
+}
+
+
+class ScenarioError(RuntimeError):
+    """Resposta com `error` preenchido: conta como erro mesmo com status OK."""
+
+
+CHANNEL_OPTIONS = [
+    ("grpc.max_send_message_length", MAX_MSG),
+    ("grpc.max_receive_message_length", MAX_MSG),
+]
+
+
+def make_channel(target: str) -> grpc.Channel:
+    return grpc.insecure_channel(target, options=CHANNEL_OPTIONS)
+
+
+def make_aio_channel(target: str) -> grpc.aio.Channel:
+    # precisa ser criado dentro do event loop que vai usá-lo
+    return grpc.aio.insecure_channel(target, options=CHANNEL_OPTIONS)
+
+
+def load_infer_request(image_path: str, raw: bool, confidence: float, model_name: str, packed_bbox: bool) -> pb2.InferRequest:
+    img = cv2.imread(image_path)
+    if img is None:
+        raise RuntimeError(f"Não consegui abrir a imagem: {image_path}")
+
+    req = pb2.InferRequest(confidence_threshold=confidence, model_name=model_name, packed_bbox=packed_bbox)
+    if raw:
+        req.raw_image.CopyFrom(ndarray_to_raw_image(img))
+    else:
+        ok, buf = cv2.imencode(".jpg", img, [int(cv2.IMWRITE_JPEG_QUALITY), 90])
+        if not ok:
+            raise RuntimeError("Falha ao codificar JPEG.")
+        req.image_bytes = buf.tobytes()
+    return req
+
+
+def build_request(args):
+    """Mensagem de entrada do cenário, montada uma vez (imagem lida/codificada fora da medição)."""
+    if args.scenario == "ping":
+        return service_pb2.PingRequest(name="loadgen")
+    payload = bytes(args.payload_bytes)
+    if args.scenario == "upload":
+        return [service_pb2.UploadRequest(value=i, payload=payload) for i in range(args.stream_messages)]
+    if args.scenario == "stream":
+        # interval_ms=0: sem a pausa de demonstração do servidor
+        return service_pb2.StreamRequest(max=args.stream_messages, payload_bytes=args.payload_bytes, interval_ms=0)
+    if args.scenario == "chat":
+        return [service_pb2.ChatMessage(text=str(i), payload=payload) for i in range(args.stream_messages)]
+    if args.scenario in ("infer", "infer_upload"):
+        image_path = os.path.join(args.image_dir, args.image_name)
+        req = load_infer_request(image_path, args.raw, args.confidence, args.model, args.packed_bbox)
+        req.source_id = args.source_id
+        req.priority = pb2.PRIORITY_SLOW if args.priority == "slow" else pb2.PRIORITY_FAST
+        if args.scenario == "infer":
+            return req
+        # InferUpload: header sem os bytes da imagem + chunks prontos (fora da medição)
+        if args.raw:
+            data = req.raw_image.data
+            req.raw_image.data = b""
+        else:
+            data = req.image_bytes
+            req.ClearField("image_bytes")
+        return list(image_chunks(req, data, args.chunk_bytes))
+    raise ValueError(f"Cenário desconhecido: {args.scenario!r}. Use um de {tuple(SCENARIOS)}.")
+
+
+def _make_stub(scenario: str, channel):
+    # os stubs gerados servem tanto para grpc.Channel quanto para grpc.aio.Channel
+    if scenario in ("ping", "upload", "stream", "chat"):
+        return service_pb2_grpc.CoreServicesStub(channel)
+    return pb2_grpc.InferenceMethodsStub(channel)
+
+
+def make_call(scenario: str, channel: grpc.Channel, request, timeout: float) -> Callable[[], int]:
+    """
+    Função que faz uma chamada bloqueante do cenário e devolve o número de bytes
+    de resposta (para MB/s); levanta exceção em erro de RPC ou `error` na resposta.
+    """
+    stub = _make_stub(scenario, channel)
+
+    if scenario == "ping":
+        def call():
+            return stub.Ping(request, timeout=timeout).ByteSize()
+    elif scenario == "upload":
+        def call():
+            return stub.UploadNumbers(iter(request), timeout=timeout).ByteSize()
+    elif scenario == "stream":
+        def call():
+            return sum(msg.ByteSize() for msg in stub.StreamNumbers(request, timeout=timeout))
+    elif scenario == "chat":
+        def call():
+            return sum(msg.ByteSize() for msg in stub.Chat(iter(request), timeout=timeout))
+    elif scenario == "infer_upload":
+        def call():
+            resp = stub.InferUpload(iter(request), timeout=timeout)
+            if resp.error:
+                raise ScenarioError(resp.error)
+            return resp.ByteSize()
+    else:
+        def call():
+            resp = stub.Infer(request, timeout=timeout)
+            if resp.error:
+                raise ScenarioError(resp.error)
+            return resp.ByteSize()
+
+    return call
+
+
+def make_call_async(scenario: str, channel: grpc.aio.Channel, request, timeout: float) -> Callable[[], Awaitable[int]]:
+    """Igual ao make_call, para grpc.aio: a chamada não ocupa thread enquanto espera a resposta."""
+    stub = _make_stub(scenario, channel)
+
+    if scenario == "ping":
+        async def call():
+            return (await stub.Ping(request, timeout=timeout)).ByteSize()
+    elif scenario == "upload":
+        async def call():
+            return (await stub.UploadNumbers(iter(request), timeout=timeout)).ByteSize()
+    elif scenario == "stream":
+        async def call():
+            nbytes = 0
+            async for msg in stub.StreamNumbers(request, timeout=timeout):
+                nbytes += msg.ByteSize()
+            return nbytes
+    elif scenario == "chat":
+        async def call():
+            nbytes = 0
+            async for msg in stub.Chat(iter(request), timeout=timeout):
+                nbytes += msg.ByteSize()
+            return nbytes
+    elif scenario == "infer_upload":
+        async def call():
+            resp = await stub.InferUpload(iter(request), timeout=timeout)
+            if resp.error:
+                raise ScenarioError(resp.error)
+            return resp.ByteSize()
+    else:
+        async def call():
+            resp = await stub.Infer(request, timeout=timeout)
+            if resp.error:
+                raise ScenarioError(resp.error)
+            return resp.ByteSize()
+
+    return call
@@ -0,0 +1,36 @@
+import threading
+
+from protos import inference_pb2 as pb2
+
+
+class ModelInfoCache:
+    """
+    Guarda o ModelInfo (tabela de classes) por modelo no cliente.
+
+    As respostas do Infer trazem só o `model_info_etag`; `get(resp)` devolve o
+    ModelInfo guardado e só chama GetModelInfo quando o etag do modelo mudou
+    (primeira resposta ou modelo recarregado com outras classes).
+    """
+
+    def __init__(self, stub, timeout: float = 10.0):
+        self.stub = stub
+        self.timeout = timeout
+        self._infos = {}  # model_name -> ModelInfo
+        self._lock = threading.Lock()
+
+    def get(self, resp: pb2.InferResponse) -> pb2.ModelInfo:
+        with self._lock:
+            info = self._infos.get(resp.model_name)
+        if info is not None and (not resp.model_info_etag or info.etag == resp.model_info_etag):
+            return info
+        return self.refresh(resp.model_name)
+
+    def refresh(self, model_name: str = "") -> pb2.ModelInfo:
+        info = self.stub.GetModelInfo(pb2.ModelInfoRequest(model_name=model_name), timeout=self.timeout)
+        with self._lock:
+            self._infos[info.model_name] = info
+        return info
+
+    def class_names(self, resp: pb2.InferResponse) -> dict:
+        """class_id -> nome do modelo que respondeu."""
+        return {d.class_id: d.name for d in self.get(resp).defect_list}
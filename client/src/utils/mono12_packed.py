@@ -0,0 +1,75 @@
+from typing import Optional
+
+import numpy as np
+
+
+# GigE Vision Mono12Packed: 2 pixels em 3 bytes
+#   byte0 = p0[11:4]
+#   byte1 = p1[3:0] << 4 | p0[3:0]
+#   byte2 = p1[11:4]
+
+
+def mono12_packed_size(num_pixels: int) -> int:
+    if num_pixels % 2:
+        raise ValueError(f"Mono12Packed precisa de número par de pixels, veio {num_pixels}.")
+    return num_pixels * 3 // 2
+
+
+def unpack_mono12_packed(packed, num_pixels: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Mono12Packed -> uint16 [0..4095], vetorizado. `packed` pode ser qualquer buffer
+    (bytes, memoryview, ndarray uint8): é lido por view, sem cópia de entrada.
+    `out` (uint16 1D com num_pixels) evita alocar a saída a cada frame.
+    """
+    src = np.frombuffer(packed, dtype=np.uint8, count=mono12_packed_size(num_pixels)).reshape(-1, 3)
+    if out is None:
+        out = np.empty(num_pixels, dtype=np.uint16)
+    elif out.dtype != np.uint16 or out.shape != (num_pixels,):
+        raise ValueError(f"out deve ser uint16 com shape ({num_pixels},), veio {out.dtype} {out.shape}.")
+
+    even, odd = out[0::2], out[1::2]
+    b0, b1, b2 = src[:, 0], src[:, 1], src[:, 2]
+
+    # bits altos direto no buffer de saída; só os 4 bits baixos passam por um temporário uint8
+    np.left_shift(b0, 4, out=even, dtype=np.uint16)
+    np.left_shift(b2, 4, out=odd, dtype=np.uint16)
+    low = np.bitwise_and(b1, 0x0F)
+    np.bitwise_or(even, low, out=even, casting="unsafe")
+    np.right_shift(b1, 4, out=low)
+    np.bitwise_or(odd, low, out=odd, casting="unsafe")
+    return out
+
+
+def pack_mono12_packed(pixels: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    uint16 [0..4095] -> Mono12Packed uint8 1D, vetorizado. Matriz 2D de largura par
+    pode ser uma view não contígua (ROI/stride da câmera): é lida sem cópia.
+    `out` (uint8 1D com o tamanho empacotado) evita alocar a saída a cada frame.
+    """
+    if pixels.dtype != np.uint16:
+        raise TypeError(f"pixels deve ser uint16, veio {pixels.dtype}")
+    if pixels.ndim == 2 and pixels.shape[1] % 2:
+        # o par do último pixel seria o primeiro da linha seguinte: stride de linha não fecha
+        raise ValueError(f"Mono12Packed precisa de largura par, veio {pixels.shape[1]}.")
+    size = mono12_packed_size(pixels.size)
+    if out is None:
+        out = np.empty(size, dtype=np.uint8)
+    elif out.dtype != np.uint8 or out.shape != (size,):
+        raise ValueError(f"out deve ser uint8 com shape ({size},), veio {out.dtype} {out.shape}.")
+
+    if pixels.ndim == 2:
+        # pares dentro de cada linha: funciona sobre qualquer stride
+        p0, p1 = pixels[:, 0::2], pixels[:, 1::2]
+        dst = out.reshape(pixels.shape[0], -1, 3)
+    else:
+        flat = pixels.reshape(-1)
+        p0, p1 = flat[0::2], flat[1::2]
+        dst = out.reshape(-1, 3)
+
+    np.right_shift(p0, 4, out=dst[..., 0], casting="unsafe")
+    np.right_shift(p1, 4, out=dst[..., 2], casting="unsafe")
+    low = np.bitwise_and(p1, 0x0F)
+    np.left_shift(low, 4, out=low)
+    np.bitwise_or(low, p0 & 0x0F, out=low)
+    dst[..., 1] = low
+    return out
@@ -0,0 +1,30 @@
+import numpy as np
+
+from protos import inference_pb2 as pb2
+
+
+def packed_bbox_to_numpy(resp: pb2.InferResponse):
+    """
+    Lê InferResponse.packed_bbox direto para arrays NumPy, sem criar um objeto por box.
+    Retorna (xywh float32 [N,4] XYWH top-left, confidence float32 [N], class_id int32 [N]).
+    """
+    packed = resp.packed_bbox
+    n = len(packed.class_id)
+
+    xywh = np.empty((n, 4), dtype=np.float32)
+    for col, values in enumerate((packed.x, packed.y, packed.w, packed.h)):
+        xywh[:, col] = np.fromiter(values, dtype=np.float32, count=n)
+
+    confidence = np.fromiter(packed.confidence, dtype=np.float32, count=n)
+    class_id = np.fromiter(packed.class_id, dtype=np.int32, count=n)
+    return xywh, confidence, class_id
+
+
+def class_names(info) -> dict:
+    """class_id -> nome, a partir do defect_list de um ModelInfo (GetModelInfo)."""
+    return {d.class_id: d.name for d in info.defect_list}
+
+
+def packed_labels(class_id: np.ndarray, names: dict) -> list:
+    """Label de cada box; `names` vem de class_names / ModelInfoCache.class_names."""
+    return [names.get(c, f"class_{c}") for c in class_id.tolist()]
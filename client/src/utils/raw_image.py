@@ -0,0 +1,68 @@
+import numpy as np
+
+from protos import inference_pb2 as pb2
+from schemas.cam_module_schema import CamModuleMetadata
+
+
+# mode do CamModuleMetadata -> (RawImage.dtype, bit_depth)
+CAM_MODE_RAW_FORMAT = {
+    "Mono8": ("uint8", 8),
+    "Mono12": ("uint16", 12),
+    "Mono12Packed": ("mono12packed", 12),
+}
+
+
+def ndarray_to_raw_image(img: np.ndarray) -> pb2.RawImage:
+    """
+    Monta um RawImage a partir de uma imagem uint8 HxW (mono) ou HxWx3 (BGR),
+    sem passar por JPEG. O único custo é a cópia para `bytes` do protobuf.
+    """
+    if img.dtype != np.uint8:
+        raise TypeError(f"img deve ser uint8, veio {img.dtype}")
+    if img.ndim == 2:
+        img = img[:, :, None]
+    if img.ndim != 3 or img.shape[2] not in (1, 3):
+        raise ValueError(f"img deve ser HxW ou HxWx3, veio shape={img.shape}")
+
+    # view com padding/recorte: compacta para não mandar bytes fora da imagem
+    img = np.ascontiguousarray(img)
+    h, w, c = img.shape
+
+    return pb2.RawImage(
+        width=w,
+        height=h,
+        channels=c,
+        dtype="uint8",
+        stride=img.strides[0],
+        data=img.tobytes(),
+    )
+
+
+def cam_metadata_to_raw_image(meta: CamModuleMetadata) -> pb2.RawImage:
+    """
+    RawImage de 1 canal direto do vetor do CamModuleMetadata (Mono8, Mono12 em uint16 ou
+    Mono12Packed a 1.5 byte/pixel), sem passar por BGR nem JPEG: o servidor faz a escala
+    12->8 bits e a replicação dos canais já no tamanho de entrada do modelo.
+    """
+    if meta.mode not in CAM_MODE_RAW_FORMAT:
+        raise ValueError(f"mode {meta.mode!r} sem caminho RawImage. Use um de {tuple(CAM_MODE_RAW_FORMAT)}.")
+    dtype_name, bit_depth = CAM_MODE_RAW_FORMAT[meta.mode]
+
+    if meta.mode == "Mono12Packed":
+        # bytes empacotados como estão: 3 bytes por 2 pixels (largura par garantida pelo CamModuleMetadata)
+        vector = meta.vector
+        stride = meta.width * 3 // 2
+    else:
+        # little-endian no fio (no-op em x86/ARM)
+        vector = meta.vector.astype(np.dtype(dtype_name).newbyteorder("<"), copy=False)
+        stride = meta.width * vector.itemsize
+
+    return pb2.RawImage(
+        width=meta.width,
+        height=meta.height,
+        channels=1,
+        dtype=dtype_name,
+        stride=stride,
+        bit_depth=bit_depth,
+        data=vector.tobytes(),
+    )
@@ -0,0 +1,167 @@
+import time
+import uuid
+from multiprocessing import shared_memory
+
+import grpc
+import numpy as np
+
+from protos import inference_pb2 as pb2
+from schemas.cam_module_schema import CamModuleMetadata
+from utils.raw_image import CAM_MODE_RAW_FORMAT
+
+
+# cabeçalho de cada slot (igual ao servidor): [seq do cliente u64][seq liberado pelo servidor u64]
+SLOT_HEADER_BYTES = 16
+
+# códigos em que o servidor já terminou com o request (ou nem chegou a rodar o handler):
+# o slot não está em uso. DEADLINE_EXCEEDED/CANCELLED ficam de fora: o frame pode estar
+# num lote ainda, e reescrever o slot trocaria os pixels debaixo do modelo.
+RECLAIMABLE_CODES = frozenset({
+    grpc.StatusCode.RESOURCE_EXHAUSTED,
+    grpc.StatusCode.NOT_FOUND,
+    grpc.StatusCode.INVALID_ARGUMENT,
+    grpc.StatusCode.FAILED_PRECONDITION,
+    grpc.StatusCode.INTERNAL,
+})
+
+
+class SharedFrameRing:
+    """
+    Anel de slots em memória compartilhada para mandar frames a um servidor no mesmo host
+    sem serializar os pixels no protobuf: o frame é copiado uma vez para o slot e o request
+    leva só um SharedFrame (segmento, slot, seq, layout).
+
+    Um slot volta a ficar livre quando o servidor grava o seq no cabeçalho (depois do
+    predict). `write()` espera até `timeout` segundos por um slot livre. Se o RPC falhar
+    sem o servidor liberar o slot (ex: recusado pelo próprio gRPC antes do handler), chame
+    `reclaim_on_error(frame, erro)` para o anel não ficar sem slots.
+
+    Servidor em container: /dev/shm precisa ser compartilhado (ipc: host ou volume).
+    """
+
+    def __init__(self, stub, slots: int, slot_bytes: int, timeout: float = 5.0, rpc_timeout: float = 10.0):
+        self.stub = stub
+        self.slots = int(slots)
+        # múltiplo de 8: cabeçalhos u64 alinhados em todos os slots
+        self.slot_bytes = (int(slot_bytes) + 7) // 8 * 8
+        self.slot_stride = SLOT_HEADER_BYTES + self.slot_bytes
+        self.timeout = timeout
+
+        self._shm = shared_memory.SharedMemory(
+            name=f"frames_{uuid.uuid4().hex[:16]}", create=True, size=self.slots * self.slot_stride
+        )
+        self._headers = np.ndarray(
+            (self.slots, 2), dtype=np.uint64, buffer=self._shm.buf, strides=(self.slot_stride, 8)
+        )
+        self._headers[:] = 0
+        self._seq = 0
+        self._next_slot = 0
+
+        try:
+            info = self.stub.RegisterSharedMemory(
+                pb2.SharedMemoryRegistration(name=self._shm.name, slots=self.slots, slot_bytes=self.slot_bytes),
+                timeout=rpc_timeout,
+            )
+        except Exception:
+            # servidor em outro host (FAILED_PRECONDITION) ou fora do ar: não deixa o segmento órfão
+            self._release_segment()
+            raise
+        self.segment_id = info.segment_id
+
+    # ------------ slots ------------
+    def _slot_free(self, slot: int) -> bool:
+        return self._headers[slot, 0] == self._headers[slot, 1]
+
+    def reclaim(self, frame: pb2.SharedFrame) -> None:
+        """Libera o slot do lado do cliente. Só quando o servidor certamente não usa mais o frame."""
+        # frame antigo (slot já reescrito com outro seq) não mexe no slot
+        if self._headers[frame.slot, 0] == frame.seq:
+            self._headers[frame.slot, 1] = frame.seq
+
+    def reclaim_on_error(self, frame: pb2.SharedFrame, error: grpc.RpcError) -> bool:
+        """reclaim() se o código do erro garante que o servidor não está com o frame; retorna se liberou."""
+        if error.code() not in RECLAIMABLE_CODES:
+            return False
+        self.reclaim(frame)
+        return True
+
+    def _acquire(self) -> int:
+        # round-robin: o slot mais antigo é o que tem mais chance de já ter sido liberado
+        deadline = time.perf_counter() + self.timeout
+        while True:
+            for _ in range(self.slots):
+                slot = self._next_slot
+                self._next_slot = (self._next_slot + 1) % self.slots
+                if self._slot_free(slot):
+                    return slot
+            if time.perf_counter() > deadline:
+                raise TimeoutError(f"Nenhum slot livre em {self.timeout}s ({self.slots} slots em uso pelo servidor).")
+            time.sleep(0.0005)
+
+    def _slot_array(self, slot: int, nbytes: int) -> np.ndarray:
+        if nbytes > self.slot_bytes:
+            raise ValueError(f"Frame com {nbytes} bytes não cabe no slot ({self.slot_bytes} bytes).")
+        start = slot * self.slot_stride + SLOT_HEADER_BYTES
+        return np.ndarray((nbytes,), dtype=np.uint8, buffer=self._shm.buf, offset=start)
+
+    def _publish(self, slot: int, layout: pb2.RawImage) -> pb2.SharedFrame:
+        self._seq += 1
+        self._headers[slot, 0] = self._seq
+        return pb2.SharedFrame(segment_id=self.segment_id, slot=slot, seq=self._seq, layout=layout)
+
+    # ------------ escrita ------------
+    def write(self, img: np.ndarray) -> pb2.SharedFrame:
+        """Imagem uint8 HxW (mono) ou HxWx3 (BGR), inclusive views com stride: uma cópia para o slot."""
+        if img.dtype != np.uint8:
+            raise TypeError(f"img deve ser uint8, veio {img.dtype}")
+        if img.ndim == 2:
+            img = img[:, :, None]
+        if img.ndim != 3 or img.shape[2] not in (1, 3):
+            raise ValueError(f"img deve ser HxW ou HxWx3, veio shape={img.shape}")
+
+        h, w, c = img.shape
+        slot = self._acquire()
+        np.copyto(self._slot_array(slot, img.size).reshape(h, w, c), img)
+        layout = pb2.RawImage(width=w, height=h, channels=c, dtype="uint8", stride=w * c)
+        return self._publish(slot, layout)
+
+    def write_cam_metadata(self, meta: CamModuleMetadata) -> pb2.SharedFrame:
+        """Frame do CamModuleMetadata (Mono8, Mono12 ou Mono12Packed) direto no slot, sem BGR nem JPEG."""
+        if meta.mode not in CAM_MODE_RAW_FORMAT:
+            raise ValueError(f"mode {meta.mode!r} sem caminho RawImage. Use um de {tuple(CAM_MODE_RAW_FORMAT)}.")
+        dtype_name, bit_depth = CAM_MODE_RAW_FORMAT[meta.mode]
+        h, w = meta.height, meta.width
+
+        slot = self._acquire()
+        if meta.mode == "Mono12Packed":
+            src = meta.vector
+            np.copyto(self._slot_array(slot, src.size), src)
+            stride = w * 3 // 2
+        else:
+            # image_matrix é view (sem cópia, mesmo com stride); little-endian no slot
+            src = meta.image_matrix
+            dtype = np.dtype(dtype_name).newbyteorder("<")
+            dst = self._slot_array(slot, h * w * dtype.itemsize).view(dtype).reshape(h, w)
+            np.copyto(dst, src, casting="unsafe")
+            stride = w * dtype.itemsize
+
+        layout = pb2.RawImage(width=w, height=h, channels=1, dtype=dtype_name, stride=stride, bit_depth=bit_depth)
+        return self._publish(slot, layout)
+
+    # ------------ ciclo de vida ------------
+    def _release_segment(self) -> None:
+        self._headers = None
+        self._shm.close()
+        self._shm.unlink()
+
+    def close(self, rpc_timeout: float = 10.0) -> None:
+        try:
+            self.stub.UnregisterSharedMemory(pb2.SharedMemoryInfo(segment_id=self.segment_id), timeout=rpc_timeout)
+        finally:
+            self._release_segment()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
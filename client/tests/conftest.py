@@ -0,0 +1,5 @@
+import os
+import sys
+
+# mesmos imports do cliente (rodando de dentro de src/): "from utils...", "from schemas...", "from protos..."
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from schemas.cam_module_schema import SAMPLED_VALIDATION_PIXELS, CamModuleMetadata
+
+
+def test_full_validation_rejects_out_of_range():
+    img = np.zeros((4, 4), dtype=np.uint16)
+    img[3, 3] = 4096
+    with pytest.raises(ValueError, match="4095"):
+        CamModuleMetadata("Mono12", validation="full").set_image_matrix(img)
+
+
+def test_sampled_validation_checks_strided_grid():
+    side = 4 * int(np.sqrt(SAMPLED_VALIDATION_PIXELS))  # passo 4 na amostra
+    img = np.zeros((side, side), dtype=np.uint16)
+
+    img[0, 4] = 4096  # cai na grade
+    with pytest.raises(ValueError):
+        CamModuleMetadata("Mono12", validation="sampled").set_image_matrix(img)
+
+    img[0, 4] = 0
+    img[1, 1] = 4096  # fora da grade: passa (custo de validar só a amostra)
+    CamModuleMetadata("Mono12", validation="sampled").set_image_matrix(img)
+
+
+def test_validation_off_checks_only_dtype_and_shape():
+    meta = CamModuleMetadata("Mono12", validation="off")
+    meta.set_image_matrix(np.full((2, 2), 65535, dtype=np.uint16))
+    with pytest.raises(TypeError):
+        meta.set_image_matrix(np.zeros((2, 2), dtype=np.uint8))
+    with pytest.raises(ValueError):
+        meta.set_image_matrix(np.zeros((2, 2, 1), dtype=np.uint16))
+
+
+def test_invalid_mode_and_validation():
+    with pytest.raises(ValueError):
+        CamModuleMetadata("Mono16")
+    with pytest.raises(ValueError):
+        CamModuleMetadata("Mono12", validation="partial")
+
+
+def test_contiguous_input_is_stored_as_view():
+    img = np.arange(12, dtype=np.uint8).reshape(3, 4)
+    meta = CamModuleMetadata("Mono8")
+    meta.set_image_matrix(img)
+
+    assert meta.is_contiguous
+    assert np.shares_memory(meta.vector, img) and meta.vector.ndim == 1
+    assert np.shares_memory(meta.image_matrix, img)
+
+
+def test_non_contiguous_input_copied_only_on_vector():
+    full = np.arange(48, dtype=np.uint16).reshape(6, 8)
+    roi = full[1:4, 2:6]
+    meta = CamModuleMetadata("Mono12")
+    meta.set_image_matrix(roi)
+
+    # matriz é a própria view; o vetor 1D é a única cópia, feita uma vez
+    assert not meta.is_contiguous
+    assert meta.image_matrix is roi
+    vector = meta.vector
+    assert meta.is_contiguous and not np.shares_memory(vector, full)
+    assert meta.vector is vector
+    assert np.array_equal(meta.image_matrix, roi)
+
+
+def test_packed_buffer_kept_as_view():
+    buffer = bytearray(6 + 3)  # 2x2 Mono12Packed + sobra do buffer da câmera
+    meta = CamModuleMetadata("Mono12Packed")
+    meta.set_packed_buffer(buffer, height=2, width=2)
+
+    assert meta.vector.size == 6
+    buffer[0] = 0xFF  # escrita no buffer aparece no vetor: sem cópia
+    assert meta.vector[0] == 0xFF
+    with pytest.raises(ValueError):
+        CamModuleMetadata("Mono12").set_packed_buffer(buffer, height=2, width=2)
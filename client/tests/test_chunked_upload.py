@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from protos import inference_pb2 as pb2
+from utils.chunked_upload import image_chunks, raw_upload_layout
+
+
+def test_chunks_cover_data_in_order():
+    data = bytes(range(256)) * 4
+    parts = list(image_chunks(pb2.InferRequest(request_id="up-1"), data, chunk_bytes=300))
+
+    assert [c.offset for c in parts] == [0, 300, 600, 900]
+    assert b"".join(c.data for c in parts) == data
+    # header e total só no primeiro
+    assert parts[0].header.request_id == "up-1" and parts[0].total_bytes == len(data)
+    assert not any(c.HasField("header") or c.total_bytes for c in parts[1:])
+
+
+def test_empty_image():
+    with pytest.raises(ValueError):
+        list(image_chunks(pb2.InferRequest(), b""))
+
+
+def test_raw_layout_compacts_strided_view():
+    img = np.arange(4 * 6 * 3, dtype=np.uint8).reshape(4, 6, 3)[:, 1:5]
+    layout, pixels = raw_upload_layout(img)
+
+    assert (layout.width, layout.height, layout.channels, layout.stride) == (4, 4, 3, 12)
+    assert pixels.flags.c_contiguous and np.array_equal(pixels, img)
+    assert sum(len(c.data) for c in image_chunks(pb2.InferRequest(raw_image=layout), pixels, 10)) == 48
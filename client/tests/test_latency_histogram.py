@@ -0,0 +1,78 @@
+import pytest
+
+from utils.latency_histogram import LatencyHistogram
+
+
+def test_exact_below_sub_bucket_range():
+    hist = LatencyHistogram()
+    for value in range(1, 101):
+        hist.record_us(value)
+
+    assert hist.value_at_percentile_us(50) == 50
+    assert hist.value_at_percentile_us(99) == 99
+    assert hist.value_at_percentile_us(100) == 100
+    assert hist.summary_ms()["count"] == 100
+    assert hist.mean_ms == pytest.approx(0.0505)
+
+
+def test_relative_error_bound_for_large_values():
+    hist = LatencyHistogram(sub_bucket_bits=8)
+    values = [1_000 + 37 * i for i in range(1_000)] + [2_500_000]
+    for v in values:
+        hist.record_us(v)
+
+    ordered = sorted(values)
+    for p in (50, 90, 99):
+        exact = ordered[-(-len(values) * p // 100) - 1]
+        got = hist.value_at_percentile_us(p)
+        # lado conservador, dentro de 1/2^(bits-1)
+        assert exact <= got <= exact * (1 + 1 / 128)
+    assert hist.value_at_percentile_us(100) == 2_500_000  # p100 = máximo exato
+
+
+def test_coordinated_omission_correction():
+    plain, corrected = LatencyHistogram(), LatencyHistogram()
+    for _ in range(99):
+        plain.record(0.001)
+        corrected.record_corrected(0.001, expected_interval=0.01)
+    # uma travada de 100 ms num laço que sai a cada 10 ms
+    plain.record(0.1)
+    corrected.record_corrected(0.1, expected_interval=0.01)
+
+    # os 9 requests que deveriam ter saído durante a travada: 90, 80, ..., 10 ms
+    assert corrected.count == plain.count + 9
+    assert plain.percentile_ms(95) == pytest.approx(1.0, rel=0.01)
+    assert corrected.percentile_ms(95) >= 50
+
+
+def test_correction_disabled_without_interval():
+    hist = LatencyHistogram()
+    hist.record_corrected(0.1, expected_interval=0)
+    assert hist.count == 1
+
+
+def test_merge_and_json_roundtrip():
+    a, b = LatencyHistogram(), LatencyHistogram()
+    for v in range(0, 5_000, 7):
+        a.record_us(v)
+    for v in range(100_000, 200_000, 999):
+        b.record_us(v)
+    total = LatencyHistogram.from_dict(a.to_dict())
+    total.merge(LatencyHistogram.from_dict(b.to_dict()))
+
+    assert total.count == a.count + b.count
+    assert total.min_us == 0
+    for p in (10, 50, 90, 99):
+        both = LatencyHistogram()
+        both.merge(a)
+        both.merge(b)
+        assert total.value_at_percentile_us(p) == both.value_at_percentile_us(p)
+
+    with pytest.raises(ValueError):
+        a.merge(LatencyHistogram(sub_bucket_bits=6))
+
+
+def test_empty_histogram():
+    hist = LatencyHistogram()
+    assert hist.value_at_percentile_us(99) == 0
+    assert hist.summary_ms()["min"] == 0.0
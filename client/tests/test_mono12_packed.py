@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from schemas.cam_module_schema import CamModuleMetadata
+from utils.mono12_packed import pack_mono12_packed, unpack_mono12_packed
+
+
+@pytest.mark.parametrize("value", [0, 4095])
+def test_roundtrip_edge_values(value):
+    pixels = np.full((2, 4), value, dtype=np.uint16)
+    packed = pack_mono12_packed(pixels)
+
+    assert packed.size == 12
+    assert np.array_equal(unpack_mono12_packed(packed, pixels.size).reshape(2, 4), pixels)
+
+
+def test_roundtrip_mixed_values_and_strided_view():
+    rng = np.random.default_rng(0)
+    full = rng.integers(0, 4096, size=(6, 10), dtype=np.uint16)
+    full[0, :4] = [0, 4095, 4095, 0]  # bits altos e baixos em cada posição do par
+    roi = full[1:5, 2:8]  # view não contígua (ROI)
+
+    for pixels in (full, roi):
+        packed = pack_mono12_packed(pixels)
+        assert np.array_equal(unpack_mono12_packed(packed, pixels.size).reshape(pixels.shape), pixels)
+
+
+def test_known_layout():
+    # byte0 = p0[11:4], byte1 = p1[3:0] << 4 | p0[3:0], byte2 = p1[11:4]
+    packed = pack_mono12_packed(np.array([[0xABC, 0x123]], dtype=np.uint16))
+    assert packed.tolist() == [0xAB, 0x3C, 0x12]
+
+
+def test_pack_rejects_odd_width():
+    with pytest.raises(ValueError):
+        pack_mono12_packed(np.zeros((2, 3), dtype=np.uint16))
+
+
+def test_cam_metadata_rejects_odd_width():
+    meta = CamModuleMetadata("Mono12Packed")
+    with pytest.raises(ValueError, match="even width"):
+        meta.set_image_matrix(np.zeros((2, 3), dtype=np.uint16))
+    with pytest.raises(ValueError, match="even width"):
+        meta.set_packed_buffer(bytes(9), height=2, width=3)
+
+    # Mono12 sem empacotar aceita qualquer largura
+    CamModuleMetadata("Mono12").set_image_matrix(np.zeros((2, 3), dtype=np.uint16))
+
+
+def test_cam_metadata_roundtrip():
+    pixels = np.array([[0, 4095, 1, 4094], [2048, 7, 4095, 0]], dtype=np.uint16)
+    meta = CamModuleMetadata("Mono12Packed")
+    meta.set_image_matrix(pixels)
+
+    assert meta.vector.dtype == np.uint8 and meta.vector.size == 12
+    assert np.array_equal(meta.image_matrix, pixels)
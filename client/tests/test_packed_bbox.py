@@ -0,0 +1,31 @@
+import numpy as np
+
+from protos import inference_pb2 as pb2
+from utils.packed_bbox import class_names, packed_bbox_to_numpy, packed_labels
+
+
+def test_decodes_columns():
+    resp = pb2.InferResponse(
+        packed_bbox=pb2.PackedBBoxes(
+            x=[10, 100], y=[20, 50], w=[20, 50], h=[40, 30], confidence=[0.9, 0.5], class_id=[0, 3]
+        )
+    )
+    xywh, confidence, class_id = packed_bbox_to_numpy(resp)
+
+    assert xywh.dtype == np.float32 and xywh.shape == (2, 4)
+    assert xywh.tolist() == [[10, 20, 20, 40], [100, 50, 50, 30]]
+    assert np.allclose(confidence, [0.9, 0.5])
+    assert class_id.dtype == np.int32 and class_id.tolist() == [0, 3]
+
+
+def test_empty_response():
+    xywh, confidence, class_id = packed_bbox_to_numpy(pb2.InferResponse())
+    assert xywh.shape == (0, 4) and confidence.shape == class_id.shape == (0,)
+
+
+def test_labels_from_model_info():
+    info = pb2.ModelInfo(defect_list=[pb2.DefectInfo(class_id=0, name="risco")])
+    names = class_names(info)
+
+    # classe fora do defect_list (ModelInfo antigo): nome genérico em vez de erro
+    assert packed_labels(np.array([0, 3], dtype=np.int32), names) == ["risco", "class_3"]
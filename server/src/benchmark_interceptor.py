@@ -0,0 +1,153 @@
+import multiprocessing as mp
+import os
+import threading
+import time
+from collections import namedtuple
+from concurrent import futures
+from statistics import median
+
+import grpc
+
+from infra.grpc.service import CoreService
+from monitoring.grpc_interceptor import MetricsInterceptor, track_executor_queue
+from protos import service_pb2, service_pb2_grpc
+
+
+# ===== CONFIG =====
+CLIENT_PROCESSES = int(os.getenv("CLIENT_PROCESSES", "4"))  # clientes em processos: o servidor satura antes deles
+CLIENTS = int(os.getenv("CLIENTS", "8"))            # threads por processo cliente chamando Ping
+DURATION_S = float(os.getenv("DURATION_S", "5"))    # duração de cada rodada
+ROUNDS = int(os.getenv("ROUNDS", "6"))              # rodadas alternando sem/com interceptor
+MICRO_CALLS = int(os.getenv("MICRO_CALLS", "200000"))
+MAX_WORKERS = int(os.getenv("GRPC_MAX_WORKERS", "10"))
+# ==================
+
+_CallDetails = namedtuple("_CallDetails", ["method", "invocation_metadata"])
+PING_METHOD = "/proto.CoreServices/Ping"
+
+
+class _Context:
+    def code(self):
+        return None
+
+
+def serve(intercepted: bool, port_q, stop, cpu_q) -> None:
+    # mesmo servidor do start_grpc_server, num processo próprio (não divide GIL com os clientes)
+    cpu0 = time.process_time()
+    executor = futures.ThreadPoolExecutor(max_workers=MAX_WORKERS)
+    server = grpc.server(executor, interceptors=[MetricsInterceptor()] if intercepted else [])
+    if intercepted:
+        track_executor_queue(executor)
+    service_pb2_grpc.add_CoreServicesServicer_to_server(CoreService(), server)
+    port_q.put(server.add_insecure_port("127.0.0.1:0"))
+    server.start()
+    stop.wait()
+    cpu_q.put(time.process_time() - cpu0)
+    server.stop(0)
+
+
+def ping_client(port: int, start_at: float, count_q) -> None:
+    channel = grpc.insecure_channel(f"127.0.0.1:{port}")
+    stub = service_pb2_grpc.CoreServicesStub(channel)
+    request = service_pb2.PingRequest(name="bench")
+    for _ in range(200):  # warmup
+        stub.Ping(request)
+
+    counts = [0] * CLIENTS
+    # time.time(): mesmo relógio em todos os processos
+    while time.time() < start_at:
+        time.sleep(0.001)
+    deadline = time.perf_counter() + DURATION_S
+
+    def client(i: int) -> None:
+        n = 0
+        while time.perf_counter() < deadline:
+            stub.Ping(request)
+            n += 1
+        counts[i] = n
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(CLIENTS)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    channel.close()
+    count_q.put(sum(counts) + 200)
+
+
+def run_round(intercepted: bool) -> tuple:
+    """(req/s, us de CPU do servidor por request)."""
+    ctx = mp.get_context("spawn")
+    port_q, stop, cpu_q, count_q = ctx.Queue(), ctx.Event(), ctx.Queue(), ctx.Queue()
+    server = ctx.Process(target=serve, args=(intercepted, port_q, stop, cpu_q), daemon=True)
+    server.start()
+    try:
+        port = port_q.get(timeout=30)
+        start_at = time.time() + 2.0  # tempo para os clientes subirem e aquecerem
+        clients = [
+            ctx.Process(target=ping_client, args=(port, start_at, count_q), daemon=True)
+            for _ in range(CLIENT_PROCESSES)
+        ]
+        for c in clients:
+            c.start()
+        total = sum(count_q.get(timeout=DURATION_S + 60) for _ in clients)
+        for c in clients:
+            c.join(timeout=10)
+    finally:
+        stop.set()
+    cpu = cpu_q.get(timeout=10)
+    server.join(timeout=10)
+    return (total - 200 * CLIENT_PROCESSES) / DURATION_S, cpu / total * 1e6
+
+
+def micro_cost_us() -> tuple:
+    """Custo por chamada no servidor (deserialize + handler + serialize), sem rede."""
+    handler = grpc.unary_unary_rpc_method_handler(
+        CoreService().Ping,
+        request_deserializer=service_pb2.PingRequest.FromString,
+        response_serializer=service_pb2.PingReply.SerializeToString,
+    )
+    wrapped = MetricsInterceptor().intercept_service(lambda _: handler, _CallDetails(PING_METHOD, ()))
+    data = service_pb2.PingRequest(name="bench").SerializeToString()
+    ctx = _Context()
+
+    out = []
+    for h in (handler, wrapped):
+        t0 = time.perf_counter()
+        for _ in range(MICRO_CALLS):
+            h.response_serializer(h.unary_unary(h.request_deserializer(data), ctx))
+        out.append((time.perf_counter() - t0) / MICRO_CALLS * 1e6)
+    return tuple(out)
+
+
+def main():
+    plain_us, wrapped_us = micro_cost_us()
+    print(
+        f"\n=== MetricsInterceptor | Ping | {CLIENT_PROCESSES}x{CLIENTS} clientes | "
+        f"{ROUNDS} rodadas de {DURATION_S:.0f}s ==="
+    )
+    print(f"por chamada (sem rede): sem={plain_us:.2f} us  com={wrapped_us:.2f} us  (+{wrapped_us - plain_us:.2f} us)")
+
+    rates = {False: [], True: []}
+    cpus = {False: [], True: []}
+    for r in range(ROUNDS):
+        # alterna a ordem a cada rodada para não favorecer um lado (aquecimento, turbo, etc.)
+        for intercepted in ((False, True) if r % 2 == 0 else (True, False)):
+            rate, cpu_us = run_round(intercepted)
+            rates[intercepted].append(rate)
+            cpus[intercepted].append(cpu_us)
+            print(
+                f"  rodada {r + 1}  {'com' if intercepted else 'sem'} interceptor: "
+                f"{rate:>9,.0f} req/s  {cpu_us:6.1f} us CPU/req no servidor"
+            )
+
+    plain, wrapped = median(rates[False]), median(rates[True])
+    plain_cpu, wrapped_cpu = median(cpus[False]), median(cpus[True])
+    print(
+        f"\nmediana: sem={plain:,.0f} req/s  com={wrapped:,.0f} req/s  "
+        f"overhead throughput={(1 - wrapped / plain) * 100:+.1f}%  CPU/req={(wrapped_cpu / plain_cpu - 1) * 100:+.1f}%"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -2,13 +2,29 @@ from concurrent import futures
 import grpc
 
 from infra.grpc.service import CoreService
+from monitoring.grpc_interceptor import MetricsInterceptor, track_executor_queue
+from monitoring.prometheus_metrics import start_metrics_server
 from protos import service_pb2_grpc
 
 
+# benchmark de streaming manda payloads de até 4 MB por mensagem (o default do gRPC recebe no máximo 4 MB)
+MAX_MSG = 64 * 1024 * 1024
+
+
 def start_grpc_server():
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
+    executor = futures.ThreadPoolExecutor(max_workers=10)
+    server = grpc.server(
+        executor,
+        interceptors=[MetricsInterceptor()],
+        options=[
+            ("grpc.max_send_message_length", MAX_MSG),
+            ("grpc.max_receive_message_length", MAX_MSG),
+        ],
+    )
+    track_executor_queue(executor)
     service_pb2_grpc.add_CoreServicesServicer_to_server(CoreService(), server)
     server.add_insecure_port("[::]:50051")
+    start_metrics_server()
     server.start()
     print("gRPC running on 50051")
     server.wait_for_termination()
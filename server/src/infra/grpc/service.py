@@ -2,6 +2,10 @@ import time
 from protos import service_pb2, service_pb2_grpc
 
 
+# pausa padrão do StreamNumbers quando o request não define interval_ms (demo)
+DEFAULT_STREAM_INTERVAL_MS = 300.0
+
+
 class CoreService(service_pb2_grpc.CoreServicesServicer):
 
     # 1️⃣ Unary
@@ -12,18 +16,24 @@ class CoreService(service_pb2_grpc.CoreServicesServicer):
 
     # 2️⃣ Server Streaming
     def StreamNumbers(self, request, context):
+        # interval_ms=0 tira a pausa: o benchmark mede o streaming, não o sleep
+        interval_ms = request.interval_ms if request.HasField("interval_ms") else DEFAULT_STREAM_INTERVAL_MS
+        payload = bytes(max(request.payload_bytes, 0))
         for i in range(1, request.max + 1):
-            yield service_pb2.StreamReply(value=i)
-            time.sleep(0.3)
+            yield service_pb2.StreamReply(value=i, payload=payload)
+            if interval_ms > 0:
+                time.sleep(interval_ms / 1000.0)
 
     # 3️⃣ Client Streaming
     def UploadNumbers(self, request_iterator, context):
-        total = 0
+        total = count = payload_bytes = 0
         for req in request_iterator:
             total += req.value
-        return service_pb2.UploadResult(total=total)
+            count += 1
+            payload_bytes += len(req.payload)
+        return service_pb2.UploadResult(total=total, count=count, payload_bytes=payload_bytes)
 
     # 4️⃣ Bidirectional Streaming
     def Chat(self, request_iterator, context):
         for msg in request_iterator:
-            yield service_pb2.ChatMessage(text=f"Server received: {msg.text}")
+            yield service_pb2.ChatMessage(text=f"Server received: {msg.text}", payload=msg.payload)
@@ -0,0 +1,259 @@
+import asyncio
+import inspect
+import threading
+import time
+
+import grpc
+from prometheus_client import Counter, Gauge, Histogram
+
+
+# Mesmo arquivo em server/src e server_with_gpu/src (como os protos): mudou um, copia no outro.
+
+# 50 us .. 10 s: Ping fica em sub-ms, Infer de imagem grande passa de 1 s
+LATENCY_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# 16 B .. 64 MB (GRPC_MAX_MESSAGE_MB)
+BYTES_BUCKETS = tuple(16 * 4 ** i for i in range(12))
+
+GRPC_SERVER_HANDLING_SECONDS = Histogram(
+    "grpc_server_handling_seconds",
+    "Tempo do RPC na thread/loop do servidor, do início do handler até a última resposta (s)",
+    ["method"],
+    buckets=LATENCY_BUCKETS,
+)
+GRPC_SERVER_REQUEST_BYTES = Histogram(
+    "grpc_server_request_bytes", "Bytes por mensagem recebida (antes do deserialize)", ["method"], buckets=BYTES_BUCKETS
+)
+GRPC_SERVER_RESPONSE_BYTES = Histogram(
+    "grpc_server_response_bytes", "Bytes por mensagem enviada (depois do serialize)", ["method"], buckets=BYTES_BUCKETS
+)
+GRPC_SERVER_IN_FLIGHT = Gauge("grpc_server_in_flight", "RPCs com handler rodando", ["method"])
+GRPC_SERVER_HANDLED = Counter("grpc_server_handled_total", "RPCs terminados por método e código gRPC", ["method", "code"])
+GRPC_SERVER_EXECUTOR_QUEUED = Gauge(
+    "grpc_server_executor_queued", "RPCs aceitos pelo gRPC esperando uma thread livre do ThreadPoolExecutor"
+)
+
+
+class _MethodMetrics:
+    """Children de um método, criados na primeira chamada; depois o caminho quente só faz observe()/inc()."""
+
+    __slots__ = ("method", "handling", "request_bytes", "response_bytes", "in_flight", "_handled", "_lock")
+
+    def __init__(self, method: str):
+        self.method = method
+        self.handling = GRPC_SERVER_HANDLING_SECONDS.labels(method=method)
+        self.request_bytes = GRPC_SERVER_REQUEST_BYTES.labels(method=method)
+        self.response_bytes = GRPC_SERVER_RESPONSE_BYTES.labels(method=method)
+        self.in_flight = GRPC_SERVER_IN_FLIGHT.labels(method=method)
+        self._handled = {}
+        self._lock = threading.Lock()
+
+    def handled(self, code: grpc.StatusCode):
+        child = self._handled.get(code)
+        if child is None:
+            with self._lock:
+                child = self._handled.get(code)
+                if child is None:
+                    child = GRPC_SERVER_HANDLED.labels(method=self.method, code=code.name)
+                    self._handled[code] = child
+        return child
+
+    def finish(self, t0: float, code: grpc.StatusCode) -> None:
+        self.handling.observe(time.perf_counter() - t0)
+        self.in_flight.dec()
+        self.handled(code).inc()
+
+
+def _final_code(context, failed: bool) -> grpc.StatusCode:
+    # código definido pelo servicer (set_code/abort); sem código = OK, ou UNKNOWN se o handler levantou
+    try:
+        code = context.code()
+    except Exception:
+        code = None
+    if code is None:
+        return grpc.StatusCode.UNKNOWN if failed else grpc.StatusCode.OK
+    return code
+
+
+def _sized_deserializer(deserializer, m: _MethodMetrics):
+    def deserialize(data):
+        m.request_bytes.observe(len(data))
+        return deserializer(data)
+
+    return deserialize
+
+
+def _sized_serializer(serializer, m: _MethodMetrics):
+    def serialize(message):
+        data = serializer(message)
+        m.response_bytes.observe(len(data))
+        return data
+
+    return serialize
+
+
+def _with_sizes(handler, m: _MethodMetrics) -> dict:
+    # handlers sem (de)serializer trafegam bytes crus: nada a medir
+    fields = {}
+    if handler.request_deserializer is not None:
+        fields["request_deserializer"] = _sized_deserializer(handler.request_deserializer, m)
+    if handler.response_serializer is not None:
+        fields["response_serializer"] = _sized_serializer(handler.response_serializer, m)
+    return fields
+
+
+# =========================
+# SYNC (grpc.server)
+# =========================
+def _timed_unary(behavior, m: _MethodMetrics):
+    def handle(request_or_iterator, context):
+        m.in_flight.inc()
+        t0 = time.perf_counter()
+        failed = True
+        try:
+            response = behavior(request_or_iterator, context)
+            failed = False
+            return response
+        finally:
+            m.finish(t0, _final_code(context, failed))
+
+    return handle
+
+
+def _timed_stream(behavior, m: _MethodMetrics):
+    def handle(request_or_iterator, context):
+        m.in_flight.inc()
+        t0 = time.perf_counter()
+        code = None
+        try:
+            yield from behavior(request_or_iterator, context)
+            code = _final_code(context, False)
+        except GeneratorExit:
+            # gerador fechado pelo gRPC antes do fim: cliente cancelou
+            code = grpc.StatusCode.CANCELLED
+            raise
+        finally:
+            m.finish(t0, code or _final_code(context, True))
+
+    return handle
+
+
+def _wrap_handler(handler, m: _MethodMetrics, timed_unary, timed_stream):
+    fields = _with_sizes(handler, m)
+    if handler.unary_unary is not None:
+        fields["unary_unary"] = timed_unary(handler.unary_unary, m)
+    elif handler.stream_unary is not None:
+        fields["stream_unary"] = timed_unary(handler.stream_unary, m)
+    elif handler.unary_stream is not None:
+        fields["unary_stream"] = timed_stream(handler.unary_stream, m)
+    elif handler.stream_stream is not None:
+        fields["stream_stream"] = timed_stream(handler.stream_stream, m)
+    return handler._replace(**fields)
+
+
+class _HandlerCache:
+    """
+    Handler embrulhado por método, montado uma vez: o gRPC devolve o mesmo handler
+    registrado a cada chamada, então o interceptor não aloca nada por RPC.
+    Só métodos registrados entram (método desconhecido não cria série).
+    """
+
+    def __init__(self, timed_unary, timed_stream):
+        self._timed_unary = timed_unary
+        self._timed_stream = timed_stream
+        self._wrapped = {}
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def wrap(self, handler, method: str):
+        if handler is None:
+            return None
+        cached = self._wrapped.get(method)
+        if cached is not None and cached[0] is handler:
+            return cached[1]
+        with self._lock:
+            m = self._metrics.get(method)
+            if m is None:
+                m = self._metrics[method] = _MethodMetrics(method)
+            wrapped = _wrap_handler(handler, m, self._timed_unary, self._timed_stream)
+            self._wrapped[method] = (handler, wrapped)
+        return wrapped
+
+
+class MetricsInterceptor(grpc.ServerInterceptor):
+    """
+    Latência por método, bytes por mensagem (request/response), RPCs em andamento e
+    terminados por código. Registrar como o primeiro interceptor do grpc.server.
+    """
+
+    def __init__(self):
+        self._handlers = _HandlerCache(_timed_unary, _timed_stream)
+
+    def intercept_service(self, continuation, handler_call_details):
+        return self._handlers.wrap(continuation(handler_call_details), handler_call_details.method)
+
+
+def track_executor_queue(executor) -> None:
+    """
+    grpc_server_executor_queued = tarefas na fila do ThreadPoolExecutor do grpc.server
+    (RPCs aceitos esperando thread). Lido só no scrape: nada no caminho quente.
+    """
+    # _work_queue é detalhe interno do ThreadPoolExecutor do CPython (não é API pública):
+    # executor sem ele (outra implementação/versão) fica sem o gauge em vez de quebrar o scrape
+    work_queue = getattr(executor, "_work_queue", None)
+    if work_queue is None or not hasattr(work_queue, "qsize"):
+        print("[SERVER] grpc_server_executor_queued desligado: executor sem _work_queue.")
+        return
+    GRPC_SERVER_EXECUTOR_QUEUED.set_function(work_queue.qsize)
+
+
+# =========================
+# AIO (grpc.aio.server)
+# =========================
+def _timed_unary_aio(behavior, m: _MethodMetrics):
+    async def handle(request_or_iterator, context):
+        m.in_flight.inc()
+        t0 = time.perf_counter()
+        code = None
+        try:
+            response = await behavior(request_or_iterator, context)
+            code = _final_code(context, False)
+            return response
+        except asyncio.CancelledError:
+            code = grpc.StatusCode.CANCELLED
+            raise
+        finally:
+            m.finish(t0, code or _final_code(context, True))
+
+    return handle
+
+
+def _timed_stream_aio(behavior, m: _MethodMetrics):
+    if not inspect.isasyncgenfunction(behavior):
+        # handler de stream escrito com context.write(): é uma corrotina
+        return _timed_unary_aio(behavior, m)
+
+    async def handle(request_or_iterator, context):
+        m.in_flight.inc()
+        t0 = time.perf_counter()
+        code = None
+        try:
+            async for response in behavior(request_or_iterator, context):
+                yield response
+            code = _final_code(context, False)
+        except (GeneratorExit, asyncio.CancelledError):
+            code = grpc.StatusCode.CANCELLED
+            raise
+        finally:
+            m.finish(t0, code or _final_code(context, True))
+
+    return handle
+
+
+class AioMetricsInterceptor(grpc.aio.ServerInterceptor):
+    """MetricsInterceptor para o grpc.aio.server (handlers async)."""
+
+    def __init__(self):
+        self._handlers = _HandlerCache(_timed_unary_aio, _timed_stream_aio)
+
+    async def intercept_service(self, continuation, handler_call_details):
+        return self._handlers.wrap(await continuation(handler_call_details), handler_call_details.method)
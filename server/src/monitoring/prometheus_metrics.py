@@ -1,4 +1,6 @@
-from prometheus_client import Counter, Summary
+import os
+
+from prometheus_client import Counter, Summary, start_http_server
 
 LOOP_ITERATIONS = Counter(
     "loop_iterations_total", "Total loop iterations", ["camera", "stream"]
@@ -6,3 +8,12 @@ LOOP_ITERATIONS = Counter(
 LOOP_ITERATION_TIME = Summary(
     "loop_iteration_seconds", "Loop iteration duration (s)", ["camera", "stream"]
 )
+
+
+def start_metrics_server() -> None:
+    """/metrics em METRICS_PORT (9100; 0 = desligado), numa thread ao lado do servidor gRPC."""
+    port = int(os.getenv("METRICS_PORT", "9100"))
+    if port <= 0:
+        return
+    start_http_server(port)
+    print(f"Prometheus /metrics on {port}")
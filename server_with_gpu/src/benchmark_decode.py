@@ -0,0 +1,104 @@
+import os
+import glob
+import time
+from statistics import mean
+
+import cv2
+import numpy as np
+
+from infra.image.image_decoder import ScaledImage, decode_image, decode_image_reduced
+
+
+# ===== CONFIG =====
+IMAGE_DIR = os.getenv("IMAGE_DIR", "")            # vazio = imagens sintéticas
+IMGSZ = int(os.getenv("MODEL_IMGSZ", "640"))
+ITERATIONS = int(os.getenv("ITERATIONS", "30"))
+MODEL_PATH = os.getenv("MODEL_PATH", "")          # vazio = só tempo de decode (sem paridade)
+CONF = float(os.getenv("CONF", "0.25"))
+IOU_MATCH = float(os.getenv("IOU_MATCH", "0.5"))
+# ==================
+
+
+def load_images() -> list:
+    if IMAGE_DIR:
+        paths = sorted(glob.glob(os.path.join(IMAGE_DIR, "*.jp*g")))
+        if not paths:
+            raise RuntimeError(f"Nenhum JPEG em {IMAGE_DIR}")
+        return [(os.path.basename(p), open(p, "rb").read()) for p in paths]
+
+    rng = np.random.default_rng(0)
+    out = []
+    for w, h in ((1920, 1080), (4096, 3000), (8192, 6000)):
+        img = cv2.GaussianBlur(rng.integers(0, 255, (h, w, 3), dtype=np.uint8), (9, 9), 0)
+        out.append((f"sintetica_{w}x{h}", cv2.imencode(".jpg", img, [int(cv2.IMWRITE_JPEG_QUALITY), 90])[1].tobytes()))
+    return out
+
+
+def timed_ms(fn) -> float:
+    fn()  # warmup
+    out = []
+    for _ in range(ITERATIONS):
+        t0 = time.perf_counter()
+        fn()
+        out.append(time.perf_counter() - t0)
+    return mean(out) * 1000.0
+
+
+def iou(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    # a: [N,4], b: [M,4] xyxy -> [N,M]
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    return inter / np.maximum(area_a[:, None] + area_b[None, :] - inter, 1e-9)
+
+
+def parity(model, image_bytes: bytes) -> str:
+    """Detecções do decode completo que também aparecem (mesma classe, IoU >= IOU_MATCH) no reduzido."""
+    from infra.model.loaded_model import rescale_boxes
+
+    full = model.predict(decode_image(image_bytes), imgsz=IMGSZ, conf=CONF, verbose=False)[0]
+
+    img, orig_shape = decode_image_reduced(image_bytes, IMGSZ)
+    reduced = model.predict(img, imgsz=IMGSZ, conf=CONF, verbose=False)[0]
+    if img.shape[:2] != tuple(orig_shape):
+        rescale_boxes(reduced, ScaledImage(img, orig_shape))
+
+    a = full.boxes.data.cpu().numpy()
+    b = reduced.boxes.data.cpu().numpy()
+    if len(a) == 0:
+        return f"paridade: full=0 reduced={len(b)}"
+    if len(b) == 0:
+        return f"paridade: full={len(a)} reduced=0 (0.0%)"
+
+    same_cls = a[:, None, 5] == b[None, :, 5]
+    matched = ((iou(a[:, :4], b[:, :4]) >= IOU_MATCH) & same_cls).any(axis=1).sum()
+    return f"paridade: full={len(a)} reduced={len(b)} casadas={matched} ({matched / len(a) * 100:.1f}%)"
+
+
+def main():
+    model = None
+    if MODEL_PATH:
+        from ultralytics import YOLO
+        model = YOLO(MODEL_PATH)
+
+    print(f"\n=== Decode JPEG completo vs reduzido (lado maior >= {IMGSZ}) | {ITERATIONS} iterações ===")
+    for name, image_bytes in load_images():
+        img, orig_shape = decode_image_reduced(image_bytes, IMGSZ)
+        full_ms = timed_ms(lambda: decode_image(image_bytes))
+        reduced_ms = timed_ms(lambda: decode_image_reduced(image_bytes, IMGSZ))
+
+        line = (
+            f"{name:<24} {orig_shape[1]}x{orig_shape[0]} -> {img.shape[1]}x{img.shape[0]}  "
+            f"full={full_ms:8.2f} ms  reduced={reduced_ms:8.2f} ms  speedup={full_ms / reduced_ms:5.1f}x"
+        )
+        if model is not None:
+            line += "  " + parity(model, image_bytes)
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
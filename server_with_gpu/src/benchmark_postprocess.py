@@ -0,0 +1,82 @@
+import os
+import time
+
+import torch
+from ultralytics.engine.results import Boxes
+
+from protos import inference_pb2 as pb2
+from infra.model.postprocess import boxes_to_pb2
+
+
+# ===== CONFIG =====
+BOX_COUNTS = [int(n) for n in os.getenv("BOX_COUNTS", "10,100,1000").split(",")]
+REPEATS = int(os.getenv("REPEATS", "200"))
+CONF = float(os.getenv("CONF", "0.10"))
+DEVICE = os.getenv("DEVICE", "cuda" if torch.cuda.is_available() else "cpu")
+NUM_CLASSES = 20
+# ==================
+
+
+class FakeResult:
+    # só o que o pós-processamento lê de um Results do ultralytics
+    def __init__(self, boxes: Boxes):
+        self.boxes = boxes
+
+
+def make_result(n: int) -> FakeResult:
+    g = torch.Generator().manual_seed(n)
+    xy = torch.rand(n, 2, generator=g) * 1500
+    wh = torch.rand(n, 2, generator=g) * 200 + 1
+    score = torch.rand(n, 1, generator=g)
+    cls = torch.randint(0, NUM_CLASSES, (n, 1), generator=g).float()
+    data = torch.cat([xy, xy + wh, score, cls], dim=1).to(DEVICE)
+    return FakeResult(Boxes(data, orig_shape=(1080, 1920)))
+
+
+def loop_postprocess(result, names: dict, conf: float) -> list:
+    # caminho antigo: um box por vez, cada acesso é uma op de tensor (+ sync com o host na GPU)
+    out = []
+    for box in result.boxes:
+        cls_id = int(box.cls[0])
+        score = float(box.conf[0])
+        if score < conf:
+            continue
+        x1, y1, x2, y2 = box.xyxy[0].tolist()
+        out.append(
+            pb2.BBox(
+                x=float(x1), y=float(y1), w=float(x2 - x1), h=float(y2 - y1),
+                label=str(names.get(cls_id, f"class_{cls_id}")), class_id=cls_id, confidence=score,
+            )
+        )
+    return out
+
+
+def bench(fn, result, names: dict) -> float:
+    fn(result, names, CONF)  # warmup
+    t0 = time.perf_counter()
+    for _ in range(REPEATS):
+        fn(result, names, CONF)
+    return (time.perf_counter() - t0) / REPEATS * 1000.0
+
+
+def main():
+    names = {i: f"defeito_{i}" for i in range(NUM_CLASSES)}
+    print(f"\n=== Pós-processamento de bboxes | device={DEVICE} | conf={CONF} | {REPEATS} repetições ===")
+    for n in BOX_COUNTS:
+        result = make_result(n)
+
+        ref = loop_postprocess(result, names, CONF)
+        new = boxes_to_pb2(result, names, CONF)
+        if len(ref) != len(new):
+            raise RuntimeError(f"Resultados diferentes: loop={len(ref)} boxes, vetorizado={len(new)} boxes")
+
+        loop_ms = bench(loop_postprocess, result, names)
+        vec_ms = bench(boxes_to_pb2, result, names)
+        print(
+            f"boxes={n:<5} mantidas={len(new):<5} loop={loop_ms:8.3f} ms  "
+            f"vetorizado={vec_ms:8.3f} ms  speedup={loop_ms / vec_ms:6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import os
+import time
+import resource
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+import psutil  # vem com o ultralytics
+
+from infra.image.preprocess_pool import PreprocessPool, letterbox
+
+
+# ===== CONFIG =====
+IMAGE_PATH = os.getenv("IMAGE_PATH", "")          # vazio = imagem sintética
+IMGSZ = int(os.getenv("MODEL_IMGSZ", "640"))
+CLIENTS = int(os.getenv("CLIENTS", "12"))         # threads simulando RPCs concorrentes
+REQUESTS_PER_CLIENT = int(os.getenv("REQUESTS_PER_CLIENT", "50"))
+WORKERS = [int(w) for w in os.getenv("WORKERS", "0,2,4,8").split(",")]  # 0 = inline na thread
+# ==================
+
+
+def load_jpeg() -> bytes:
+    if IMAGE_PATH:
+        img = cv2.imread(IMAGE_PATH)
+        if img is None:
+            raise RuntimeError(f"Não consegui abrir a imagem em {IMAGE_PATH}")
+    else:
+        rng = np.random.default_rng(0)
+        img = cv2.GaussianBlur(rng.integers(0, 255, (1080, 1920, 3), dtype=np.uint8), (9, 9), 0)
+    return cv2.imencode(".jpg", img, [int(cv2.IMWRITE_JPEG_QUALITY), 90])[1].tobytes()
+
+
+def inline_preprocess(image_bytes: bytes) -> np.ndarray:
+    # o mesmo trabalho do worker, feito na thread do gRPC (compete pelo GIL)
+    img = cv2.imdecode(np.frombuffer(image_bytes, dtype=np.uint8), cv2.IMREAD_COLOR)
+    boxed, _, _ = letterbox(img, IMGSZ)
+    return np.ascontiguousarray(boxed[:, :, ::-1].transpose(2, 0, 1), dtype=np.float32) / 255.0
+
+
+def cpu_seconds(workers: list) -> float:
+    """
+    CPU (user + sys) deste processo + dos workers vivos. Os workers são lidos um a um
+    (psutil): RUSAGE_CHILDREN só conta processos já encerrados e aí entra a vida
+    inteira deles (spawn, import do cv2/numpy, aquecimento), não só a janela medida.
+    """
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    total = own.ru_utime + own.ru_stime
+    for proc in workers:
+        times = proc.cpu_times()
+        total += times.user + times.system
+    return total
+
+
+def run(workers: int, image_bytes: bytes) -> None:
+    pool = PreprocessPool(workers, imgsz=IMGSZ, slots=CLIENTS * 2) if workers > 0 else None
+
+    def client(_):
+        for _ in range(REQUESTS_PER_CLIENT):
+            if pool is None:
+                inline_preprocess(image_bytes)
+            else:
+                pool.prepare(image_bytes).release()
+
+    # warmup (sobe os processos do pool)
+    with ThreadPoolExecutor(max_workers=CLIENTS) as ex:
+        list(ex.map(lambda _: (pool.prepare(image_bytes).release() if pool else inline_preprocess(image_bytes)),
+                    range(CLIENTS)))
+
+    procs = [psutil.Process(pid) for pid in pool.worker_pids()] if pool is not None else []
+    cpu0 = cpu_seconds(procs)
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=CLIENTS) as ex:
+        list(ex.map(client, range(CLIENTS)))
+    wall = time.perf_counter() - t0
+    cpu = cpu_seconds(procs) - cpu0
+
+    if pool is not None:
+        pool.close()
+
+    total = CLIENTS * REQUESTS_PER_CLIENT
+    label = "inline (thread gRPC)" if workers == 0 else f"pool {workers} processos"
+    print(
+        f"{label:<22} imgs={total:<5} wall={wall:7.2f}s  throughput={total / wall:8.1f} img/s  "
+        f"cpu={cpu:7.2f}s  cores usados={cpu / wall:5.2f}"
+    )
+
+
+def main():
+    image_bytes = load_jpeg()
+    print(
+        f"\n=== Pré-processamento (decode + letterbox {IMGSZ} + normalize) | "
+        f"{CLIENTS} clientes concorrentes | cpus={os.cpu_count()} ==="
+    )
+    for workers in WORKERS:
+        run(workers, image_bytes)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,50 +1,67 @@
 import os
-import zlib
+import queue
+import threading
+import time
 import grpc
-import cv2
-import numpy as np
 import torch
-from ultralytics import YOLO
 
 from protos import inference_pb2 as pb2
 from protos import inference_pb2_grpc as pb2_grpc
+from infra.env.environment import split_env_list
+from infra.image.chunked_upload import ChunkedUpload
+from infra.image.image_decoder import request_to_image, upload_to_image
+from infra.image.preprocess_pool import PreprocessPool
+from infra.image.shared_frames import SharedFrameRegistry, StaleFrameError
+from infra.model.loaded_model import LEASED_IMAGE_TYPES, LoadedModel
+from infra.model.micro_batcher import BatcherRejectedError
+from infra.model.model_registry import ModelRegistry, UnknownModelError, load_model_paths_from_env
+from infra.model.postprocess import boxes_to_packed_pb2, boxes_to_pb2
+from infra.model.result_cache import ResultCache, image_digest
+from monitoring.prometheus_metrics import (
+    STAGE_DECODE,
+    STAGE_POSTPROCESS,
+    count_error,
+    rpc_in_flight,
+    track_result_cache,
+)
+
+
+# marcador de fim do stream de entrada (InferStream)
+_STREAM_END = object()
+
+# gauges de RPCs em andamento, um child por método (resolvidos uma vez)
+IN_FLIGHT_INFER = rpc_in_flight("Infer")
+IN_FLIGHT_INFER_UPLOAD = rpc_in_flight("InferUpload")
+IN_FLIGHT_INFER_MULTI = rpc_in_flight("InferMulti")
+IN_FLIGHT_INFER_STREAM = rpc_in_flight("InferStream")
 
 
 # =========================
 # HELPERS
 # =========================
-def decode_image(image_bytes: bytes) -> np.ndarray:
-    arr = np.frombuffer(image_bytes, dtype=np.uint8)
-    img = cv2.imdecode(arr, cv2.IMREAD_COLOR)
-    if img is None:
-        raise ValueError("Imagem inválida. Envie JPEG/PNG válido.")
-    return img
+def parse_confidence(value: float) -> float:
+    conf = float(value)
+    return conf if conf > 0 else 0.10
 
 
-def hex_to_rgb_tuple(hex_color: str):
-    hex_color = hex_color.lstrip("#")
-    return (int(hex_color[0:2], 16), int(hex_color[2:4], 16), int(hex_color[4:6], 16))
+def error_status_code(e: Exception) -> grpc.StatusCode:
+    if isinstance(e, UnknownModelError):
+        return grpc.StatusCode.NOT_FOUND
+    if isinstance(e, BatcherRejectedError):
+        # resposta rápida: a câmera descarta o frame em vez de esperar o timeout
+        return grpc.StatusCode.RESOURCE_EXHAUSTED
+    if isinstance(e, StaleFrameError):
+        return grpc.StatusCode.INVALID_ARGUMENT
+    return grpc.StatusCode.INTERNAL
 
 
-def stable_idx(name: str, n: int) -> int:
-    return zlib.crc32(name.strip().lower().encode("utf-8")) % n
-
-
-def dict_defectinfo_to_pb2(d: dict) -> pb2.DefectInfo:
-    return pb2.DefectInfo(
-        name=str(d["name"]),
-        class_id=int(d["class_id"]),
-        ui_color=pb2.RGB(
-            r=int(d["ui_color"]["r"]),
-            g=int(d["ui_color"]["g"]),
-            b=int(d["ui_color"]["b"]),
-        ),
-        mask_color=pb2.RGB(
-            r=int(d["mask_color"]["r"]),
-            g=int(d["mask_color"]["g"]),
-            b=int(d["mask_color"]["b"]),
-        ),
-    )
+def set_rpc_error(context, method: str, e: Exception, code: grpc.StatusCode = None) -> str:
+    """Status de erro no RPC + contador de erros por método/código; retorna a mensagem."""
+    code = code or error_status_code(e)
+    context.set_code(code)
+    context.set_details(str(e))
+    count_error(method, code.name)
+    return str(e)
 
 
 # =========================
@@ -52,146 +69,464 @@ def dict_defectinfo_to_pb2(d: dict) -> pb2.DefectInfo:
 # =========================
 class InferenceMethods(pb2_grpc.InferenceMethodsServicer):
     """
-    Entrada: imagem (bytes JPG/PNG) + confidence_threshold
-    Saída: bbox XYWH top-left + defect_list + img_segmentation (b"" quando não houver) + error
+    Entrada: imagem (bytes JPG/PNG ou RawImage já decodificada) + confidence_threshold + model_name
+    Saída: bbox XYWH top-left (list_bbox, ou packed_bbox colunar se o request pedir)
+           + model_info_etag + img_segmentation (b"" quando não houver) + error
+
+    A tabela de classes (defect_list) sai por GetModelInfo; o cliente só busca de novo
+    quando o model_info_etag da resposta mudar.
+
+    Os modelos vêm do ModelRegistry (MODELS=nome=caminho,...); model_name vazio usa o padrão.
     """
 
     def __init__(self):
-        self.model_name = os.getenv("MODEL_NAME", "yolo_detect_default")
-        self.model_path = os.getenv("MODEL_PATH", "/code/models/main_defect.pt")
         self.imgsz = int(os.getenv("MODEL_IMGSZ", "640"))
         use_gpu = os.getenv("USE_GPU", "true").lower() in ("1", "true", "yes", "y")
         self.device = 0 if (use_gpu and torch.cuda.is_available()) else "cpu"
 
-        if not self.model_path:
-            raise RuntimeError("MODEL_PATH não definido no ambiente.")
-
-        self.model = YOLO(self.model_path)
-
-        # nomes das classes do YOLO
-        self.names = self.model.model.names  # dict[int,str]
-
-        # UI colors (estáveis por nome)
-        # 60 cores UI
-        self.colors = [
-            "#FF0000", "#00FF00", "#0000FF", "#FFFF00", "#FF00FF", "#00FFFF",
-            "#800000", "#008000", "#000080", "#808000", "#800080", "#008080",
-            "#C00000", "#00C000", "#0000C0", "#C0C000", "#C000C0", "#00C0C0",
-            "#400000", "#004000", "#000040", "#404000", "#400040", "#004040",
-            "#FF4500", "#32CD32", "#1E90FF", "#FFD700", "#ADFF2F", "#FF69B4",
-            "#8A2BE2", "#5F9EA0", "#DC143C", "#00CED1", "#228B22", "#FF1493",
-            "#00BFFF", "#B8860B", "#6A5ACD", "#20B2AA", "#FF8C00", "#9932CC",
-            "#8B0000", "#008B8B", "#2E8B57", "#DA70D6", "#FF6347", "#4682B4",
-            "#9ACD32", "#8FBC8F", "#00FA9A", "#1E90FF"
-        ]
-        self.mask_colors = [
-            "#000000", "#010101", "#020202", "#030303", "#040404",
-            "#050505", "#060606", "#070707", "#080808", "#090909",
-            "#0A0A0A", "#0B0B0B", "#0C0C0C", "#0D0D0D", "#0E0E0E",
-            "#0F0F0F", "#101010", "#111111", "#121212", "#131313",
-            "#141414", "#151515", "#161616", "#171717", "#181818",
-            "#191919", "#1A1A1A", "#1B1B1B", "#1C1C1C", "#1D1D1D",
-            "#1E1E1E", "#1F1F1F", "#202020", "#212121", "#222222",
-            "#232323", "#242424", "#252525", "#262626", "#272727",
-            "#282828", "#292929", "#2A2A2A", "#2B2B2B", "#2C2C2C",
-            "#2D2D2D", "#2E2E2E", "#2F2F2F", "#303030", "#313131",
-            "#323232", "#333333", "#343434", "#353535", "#363636",
-            "#373737", "#383838", "#393939", "#3A3A3A", "#3B3B3B"
-        ]
-
-        # cache PB2 (monta uma vez)
-        self.defect_list_pb2 = self._build_defect_list_pb2()
+        # micro-batching: RPCs concorrentes viram um único predict em lote (um batcher por modelo)
+        self.batch_max_size = int(os.getenv("BATCH_MAX_SIZE", "8"))
+        self.batch_max_wait_ms = float(os.getenv("BATCH_MAX_WAIT_MS", "5"))
 
-        print(
-            f"[SERVER] Loaded model_name={self.model_name} model_path={self.model_path} "
-            f"device={self.device} imgsz={self.imgsz}"
-        )
+        # admissão: fila limitada por modelo (0 = sem limite) e recusa de requests cujo prazo
+        # restante é menor que a espera estimada no batcher
+        self.batch_max_pending = int(os.getenv("BATCH_MAX_PENDING", "64"))
+        self.shed_on_deadline = os.getenv("SHED_ON_DEADLINE", "true").lower() in ("1", "true", "yes", "y")
 
-    def _build_defect_list_pb2(self):
-        out = []
-        for class_id, name in self.names.items():
-            name_str = str(name)
+        # latest-frame-wins: frame novo de um source_id substitui o que ainda espera o modelo
+        self.coalesce_by_source = os.getenv("COALESCE_BY_SOURCE", "true").lower() in ("1", "true", "yes", "y")
 
-            ui_hex = self.colors[stable_idx(name_str, len(self.colors))]
-            mk_hex = self.mask_colors[stable_idx(name_str, len(self.mask_colors))]
+        # prioridades: PRIORITY_FAST entra no lote antes de PRIORITY_SLOW; SLOW que esperou
+        # mais que isso na fila passa na frente (anti-starvation; 0 = FAST sempre primeiro)
+        self.priority_max_starve_ms = float(os.getenv("PRIORITY_MAX_STARVE_MS", "500"))
 
-            ur, ug, ub = hex_to_rgb_tuple(ui_hex)
-            mr, mg, mb = hex_to_rgb_tuple(mk_hex)
+        self.registry = ModelRegistry(
+            load_model_paths_from_env(),
+            model_factory=self._load_model,
+            default_model=os.getenv("MODEL_DEFAULT") or None,
+            memory_budget_mb=float(os.getenv("MODEL_MEMORY_BUDGET_MB", "0")),
+        )
 
-            out.append(
-                dict_defectinfo_to_pb2({
-                    "name": name_str,
-                    "class_id": int(class_id),
-                    "ui_color": {"r": ur, "g": ug, "b": ub},
-                    "mask_color": {"r": mr, "g": mg, "b": mb},
-                })
-            )
-        return out
+        # carrega já na subida (falha cedo se o caminho estiver errado)
+        self.registry.preload(split_env_list("MODELS_PRELOAD", default=[self.registry.default_model]))
 
-    def Infer(self, request: pb2.InferRequest, context: grpc.ServicerContext) -> pb2.InferResponse:
-        try:
-            img = decode_image(request.image_bytes)
+        # legado: repete o defect_list inteiro em toda resposta (clientes que não usam GetModelInfo)
+        self.defect_list_in_response = os.getenv("DEFECT_LIST_IN_RESPONSE", "false").lower() in ("1", "true", "yes", "y")
 
-            conf = float(request.confidence_threshold)
-            if conf <= 0:
-                conf = 0.10
+        # InferStream: máximo de frames em voo por stream (controle de fluxo)
+        self.stream_max_in_flight = int(os.getenv("STREAM_MAX_IN_FLIGHT", "32"))
 
-            results = self.model.predict(
-                source=img,
+        # "full" = imdecode completo; "reduced" = JPEG grande decodificado em 1/2, 1/4 ou 1/8
+        # (lado maior nunca abaixo de imgsz), bboxes voltam para as coordenadas originais
+        self.jpeg_decode_mode = os.getenv("JPEG_DECODE_MODE", "full").lower()
+        if self.jpeg_decode_mode not in ("full", "reduced"):
+            raise ValueError(f"JPEG_DECODE_MODE inválido: {self.jpeg_decode_mode!r} (use full ou reduced).")
+        self.reduced_min_side = self.imgsz if self.jpeg_decode_mode == "reduced" else 0
+
+        # decode + letterbox + normalização em processos separados (0 = na thread do gRPC)
+        self.preprocess_workers = int(os.getenv("PREPROCESS_WORKERS", "0"))
+        self.preprocess_pool = None
+        if self.preprocess_workers > 0:
+            self.preprocess_pool = PreprocessPool(
+                self.preprocess_workers,
                 imgsz=self.imgsz,
-                conf=conf,
-                device=self.device,
-                verbose=False,
+                slots=int(os.getenv("PREPROCESS_SLOTS", "32")),
+                reduced_decode=self.jpeg_decode_mode == "reduced",
             )
 
-            boxes_pb2 = []
-            for r in results:
-                if r.boxes is None:
-                    continue
-                for box in r.boxes:
-                    cls_id = int(box.cls[0])
-                    score = float(box.conf[0])
-                    if score < conf:
-                        continue
+        # cache de resultados por conteúdo (frames repetidos com a esteira parada); 0 = desligado
+        self.result_cache = None
+        cache_entries = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "0"))
+        if cache_entries > 0:
+            self.result_cache = ResultCache(
+                max_entries=cache_entries,
+                max_bytes=int(float(os.getenv("RESULT_CACHE_MAX_MB", "64")) * 1024 * 1024),
+                ttl_ms=float(os.getenv("RESULT_CACHE_TTL_MS", "2000")),
+            )
+            track_result_cache(self.result_cache)
 
-                    label = str(self.names.get(cls_id, f"class_{cls_id}"))
-
-                    x1, y1, x2, y2 = box.xyxy[0].tolist()
-                    x1, y1, x2, y2 = float(x1), float(y1), float(x2), float(y2)
-
-                    # PADRÃO ÚNICO: XYWH top-left
-                    boxes_pb2.append(
-                        pb2.BBox(
-                            x=x1,
-                            y=y1,
-                            w=(x2 - x1),
-                            h=(y2 - y1),
-                            label=label,
-                            class_id=cls_id,
-                            confidence=score,
-                        )
-                    )
+        # InferUpload: tamanho máximo da imagem montada a partir dos chunks
+        self.upload_max_bytes = int(float(os.getenv("UPLOAD_MAX_MB", "512")) * 1024 * 1024)
+
+        # frames em memória compartilhada (clientes no mesmo host, RegisterSharedMemory)
+        self.shared_frames = SharedFrameRegistry()
+
+        print(
+            f"[SERVER] Models={list(self.registry.model_paths)} default={self.registry.default_model} "
+            f"device={self.device} imgsz={self.imgsz} "
+            f"batch_max_size={self.batch_max_size} batch_max_wait_ms={self.batch_max_wait_ms} "
+            f"batch_max_pending={self.batch_max_pending} shed_on_deadline={self.shed_on_deadline} "
+            f"coalesce_by_source={self.coalesce_by_source} priority_max_starve_ms={self.priority_max_starve_ms} "
+            f"preprocess_workers={self.preprocess_workers} jpeg_decode_mode={self.jpeg_decode_mode} "
+            f"result_cache_entries={cache_entries}"
+        )
+
+    def close(self) -> None:
+        """Depois do server.stop(): termina os lotes na fila e encerra workers e segmentos."""
+        self.registry.close()
+        if self.preprocess_pool is not None:
+            self.preprocess_pool.close()
+        self.shared_frames.close()
+
+    def _load_model(self, name: str, path: str) -> LoadedModel:
+        if not path:
+            raise RuntimeError(f"Caminho do modelo {name!r} não definido no ambiente.")
+        return LoadedModel(
+            name,
+            path,
+            imgsz=self.imgsz,
+            device=self.device,
+            batch_max_size=self.batch_max_size,
+            batch_max_wait_ms=self.batch_max_wait_ms,
+            batch_max_pending=self.batch_max_pending,
+            priority_max_starve_ms=self.priority_max_starve_ms,
+        )
 
-            resp = pb2.InferResponse(
-                model_name=self.model_name,
-                list_bbox=boxes_pb2,
-                defect_list=self.defect_list_pb2,
-                error="",
+    def _time_remaining(self, context):
+        # prazo restante do RPC (s) para a admissão; None = sem checagem por prazo
+        if context is None or not self.shed_on_deadline:
+            return None
+        return context.time_remaining()
+
+    def _check_admission(self, request, context) -> None:
+        # antes do decode: request que o batcher recusaria não gasta CPU. A recusa sai pelo
+        # except do handler, que devolve o slot de um shared_frame ainda não aberto
+        self.registry.check_admission(request.model_name, self._time_remaining(context), request.priority)
+
+    def _release_shared_frame(self, request) -> None:
+        # erro antes do slot ser aberto (modelo desconhecido, admissão): sem isso o slot fica
+        # preso e o anel do cliente trava. Depois de aberto, o próprio frame já foi liberado.
+        if request.WhichOneof("image") == "shared_frame":
+            self.shared_frames.release(request.shared_frame)
+
+    def _use_preprocess_pool(self, request) -> bool:
+        # o pool faz imdecode; RawImage já vem decodificada
+        return self.preprocess_pool is not None and request.WhichOneof("image") == "image_bytes"
+
+    def _request_image(self, request):
+        t0 = time.perf_counter()
+        if self._use_preprocess_pool(request):
+            img = self.preprocess_pool.prepare(request.image_bytes)
+        elif request.WhichOneof("image") == "shared_frame":
+            img = self.shared_frames.open(request.shared_frame, self.imgsz)
+        else:
+            img = request_to_image(request, self.reduced_min_side, self.imgsz)
+        STAGE_DECODE.observe(time.perf_counter() - t0)
+        return img
+
+    def _upload_image(self, header: pb2.InferRequest, buffer: bytearray):
+        t0 = time.perf_counter()
+        # JPEG/PNG vai para o pool como está; pixels crus são lidos direto do buffer montado
+        if self.preprocess_pool is not None and header.WhichOneof("image") != "raw_image":
+            img = self.preprocess_pool.prepare(buffer)
+        else:
+            img = upload_to_image(header, buffer, self.reduced_min_side, self.imgsz)
+        STAGE_DECODE.observe(time.perf_counter() - t0)
+        return img
+
+    def _cache_key(self, request: pb2.InferRequest):
+        # None = cache desligado; modelo resolvido para "" e o nome do padrão darem a mesma chave
+        # shared_frame fica fora: o slot é reescrito pelo cliente, não há bytes para o digest
+        if self.result_cache is None or request.WhichOneof("image") == "shared_frame":
+            return None
+        return (
+            self.registry.resolve(request.model_name),
+            parse_confidence(request.confidence_threshold),
+            request.packed_bbox,
+            image_digest(request),
+        )
+
+    def _cached_response(self, key, request_id: str = ""):
+        if key is None:
+            return None
+        cached = self.result_cache.get(key)
+        if cached is None:
+            return None
+        resp = pb2.InferResponse()
+        resp.CopyFrom(cached)
+        resp.request_id = request_id
+        return resp
+
+    def _cache_store(self, key, resp: pb2.InferResponse) -> None:
+        # erro não vai para o cache; request_id é de cada request
+        if key is None or resp.error:
+            return
+        cached = pb2.InferResponse()
+        cached.CopyFrom(resp)
+        cached.request_id = ""
+        self.result_cache.put(key, cached, cached.ByteSize())
+
+    def _stream_item_response(self, item) -> pb2.InferResponse:
+        # (req, resposta) = hit do cache; senão (req, model, conf, fut, erro, chave do cache)
+        if len(item) == 2:
+            return item[1]
+
+        req, model, conf, fut, error, key = item
+        if fut is None:
+            count_error("InferStream", "IN_RESPONSE")
+            return self._error_response(error, req.request_id, req.model_name, model)
+        resp = self._response_from_future(model, conf, fut, req.request_id, req.packed_bbox)
+        if resp.error:
+            count_error("InferStream", "IN_RESPONSE")
+        self._cache_store(key, resp)
+        return resp
+
+    def _submit(self, request: pb2.InferRequest, img=None, context=None):
+        """context: RPC unário cujo prazo vale para a admissão (frames de stream não passam)."""
+        if img is None:
+            img = self._request_image(request)
+        conf = parse_confidence(request.confidence_threshold)
+        key = request.source_id if (self.coalesce_by_source and request.source_id) else None
+        try:
+            model, fut = self.registry.submit(
+                request.model_name, (img, conf), self._time_remaining(context), key, request.priority
             )
+        except Exception:
+            if isinstance(img, LEASED_IMAGE_TYPES):
+                img.release()
+            raise
+        return model, conf, fut
+
+    def _submit_multi(self, request: pb2.InferMultiRequest, img, conf: float, context=None) -> list:
+        """
+        Mesma imagem (já decodificada) para cada modelo pedido; cada modelo tem seu
+        batcher, então rodam em paralelo. Retorna [(nome, model, fut, erro)].
+        """
+        names = list(dict.fromkeys(n or self.registry.default_model for n in request.model_names))
+        if not names:
+            names = [self.registry.default_model]
+
+        prepared = isinstance(img, LEASED_IMAGE_TYPES)
+        pending = []
+        for name in names:
+            if prepared:
+                img.retain()  # uma referência por modelo
+            try:
+                model, fut = self.registry.submit(name, (img, conf), self._time_remaining(context), priority=request.priority)
+                pending.append((name, model, fut, ""))
+            except Exception as e:
+                if prepared:
+                    img.release()
+                pending.append((name, None, None, str(e)))
+
+        if prepared:
+            img.release()  # referência de quem preparou
+        return pending
+
+    def _build_multi_response(self, request: pb2.InferMultiRequest, conf: float, pending: list) -> pb2.InferMultiResponse:
+        resp = pb2.InferMultiResponse(request_id=request.request_id)
+        for name, model, fut, error in pending:
+            if fut is not None:
+                resp.results[name].CopyFrom(
+                    self._response_from_future(model, conf, fut, request.request_id, request.packed_bbox)
+                )
+            else:
+                resp.results[name].CopyFrom(self._error_response(error, request.request_id, name))
+            if resp.results[name].error:
+                count_error("InferMulti", "IN_RESPONSE")
+        return resp
+
+    def _build_response(
+        self, model: LoadedModel, result, conf: float, request_id: str = "", packed: bool = False
+    ) -> pb2.InferResponse:
+        resp = pb2.InferResponse(
+            model_name=model.name,
+            defect_list=model.defect_list_pb2 if self.defect_list_in_response else [],
+            error="",
+            request_id=request_id,
+            model_info_etag=model.model_info_pb2.etag,
+        )
 
-            # DETECÇÃO: não tem máscara -> sempre retorna vazio (contrato estável)
-            resp.img_segmentation = b""
-            return resp
+        # PADRÃO ÚNICO: XYWH top-left (filtro por conf e conversão em bloco, sem loop por box no tensor)
+        t0 = time.perf_counter()
+        if packed:
+            # colunar: label sai do defect_list pelo class_id
+            resp.packed_bbox.CopyFrom(boxes_to_packed_pb2(result, conf))
+            n_boxes = len(resp.packed_bbox.x)
+        else:
+            resp.list_bbox.extend(boxes_to_pb2(result, model.names, conf))
+            n_boxes = len(resp.list_bbox)
+        STAGE_POSTPROCESS.observe(time.perf_counter() - t0)
+        model.metrics.boxes_per_frame.observe(n_boxes)
+
+        # DETECÇÃO: não tem máscara -> sempre retorna vazio (contrato estável)
+        resp.img_segmentation = b""
+        return resp
+
+    def _error_response(
+        self, error: str, request_id: str = "", model_name: str = "", model: LoadedModel = None
+    ) -> pb2.InferResponse:
+        resp = pb2.InferResponse(
+            model_name=model.name if model else (model_name or self.registry.default_model),
+            list_bbox=[],
+            defect_list=model.defect_list_pb2 if (model and self.defect_list_in_response) else [],
+            error=error,
+            request_id=request_id,
+            model_info_etag=model.model_info_pb2.etag if model else "",
+        )
+        resp.img_segmentation = b""
+        return resp
 
+    def _response_from_future(
+        self, model: LoadedModel, conf: float, fut, request_id: str = "", packed: bool = False
+    ) -> pb2.InferResponse:
+        # fut já concluído (sync ou asyncio)
+        try:
+            return self._build_response(model, fut.result(), conf, request_id, packed)
         except Exception as e:
-            context.set_code(grpc.StatusCode.INTERNAL)
-            context.set_details(str(e))
-
-            resp = pb2.InferResponse(
-                model_name=self.model_name,
-                list_bbox=[],
-                defect_list=self.defect_list_pb2,
-                error=str(e),
-            )
-            resp.img_segmentation = b""
+            return self._error_response(str(e), request_id, model=model)
+
+    def Infer(self, request: pb2.InferRequest, context: grpc.ServicerContext) -> pb2.InferResponse:
+        with IN_FLIGHT_INFER.track_inprogress():
+            return self._infer(request, context)
+
+    def _infer(self, request: pb2.InferRequest, context: grpc.ServicerContext) -> pb2.InferResponse:
+        model = None
+        try:
+            key = self._cache_key(request)
+            cached = self._cached_response(key, request.request_id)
+            if cached is not None:
+                return cached
+
+            self._check_admission(request, context)
+            model, conf, fut = self._submit(request, context=context)
+
+            # bloqueia só esta thread do gRPC até o lote dela ser processado
+            resp = self._build_response(model, fut.result(), conf, request.request_id, request.packed_bbox)
+            self._cache_store(key, resp)
             return resp
+
+        except Exception as e:
+            self._release_shared_frame(request)
+            error = set_rpc_error(context, "Infer", e)
+            return self._error_response(error, request.request_id, request.model_name, model)
+
+    def InferUpload(self, request_iterator, context: grpc.ServicerContext) -> pb2.InferResponse:
+        """
+        Client streaming: chunks vão direto para um buffer do tamanho anunciado no primeiro;
+        o decode começa quando a imagem está completa. Sem cache (não há bytes do request para o digest).
+        """
+        with IN_FLIGHT_INFER_UPLOAD.track_inprogress():
+            return self._infer_upload(request_iterator, context)
+
+    def _infer_upload(self, request_iterator, context: grpc.ServicerContext) -> pb2.InferResponse:
+        header = pb2.InferRequest()
+        model = None
+        try:
+            upload = ChunkedUpload(self.upload_max_bytes)
+            for chunk in request_iterator:
+                upload.add(chunk)
+            header, buffer = upload.finish()
+
+            self._check_admission(header, context)
+            model, conf, fut = self._submit(header, self._upload_image(header, buffer), context)
+            return self._build_response(model, fut.result(), conf, header.request_id, header.packed_bbox)
+
+        except Exception as e:
+            self._release_shared_frame(header)
+            error = set_rpc_error(context, "InferUpload", e)
+            return self._error_response(error, header.request_id, header.model_name, model)
+
+    def InferMulti(self, request: pb2.InferMultiRequest, context: grpc.ServicerContext) -> pb2.InferMultiResponse:
+        with IN_FLIGHT_INFER_MULTI.track_inprogress():
+            try:
+                img = self._request_image(request)
+                conf = parse_confidence(request.confidence_threshold)
+            except Exception as e:
+                error = set_rpc_error(context, "InferMulti", e, grpc.StatusCode.INTERNAL)
+                return pb2.InferMultiResponse(request_id=request.request_id, error=error)
+
+            # os modelos já estão rodando em paralelo; aqui só espera um por um
+            pending = self._submit_multi(request, img, conf, context)
+            return self._build_multi_response(request, conf, pending)
+
+    def GetModelInfo(self, request: pb2.ModelInfoRequest, context: grpc.ServicerContext) -> pb2.ModelInfo:
+        # carrega o modelo se ainda não estiver carregado (o etag depende dos nomes das classes)
+        try:
+            return self.registry.get(request.model_name).model_info_pb2
+        except Exception as e:
+            set_rpc_error(context, "GetModelInfo", e)
+            return pb2.ModelInfo(model_name=request.model_name)
+
+    def RegisterSharedMemory(
+        self, request: pb2.SharedMemoryRegistration, context: grpc.ServicerContext
+    ) -> pb2.SharedMemoryInfo:
+        try:
+            segment_id = self.shared_frames.register(request.name, request.slots, request.slot_bytes)
+            return pb2.SharedMemoryInfo(segment_id=segment_id)
+        except FileNotFoundError as e:
+            # segmento não existe neste host (cliente remoto ou /dev/shm não compartilhado)
+            error = set_rpc_error(context, "RegisterSharedMemory", e, grpc.StatusCode.FAILED_PRECONDITION)
+            return pb2.SharedMemoryInfo(error=error)
+        except Exception as e:
+            error = set_rpc_error(context, "RegisterSharedMemory", e, grpc.StatusCode.INVALID_ARGUMENT)
+            return pb2.SharedMemoryInfo(error=error)
+
+    def UnregisterSharedMemory(self, request: pb2.SharedMemoryInfo, context: grpc.ServicerContext) -> pb2.SharedMemoryInfo:
+        try:
+            self.shared_frames.unregister(request.segment_id)
+            return pb2.SharedMemoryInfo(segment_id=request.segment_id)
+        except Exception as e:
+            error = set_rpc_error(context, "UnregisterSharedMemory", e, grpc.StatusCode.NOT_FOUND)
+            return pb2.SharedMemoryInfo(segment_id=request.segment_id, error=error)
+
+    def InferStream(self, request_iterator, context: grpc.ServicerContext):
+        """
+        Bidi streaming: uma thread lê os frames do stream e submete ao batcher;
+        este gerador devolve as respostas na ordem em que ficam prontas (fora de ordem).
+        No máximo `stream_max_in_flight` frames em voo por stream: quando enche,
+        a leitura para e o controle de fluxo do HTTP/2 segura o cliente.
+        """
+        # o stream conta como em andamento enquanto estiver aberto
+        with IN_FLIGHT_INFER_STREAM.track_inprogress():
+            yield from self._infer_stream(request_iterator, context)
+
+    def _infer_stream(self, request_iterator, context: grpc.ServicerContext):
+        done_q = queue.Queue()
+        in_flight = threading.BoundedSemaphore(self.stream_max_in_flight)
+
+        def reader():
+            submitted = 0
+            try:
+                for req in request_iterator:
+                    while not in_flight.acquire(timeout=0.5):
+                        if not context.is_active():
+                            return
+                    submitted += 1
+
+                    try:
+                        key = self._cache_key(req)
+                        cached = self._cached_response(key, req.request_id)
+                        if cached is not None:
+                            done_q.put((req, cached))
+                            continue
+                        model, conf, fut = self._submit(req)
+                    except Exception as e:
+                        self._release_shared_frame(req)
+                        done_q.put((req, None, 0.0, None, str(e), None))
+                        continue
+
+                    fut.add_done_callback(
+                        lambda f, r=req, m=model, c=conf, k=key: done_q.put((r, m, c, f, "", k))
+                    )
+            except Exception:
+                # stream cancelado/encerrado pelo cliente
+                pass
+            finally:
+                done_q.put((_STREAM_END, submitted))
+
+        threading.Thread(target=reader, name="infer-stream-reader", daemon=True).start()
+
+        yielded = 0
+        total = None
+        while total is None or yielded < total:
+            item = done_q.get()
+            if item[0] is _STREAM_END:
+                total = item[1]
+                continue
+
+            resp = self._stream_item_response(item)
+
+            yielded += 1
+            in_flight.release()
+            yield resp
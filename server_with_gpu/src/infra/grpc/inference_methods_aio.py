@@ -0,0 +1,203 @@
+import asyncio
+import grpc
+
+from protos import inference_pb2 as pb2
+from infra.grpc.inference_methods import (
+    IN_FLIGHT_INFER,
+    IN_FLIGHT_INFER_MULTI,
+    IN_FLIGHT_INFER_STREAM,
+    IN_FLIGHT_INFER_UPLOAD,
+    InferenceMethods,
+    parse_confidence,
+    set_rpc_error,
+    _STREAM_END,
+)
+from infra.image.chunked_upload import ChunkedUpload
+from infra.model.loaded_model import LEASED_IMAGE_TYPES
+
+
+def _release_late_image(fut) -> None:
+    if not fut.cancelled() and fut.exception() is None and isinstance(fut.result(), LEASED_IMAGE_TYPES):
+        fut.result().release()
+
+
+async def run_leased_in_executor(func, *args):
+    """
+    func(*args) no executor padrão do loop (pool de pré-processamento, que bloqueia).
+    RPC cancelado no meio: a thread continua e o PreparedImage que ela devolver depois
+    não tem mais dono; o slot é liberado quando o resultado chegar.
+    """
+    fut = asyncio.get_running_loop().run_in_executor(None, func, *args)
+    try:
+        # shield: o cancelamento do RPC não pode cancelar `fut`, senão o resultado se perde
+        return await asyncio.shield(fut)
+    except asyncio.CancelledError:
+        fut.add_done_callback(_release_late_image)
+        raise
+
+
+class AsyncInferenceMethods(InferenceMethods):
+    """
+    Mesmo servicer, para o servidor grpc.aio: recebimento do RPC, decode e montagem
+    da resposta rodam no event loop; só o modelo roda fora dele, na thread do batcher.
+    Conexões/streams ociosos não ocupam thread nenhuma.
+    """
+
+    async def _request_image_async(self, request):
+        # o pool de pré-processamento bloqueia esperando o worker: fora do event loop
+        if self._use_preprocess_pool(request):
+            return await run_leased_in_executor(self._request_image, request)
+        # RawImage / shared_frame / decode na thread do loop
+        return self._request_image(request)
+
+    async def Infer(self, request: pb2.InferRequest, context: grpc.aio.ServicerContext) -> pb2.InferResponse:
+        with IN_FLIGHT_INFER.track_inprogress():
+            return await self._infer_async(request, context)
+
+    async def _infer_async(self, request: pb2.InferRequest, context: grpc.aio.ServicerContext) -> pb2.InferResponse:
+        model = None
+        try:
+            key = self._cache_key(request)
+            cached = self._cached_response(key, request.request_id)
+            if cached is not None:
+                return cached
+
+            self._check_admission(request, context)
+            img = await self._request_image_async(request)
+            model, conf, fut = self._submit(request, img, context)
+
+            result = await asyncio.wrap_future(fut)
+            resp = self._build_response(model, result, conf, request.request_id, request.packed_bbox)
+            self._cache_store(key, resp)
+            return resp
+
+        except Exception as e:
+            self._release_shared_frame(request)
+            error = set_rpc_error(context, "Infer", e)
+            return self._error_response(error, request.request_id, request.model_name, model)
+
+    async def InferUpload(self, request_iterator, context: grpc.aio.ServicerContext) -> pb2.InferResponse:
+        with IN_FLIGHT_INFER_UPLOAD.track_inprogress():
+            return await self._infer_upload_async(request_iterator, context)
+
+    async def _infer_upload_async(self, request_iterator, context: grpc.aio.ServicerContext) -> pb2.InferResponse:
+        header = pb2.InferRequest()
+        model = None
+        try:
+            upload = ChunkedUpload(self.upload_max_bytes)
+            async for chunk in request_iterator:
+                upload.add(chunk)
+            header, buffer = upload.finish()
+
+            self._check_admission(header, context)
+            if self.preprocess_pool is not None and header.WhichOneof("image") != "raw_image":
+                # o pool bloqueia esperando o worker: fora do event loop
+                img = await run_leased_in_executor(self._upload_image, header, buffer)
+            else:
+                img = self._upload_image(header, buffer)
+            model, conf, fut = self._submit(header, img, context)
+
+            result = await asyncio.wrap_future(fut)
+            return self._build_response(model, result, conf, header.request_id, header.packed_bbox)
+
+        except Exception as e:
+            self._release_shared_frame(header)
+            error = set_rpc_error(context, "InferUpload", e)
+            return self._error_response(error, header.request_id, header.model_name, model)
+
+    async def InferMulti(self, request: pb2.InferMultiRequest, context: grpc.aio.ServicerContext) -> pb2.InferMultiResponse:
+        with IN_FLIGHT_INFER_MULTI.track_inprogress():
+            try:
+                img = await self._request_image_async(request)
+                conf = parse_confidence(request.confidence_threshold)
+            except Exception as e:
+                error = set_rpc_error(context, "InferMulti", e, grpc.StatusCode.INTERNAL)
+                return pb2.InferMultiResponse(request_id=request.request_id, error=error)
+
+            pending = self._submit_multi(request, img, conf, context)
+            pending = [
+                (name, model, asyncio.wrap_future(fut) if fut is not None else None, error)
+                for name, model, fut, error in pending
+            ]
+            await asyncio.gather(*(fut for _, _, fut, _ in pending if fut is not None), return_exceptions=True)
+            return self._build_multi_response(request, conf, pending)
+
+    async def GetModelInfo(self, request: pb2.ModelInfoRequest, context: grpc.aio.ServicerContext) -> pb2.ModelInfo:
+        # registry.get pode carregar o modelo (bloqueante): fora do event loop
+        try:
+            loop = asyncio.get_running_loop()
+            model = await loop.run_in_executor(None, self.registry.get, request.model_name)
+            return model.model_info_pb2
+        except Exception as e:
+            set_rpc_error(context, "GetModelInfo", e)
+            return pb2.ModelInfo(model_name=request.model_name)
+
+    async def RegisterSharedMemory(
+        self, request: pb2.SharedMemoryRegistration, context: grpc.aio.ServicerContext
+    ) -> pb2.SharedMemoryInfo:
+        # só faz attach no segmento (mmap): rápido, roda no próprio loop
+        return super().RegisterSharedMemory(request, context)
+
+    async def UnregisterSharedMemory(
+        self, request: pb2.SharedMemoryInfo, context: grpc.aio.ServicerContext
+    ) -> pb2.SharedMemoryInfo:
+        return super().UnregisterSharedMemory(request, context)
+
+    async def InferStream(self, request_iterator, context: grpc.aio.ServicerContext):
+        """
+        Igual ao InferStream síncrono, mas a leitura do stream é uma task no event loop
+        em vez de uma thread por stream.
+        """
+        done_q = asyncio.Queue()
+        in_flight = asyncio.Semaphore(self.stream_max_in_flight)
+
+        async def reader():
+            submitted = 0
+            try:
+                async for req in request_iterator:
+                    await in_flight.acquire()
+                    submitted += 1
+
+                    try:
+                        key = self._cache_key(req)
+                        cached = self._cached_response(key, req.request_id)
+                        if cached is not None:
+                            done_q.put_nowait((req, cached))
+                            continue
+                        img = await self._request_image_async(req)
+                        model, conf, fut = self._submit(req, img)
+                        fut = asyncio.wrap_future(fut)
+                    except Exception as e:
+                        self._release_shared_frame(req)
+                        done_q.put_nowait((req, None, 0.0, None, str(e), None))
+                        continue
+
+                    fut.add_done_callback(
+                        lambda f, r=req, m=model, c=conf, k=key: done_q.put_nowait((r, m, c, f, "", k))
+                    )
+            except Exception:
+                # stream cancelado/encerrado pelo cliente
+                pass
+            finally:
+                done_q.put_nowait((_STREAM_END, submitted))
+
+        reader_task = asyncio.create_task(reader())
+        # o stream conta como em andamento enquanto estiver aberto
+        IN_FLIGHT_INFER_STREAM.inc()
+        try:
+            yielded = 0
+            total = None
+            while total is None or yielded < total:
+                item = await done_q.get()
+                if item[0] is _STREAM_END:
+                    total = item[1]
+                    continue
+
+                resp = self._stream_item_response(item)
+
+                yielded += 1
+                in_flight.release()
+                yield resp
+        finally:
+            IN_FLIGHT_INFER_STREAM.dec()
+            reader_task.cancel()
@@ -0,0 +1,52 @@
+import asyncio
+import os
+import signal
+import grpc
+
+from protos import inference_pb2_grpc as pb2_grpc
+from infra.grpc.inference_methods_aio import AsyncInferenceMethods
+from monitoring.grpc_interceptor import AioMetricsInterceptor
+from monitoring.prometheus_metrics import AioSerializeTimingInterceptor, start_metrics_server
+
+
+# limite por mensagem; imagem maior que isso vai pelo InferUpload (em chunks)
+MAX_MSG = int(float(os.getenv("GRPC_MAX_MESSAGE_MB", "64")) * 1024 * 1024)
+SHUTDOWN_GRACE_SEC = float(os.getenv("GRPC_SHUTDOWN_GRACE_SEC", "5"))
+
+
+async def serve_aio() -> None:
+    """
+    Servidor grpc.aio: um event loop atende todos os RPCs/streams; não existe
+    pool de threads por request (GRPC_MAX_WORKERS não se aplica aqui).
+    """
+    port = int(os.getenv("GRPC_PORT", "50051"))
+    # acima disso o gRPC responde RESOURCE_EXHAUSTED na hora (0 = sem limite); streams abertos contam
+    max_concurrent_rpcs = int(os.getenv("GRPC_MAX_CONCURRENT_RPCS", "0")) or None
+
+    server = grpc.aio.server(
+        interceptors=[AioMetricsInterceptor(), AioSerializeTimingInterceptor()],
+        maximum_concurrent_rpcs=max_concurrent_rpcs,
+        options=[
+            ("grpc.max_send_message_length", MAX_MSG),
+            ("grpc.max_receive_message_length", MAX_MSG),
+        ],
+    )
+
+    servicer = AsyncInferenceMethods()
+    pb2_grpc.add_InferenceMethodsServicer_to_server(servicer, server)
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, lambda: asyncio.ensure_future(server.stop(SHUTDOWN_GRACE_SEC)))
+
+    server.add_insecure_port(f"[::]:{port}")
+    start_metrics_server()
+    await server.start()
+    print(f"[SERVER] gRPC (aio) InferenceMethods started on :{port}")
+    try:
+        await server.wait_for_termination()
+    finally:
+        await server.stop(SHUTDOWN_GRACE_SEC)
+        # close() espera os batchers terminarem: fora do event loop
+        await loop.run_in_executor(None, servicer.close)
+        print("[SERVER] Stopped")
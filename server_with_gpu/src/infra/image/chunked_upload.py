@@ -0,0 +1,53 @@
+from protos import inference_pb2 as pb2
+
+
+class ChunkedUpload:
+    """
+    Monta a imagem do InferUpload num buffer alocado uma vez com o tamanho anunciado
+    no primeiro chunk; cada chunk é copiado direto para a posição dele (sem juntar
+    uma lista de pedaços no final). O buffer vai para o decode como está.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.header = None
+        self.buffer = None
+        self.received = 0
+        self._view = None
+
+    def add(self, chunk: pb2.ImageChunk) -> None:
+        if self.header is None:
+            self._start(chunk)
+
+        size = len(chunk.data)
+        if chunk.offset != self.received:
+            raise ValueError(f"Chunk fora de ordem: offset={chunk.offset}, esperado {self.received}.")
+        if self.received + size > len(self.buffer):
+            raise ValueError(f"Chunks passam do total anunciado ({len(self.buffer)} bytes).")
+
+        self._view[self.received:self.received + size] = chunk.data
+        self.received += size
+
+    def _start(self, chunk: pb2.ImageChunk) -> None:
+        if not chunk.HasField("header"):
+            raise ValueError("Primeiro chunk do InferUpload precisa do header (InferRequest).")
+        if chunk.header.WhichOneof("image") not in (None, "raw_image"):
+            raise ValueError("header do InferUpload não leva a imagem: só raw_image com o layout (sem data) ou vazio.")
+        total = int(chunk.total_bytes)
+        if total <= 0:
+            raise ValueError("ImageChunk.total_bytes deve ser > 0 no primeiro chunk.")
+        if total > self.max_bytes:
+            raise ValueError(f"Imagem de {total} bytes passa do limite de upload ({self.max_bytes} bytes).")
+
+        self.header = chunk.header
+        self.buffer = bytearray(total)
+        self._view = memoryview(self.buffer)
+
+    def finish(self):
+        """(header, buffer) com a imagem completa."""
+        if self.header is None:
+            raise ValueError("InferUpload sem nenhum chunk.")
+        if self.received != len(self.buffer):
+            raise ValueError(f"InferUpload incompleto: {self.received}/{len(self.buffer)} bytes.")
+        self._view.release()
+        return self.header, self.buffer
@@ -0,0 +1,264 @@
+import cv2
+import numpy as np
+
+from protos import inference_pb2 as pb2
+
+
+# dtypes aceitos em RawImage.dtype (uint16 = Mono12/Mono16, little-endian, só 1 canal)
+RAW_DTYPES = {
+    "uint8": np.dtype(np.uint8),
+    "uint16": np.dtype("<u2"),
+}
+
+# decode JPEG em 1/2, 1/4, 1/8 da resolução (o libjpeg pula parte do IDCT)
+REDUCED_DECODE_FLAGS = {
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+}
+
+# marcadores SOF (início de frame) que trazem altura/largura; C4/C8/CC não são SOF
+_JPEG_SOF_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+class ScaledImage:
+    """
+    Imagem BGR decodificada em resolução reduzida + tamanho original,
+    para levar as bboxes de volta às coordenadas da imagem enviada.
+    """
+
+    def __init__(self, img: np.ndarray, orig_shape):
+        self.img = img
+        self.orig_shape = orig_shape  # (h, w) da imagem original
+        self.scale_x = orig_shape[1] / img.shape[1]
+        self.scale_y = orig_shape[0] / img.shape[0]
+
+
+def _jpeg_segments(data: bytes):
+    """(marcador, início do payload, tamanho do payload) de cada segmento até o SOF."""
+    if data[:2] != b"\xff\xd8":
+        return
+
+    i, n = 2, len(data)
+    while i + 9 < n:
+        if data[i] != 0xFF:
+            return
+        marker = data[i + 1]
+        if marker == 0xFF:  # byte de preenchimento
+            i += 1
+            continue
+        if marker == 0x01 or 0xD0 <= marker <= 0xD8:  # marcadores sem tamanho
+            i += 2
+            continue
+        length = int.from_bytes(data[i + 2:i + 4], "big")
+        yield marker, i + 4, length - 2
+        if marker in _JPEG_SOF_MARKERS:
+            return
+        i += 2 + length
+
+
+def jpeg_size(image_bytes: bytes):
+    """(h, w) lido do cabeçalho SOF do JPEG, sem decodificar; None se não for JPEG."""
+    for marker, start, _ in _jpeg_segments(image_bytes):
+        if marker in _JPEG_SOF_MARKERS:
+            return (
+                int.from_bytes(image_bytes[start + 1:start + 3], "big"),
+                int.from_bytes(image_bytes[start + 3:start + 5], "big"),
+            )
+    return None
+
+
+def jpeg_exif_orientation(image_bytes: bytes) -> int:
+    """Tag Orientation (0x0112) do EXIF no APP1; 1 (normal) se não houver."""
+    for marker, start, length in _jpeg_segments(image_bytes):
+        if marker != 0xE1 or image_bytes[start:start + 6] != b"Exif\x00\x00":
+            continue
+        tiff = image_bytes[start + 6:start + length]
+        order = {b"II": "little", b"MM": "big"}.get(tiff[:2])
+        if order is None:
+            return 1
+        ifd = int.from_bytes(tiff[4:8], order)
+        count = int.from_bytes(tiff[ifd:ifd + 2], order)
+        for e in range(ifd + 2, ifd + 2 + 12 * count, 12):
+            if int.from_bytes(tiff[e:e + 2], order) == 0x0112:
+                return int.from_bytes(tiff[e + 8:e + 10], order) or 1
+        return 1
+    return 1
+
+
+def reduced_decode_factor(h: int, w: int, min_side: int) -> int:
+    """Maior redução (8/4/2) que ainda deixa o lado maior >= min_side (o modelo não amplia a imagem)."""
+    longest = max(h, w)
+    for factor in REDUCED_DECODE_FLAGS:
+        if -(-longest // factor) >= min_side:
+            return factor
+    return 1
+
+
+def decode_image(image_bytes: bytes) -> np.ndarray:
+    arr = np.frombuffer(image_bytes, dtype=np.uint8)
+    img = cv2.imdecode(arr, cv2.IMREAD_COLOR)
+    if img is None:
+        raise ValueError("Imagem inválida. Envie JPEG/PNG válido.")
+    return img
+
+
+def decode_image_reduced(image_bytes: bytes, min_side: int):
+    """
+    Como decode_image, mas JPEG grande é decodificado direto em resolução reduzida.
+    Retorna (imagem, (h, w) original); PNG/JPEG pequeno caem no decode completo.
+    JPEG com EXIF Orientation != 1 também: o imdecode gira a imagem e o tamanho do SOF
+    (antes da rotação) trocaria altura/largura, mandando as bboxes para os eixos errados.
+    """
+    size = jpeg_size(image_bytes)
+    if size and jpeg_exif_orientation(image_bytes) != 1:
+        size = None
+    factor = reduced_decode_factor(*size, min_side) if size else 1
+    if factor == 1:
+        img = decode_image(image_bytes)
+        return img, img.shape[:2]
+
+    img = cv2.imdecode(np.frombuffer(image_bytes, dtype=np.uint8), REDUCED_DECODE_FLAGS[factor])
+    if img is None:
+        raise ValueError("Imagem inválida. Envie JPEG/PNG válido.")
+    return img, size
+
+
+def mono12_packed_to_mono8(raw: pb2.RawImage, buffer=None) -> np.ndarray:
+    """
+    RawImage Mono12Packed (GigE: byte0 = p0[11:4], byte1 = bits baixos, byte2 = p1[11:4])
+    -> mono uint8 HxW. Os 8 bits altos de cada pixel já estão inteiros nos bytes 0 e 2,
+    então p >> 4 é só juntar esses bytes: uma cópia, sem desempacotar os 12 bits.
+    `buffer` substitui raw.data (ex: slot da memória compartilhada).
+    """
+    data = raw.data if buffer is None else buffer
+    h, w = int(raw.height), int(raw.width)
+    if h <= 0 or w <= 0 or w % 2:
+        raise ValueError(f"RawImage Mono12Packed com dimensões inválidas: {w}x{h} (largura deve ser par).")
+    if (int(raw.channels) or 1) != 1:
+        raise ValueError("RawImage Mono12Packed deve ter 1 canal.")
+
+    row_bytes = w * 3 // 2
+    stride = int(raw.stride) or row_bytes
+    if stride < row_bytes:
+        raise ValueError(f"RawImage.stride={stride} menor que a linha ({row_bytes} bytes).")
+    needed = stride * (h - 1) + row_bytes
+    if len(data) < needed:
+        raise ValueError(f"RawImage.data tem {len(data)} bytes, esperado >= {needed}.")
+
+    # view (h, w/2, 3) sobre os bytes do protobuf; [..., 0::2] = bytes altos de p0 e p1
+    groups = np.ndarray(shape=(h, w // 2, 3), dtype=np.uint8, buffer=data, strides=(stride, 3, 1))
+    mono = np.empty((h, w // 2, 2), dtype=np.uint8)
+    mono[...] = groups[:, :, 0::2]
+    return mono.reshape(h, w)
+
+
+def raw_image_to_ndarray(raw: pb2.RawImage, buffer=None) -> np.ndarray:
+    """
+    Envolve RawImage.data num ndarray HWC sem copiar (view read-only sobre os bytes
+    do protobuf). O stride permite linhas com padding vindas direto do buffer da câmera.
+    `buffer` substitui raw.data (ex: slot da memória compartilhada).
+    """
+    data = raw.data if buffer is None else buffer
+    dtype_name = raw.dtype or "uint8"
+    if dtype_name not in RAW_DTYPES:
+        raise ValueError(f"RawImage.dtype inválido: {dtype_name!r}. Use um de {tuple(RAW_DTYPES)}.")
+    dtype = np.dtype(RAW_DTYPES[dtype_name])
+
+    h, w = int(raw.height), int(raw.width)
+    c = int(raw.channels) or 1
+    if h <= 0 or w <= 0:
+        raise ValueError(f"RawImage com dimensões inválidas: {w}x{h}.")
+    if c not in (1, 3):
+        raise ValueError(f"RawImage.channels deve ser 1 ou 3, veio {c}.")
+    if c == 3 and dtype != np.uint8:
+        raise ValueError(f"RawImage com 3 canais deve ser uint8, veio {dtype_name!r}.")
+
+    row_bytes = w * c * dtype.itemsize
+    stride = int(raw.stride) or row_bytes
+    if stride < row_bytes:
+        raise ValueError(f"RawImage.stride={stride} menor que a linha ({row_bytes} bytes).")
+
+    needed = stride * (h - 1) + row_bytes
+    if len(data) < needed:
+        raise ValueError(f"RawImage.data tem {len(data)} bytes, esperado >= {needed}.")
+
+    return np.ndarray(
+        shape=(h, w, c),
+        dtype=dtype,
+        buffer=data,
+        strides=(stride, c * dtype.itemsize, dtype.itemsize),
+    )
+
+
+def raw_bit_depth(raw: pb2.RawImage, dtype: np.dtype) -> int:
+    bits = int(raw.bit_depth) or dtype.itemsize * 8
+    if not 1 <= bits <= dtype.itemsize * 8:
+        raise ValueError(f"RawImage.bit_depth={bits} inválido para {dtype}.")
+    return bits
+
+
+def mono_to_bgr(mono: np.ndarray, bit_depth: int, target_side: int = 0):
+    """
+    Mono8/Mono12/Mono16 (HxW) -> BGR uint8 para o YOLO sem buffer colorido em resolução cheia:
+    reduz em 1 canal até o lado maior = `target_side` (o mesmo resize que o letterbox do
+    ultralytics faria depois), escala para 8 bits e só então replica os canais.
+    Retorna ndarray, ou ScaledImage quando reduziu (bboxes voltam para o tamanho original).
+    """
+    h, w = mono.shape
+    small = mono
+    if target_side > 0 and max(h, w) > target_side:
+        r = target_side / max(h, w)
+        small = cv2.resize(mono, (int(round(w * r)), int(round(h * r))), interpolation=cv2.INTER_LINEAR)
+
+    if small.dtype != np.uint8 or bit_depth != 8:
+        # uma passada: [0, 2^bits - 1] -> [0, 255] com saturação
+        small = cv2.convertScaleAbs(small, alpha=255.0 / ((1 << bit_depth) - 1))
+
+    # YOLO espera 3 canais
+    bgr = cv2.cvtColor(small, cv2.COLOR_GRAY2BGR)
+    return bgr if bgr.shape[:2] == (h, w) else ScaledImage(bgr, (h, w))
+
+
+def raw_image_to_bgr(raw: pb2.RawImage, mono_side: int = 0, buffer=None):
+    """
+    RawImage -> imagem para o modelo. BGR volta como view sobre os bytes (sem cópia);
+    mono (Mono8/Mono12/Mono12Packed) é reduzida em 1 canal até `mono_side` antes de virar BGR
+    (imagem nova, não aponta mais para os bytes de entrada).
+    """
+    if raw.dtype == "mono12packed":
+        return mono_to_bgr(mono12_packed_to_mono8(raw, buffer), 8, mono_side)
+    img = raw_image_to_ndarray(raw, buffer)
+    if img.shape[2] == 1:
+        return mono_to_bgr(img[:, :, 0], raw_bit_depth(raw, img.dtype), mono_side)
+    return img
+
+
+def encoded_to_image(data, reduced_min_side: int = 0):
+    """JPEG/PNG (bytes ou qualquer buffer) -> BGR; ScaledImage quando o decode reduzido encolheu a imagem."""
+    if reduced_min_side > 0:
+        img, orig_shape = decode_image_reduced(data, reduced_min_side)
+        return img if img.shape[:2] == tuple(orig_shape) else ScaledImage(img, orig_shape)
+    return decode_image(data)
+
+
+def request_to_image(request, reduced_min_side: int = 0, mono_side: int = 0):
+    """
+    Converte o campo `image` (oneof) do request na imagem BGR que vai para o modelo.
+    Com `reduced_min_side` > 0, image_bytes JPEG grande volta como ScaledImage
+    (decode reduzido, lado maior >= reduced_min_side).
+    RawImage mono (Mono8/Mono12/Mono12Packed) é reduzida em 1 canal até `mono_side` antes de virar BGR.
+    """
+    if request.WhichOneof("image") == "raw_image":
+        return raw_image_to_bgr(request.raw_image, mono_side)
+    return encoded_to_image(request.image_bytes, reduced_min_side)
+
+
+def upload_to_image(header: pb2.InferRequest, buffer, reduced_min_side: int = 0, mono_side: int = 0):
+    """
+    Imagem montada pelo InferUpload: `buffer` são os pixels no layout de header.raw_image
+    (se o header trouxer raw_image) ou o arquivo JPEG/PNG. Lido direto do buffer, sem cópia.
+    """
+    if header.WhichOneof("image") == "raw_image":
+        return raw_image_to_bgr(header.raw_image, mono_side, buffer)
+    return encoded_to_image(buffer, reduced_min_side)
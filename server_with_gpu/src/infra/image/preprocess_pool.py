@@ -0,0 +1,181 @@
+import queue
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+
+from infra.image.image_decoder import decode_image_reduced
+
+
+LETTERBOX_COLOR = (114, 114, 114)  # mesmo cinza do letterbox do ultralytics
+
+
+# =========================
+# HELPERS (rodam no worker)
+# =========================
+def letterbox(img: np.ndarray, imgsz: int):
+    """
+    Redimensiona mantendo proporção e centraliza num quadrado imgsz x imgsz.
+    Retorna (imagem, ratio, (pad_x, pad_y)) para desfazer nas bboxes.
+    """
+    h, w = img.shape[:2]
+    ratio = min(imgsz / h, imgsz / w)
+    new_w, new_h = int(round(w * ratio)), int(round(h * ratio))
+
+    if (new_w, new_h) != (w, h):
+        img = cv2.resize(img, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+
+    pad_x = (imgsz - new_w) / 2
+    pad_y = (imgsz - new_h) / 2
+    top, bottom = int(round(pad_y - 0.1)), int(round(pad_y + 0.1))
+    left, right = int(round(pad_x - 0.1)), int(round(pad_x + 0.1))
+    img = cv2.copyMakeBorder(img, top, bottom, left, right, cv2.BORDER_CONSTANT, value=LETTERBOX_COLOR)
+    return img, ratio, (left, top)
+
+
+_worker_shm = None
+
+
+def _init_worker(shm_name: str) -> None:
+    global _worker_shm
+    cv2.setNumThreads(1)  # paralelismo vem dos processos
+    _worker_shm = shared_memory.SharedMemory(name=shm_name)
+
+
+def _preprocess_into_slot(image_bytes: bytes, slot: int, imgsz: int, reduced_decode: bool = False):
+    """
+    imdecode + letterbox + BGR->RGB + CHW float32 [0..1], escrito direto no slot
+    da memória compartilhada. Só os metadados voltam pelo pipe do pool.
+    Com `reduced_decode`, JPEG grande é decodificado já reduzido (lado maior >= imgsz).
+    """
+    if reduced_decode:
+        img, orig_shape = decode_image_reduced(image_bytes, imgsz)
+    else:
+        img = cv2.imdecode(np.frombuffer(image_bytes, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if img is None:
+            raise ValueError("Imagem inválida. Envie JPEG/PNG válido.")
+        orig_shape = img.shape[:2]
+
+    boxed, ratio, pad = letterbox(img, imgsz)
+    # ratio relativo à imagem original (o decode reduzido já fez parte da escala)
+    ratio *= img.shape[1] / orig_shape[1]
+
+    slot_bytes = 3 * imgsz * imgsz * 4
+    out = np.ndarray((3, imgsz, imgsz), dtype=np.float32, buffer=_worker_shm.buf, offset=slot * slot_bytes)
+    for c in range(3):
+        # canal c do RGB = canal 2-c do BGR
+        np.multiply(boxed[:, :, 2 - c], 1.0 / 255.0, out=out[c], casting="unsafe")
+
+    return orig_shape, ratio, pad
+
+
+# =========================
+# IMAGEM PRONTA
+# =========================
+class PreparedImage:
+    """
+    Tensor CHW float32 pronto para o modelo, vivendo num slot da memória compartilhada.
+    O slot volta para o pool quando todos os donos chamam `release()`
+    (InferMulti usa `retain()` para mandar a mesma imagem para vários modelos).
+    """
+
+    def __init__(self, pool: "PreprocessPool", slot: int, tensor: np.ndarray, orig_shape, ratio: float, pad):
+        self.pool = pool
+        self.slot = slot
+        self.tensor = tensor
+        self.orig_shape = orig_shape  # (h, w) da imagem original
+        self.ratio = ratio
+        self.pad = pad  # (pad_x, pad_y)
+        self._refs = 1
+        self._lock = threading.Lock()
+
+    def retain(self) -> None:
+        with self._lock:
+            self._refs += 1
+
+    def release(self) -> None:
+        with self._lock:
+            self._refs -= 1
+            free = self._refs == 0
+        if free:
+            self.pool._free_slot(self.slot)
+
+
+# =========================
+# POOL
+# =========================
+class PreprocessPool:
+    """
+    Pool de processos para decode + letterbox + normalização, fora do GIL do servidor.
+    A thread do gRPC entrega os bytes e recebe um PreparedImage; o tensor é escrito
+    pelo worker direto na memória compartilhada (sem voltar pelo pipe).
+    `slots` limita quantas imagens preparadas existem ao mesmo tempo: sem slot livre,
+    `prepare` espera (backpressure).
+    """
+
+    def __init__(
+        self,
+        num_workers: int,
+        imgsz: int,
+        slots: int = 32,
+        slot_timeout_sec: float = 10.0,
+        reduced_decode: bool = False,
+    ):
+        if num_workers < 1:
+            raise ValueError("num_workers deve ser >= 1.")
+        if slots < 1:
+            raise ValueError("slots deve ser >= 1.")
+
+        self.num_workers = num_workers
+        self.imgsz = imgsz
+        self.slots = slots
+        self.slot_timeout_sec = slot_timeout_sec
+        self.reduced_decode = reduced_decode
+        self.slot_bytes = 3 * imgsz * imgsz * 4
+
+        self._shm = shared_memory.SharedMemory(create=True, size=self.slot_bytes * slots)
+        self._free = queue.Queue()
+        for slot in range(slots):
+            self._free.put(slot)
+
+        # spawn: não herda CUDA/threads do processo do servidor
+        self._executor = ProcessPoolExecutor(
+            max_workers=num_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self._shm.name,),
+        )
+
+    def prepare(self, image_bytes: bytes) -> PreparedImage:
+        try:
+            slot = self._free.get(timeout=self.slot_timeout_sec)
+        except queue.Empty:
+            raise RuntimeError("Pool de pré-processamento sem slot livre.")
+
+        try:
+            orig_shape, ratio, pad = self._executor.submit(
+                _preprocess_into_slot, image_bytes, slot, self.imgsz, self.reduced_decode
+            ).result()
+        except Exception:
+            self._free_slot(slot)
+            raise
+
+        tensor = np.ndarray(
+            (3, self.imgsz, self.imgsz), dtype=np.float32, buffer=self._shm.buf, offset=slot * self.slot_bytes
+        )
+        return PreparedImage(self, slot, tensor, orig_shape, ratio, pad)
+
+    def worker_pids(self) -> list:
+        """PIDs dos workers já iniciados (o executor sobe os processos no primeiro submit)."""
+        return list(self._executor._processes or {})
+
+    def _free_slot(self, slot: int) -> None:
+        self._free.put(slot)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        self._shm.close()
+        self._shm.unlink()
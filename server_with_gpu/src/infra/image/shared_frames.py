@@ -0,0 +1,189 @@
+import threading
+import uuid
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+from protos import inference_pb2 as pb2
+from infra.image.image_decoder import raw_image_to_bgr
+
+
+# cabeçalho de cada slot: [seq escrito pelo cliente u64][seq liberado pelo servidor u64]
+SLOT_HEADER_BYTES = 16
+
+
+class StaleFrameError(ValueError):
+    """O slot não guarda mais o frame do request: o cliente já escreveu outro seq por cima."""
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    # o segmento é do cliente: o resource_tracker deste processo não pode apagá-lo ao sair
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+# =========================
+# SEGMENTO
+# =========================
+class SharedSegment:
+    """Segmento de memória compartilhada criado pelo cliente, dividido em slots de tamanho fixo."""
+
+    def __init__(self, name: str, slots: int, slot_bytes: int):
+        if slots < 1:
+            raise ValueError("slots deve ser >= 1.")
+        if slot_bytes < 1 or slot_bytes % 8:
+            raise ValueError(f"slot_bytes deve ser múltiplo de 8 e > 0, veio {slot_bytes}.")
+
+        self.name = name
+        self.slots = int(slots)
+        self.slot_bytes = int(slot_bytes)
+        self.slot_stride = SLOT_HEADER_BYTES + self.slot_bytes
+
+        self._shm = _attach(name)
+        if self._shm.size < self.slots * self.slot_stride:
+            size = self._shm.size
+            self._shm.close()
+            raise ValueError(f"Segmento {name!r} tem {size} bytes, esperado >= {self.slots * self.slot_stride}.")
+
+        # [slot, 0] = seq do cliente, [slot, 1] = seq liberado pelo servidor
+        self._headers = np.ndarray(
+            (self.slots, 2), dtype=np.uint64, buffer=self._shm.buf, strides=(self.slot_stride, 8)
+        )
+        self._lock = threading.Lock()
+
+    def slot_buffer(self, slot: int) -> memoryview:
+        if not 0 <= slot < self.slots:
+            raise ValueError(f"Slot {slot} fora do segmento ({self.slots} slots).")
+        start = slot * self.slot_stride + SLOT_HEADER_BYTES
+        return self._shm.buf[start:start + self.slot_bytes]
+
+    def holds(self, slot: int, seq: int) -> bool:
+        """O slot ainda tem o frame `seq` (cabeçalho do cliente igual ao seq do request)."""
+        with self._lock:
+            return self._headers is not None and int(self._headers[slot, 0]) == seq
+
+    def mark_done(self, slot: int, seq: int) -> None:
+        # a partir daqui o cliente pode reescrever o slot. Só avança: liberar de novo um frame
+        # antigo (caminho de erro atrasado) não pode esconder a liberação de um frame mais novo
+        with self._lock:
+            # segmento já fechado (UnregisterSharedMemory com frame ainda num lote): o cliente
+            # desistiu do anel, não há para quem liberar; não pode quebrar o lote do modelo
+            if self._headers is not None and self._headers[slot, 1] < seq:
+                self._headers[slot, 1] = seq
+
+    def close(self) -> None:
+        with self._lock:
+            self._headers = None
+        try:
+            self._shm.close()
+        except BufferError:
+            # ainda há frame em uso apontando para o segmento; o GC fecha depois
+            pass
+
+
+# =========================
+# FRAME EM USO
+# =========================
+class SharedFrameImage:
+    """
+    View BGR sobre um slot da memória compartilhada, sem cópia.
+    Igual ao PreparedImage: `retain()`/`release()` por dono; quando todos liberam,
+    o seq é gravado no cabeçalho do slot e o cliente pode reaproveitá-lo.
+    """
+
+    def __init__(self, segment: SharedSegment, slot: int, seq: int, img: np.ndarray):
+        self.segment = segment
+        self.slot = slot
+        self.seq = seq
+        self.img = img
+        self._refs = 1
+        self._lock = threading.Lock()
+
+    def retain(self) -> None:
+        with self._lock:
+            self._refs += 1
+
+    def release(self) -> None:
+        with self._lock:
+            self._refs -= 1
+            free = self._refs == 0
+        if free:
+            self.img = None
+            self.segment.mark_done(self.slot, self.seq)
+
+
+# =========================
+# REGISTRY
+# =========================
+class SharedFrameRegistry:
+    """Segmentos registrados pelos clientes (RegisterSharedMemory), por segment_id."""
+
+    def __init__(self):
+        self._segments = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, slots: int, slot_bytes: int) -> str:
+        segment = SharedSegment(name, slots, slot_bytes)
+        segment_id = uuid.uuid4().hex
+        with self._lock:
+            self._segments[segment_id] = segment
+        print(f"[SHM] Registered segment={name} slots={slots} slot_bytes={slot_bytes} id={segment_id}")
+        return segment_id
+
+    def unregister(self, segment_id: str) -> None:
+        with self._lock:
+            segment = self._segments.pop(segment_id, None)
+        if segment is None:
+            raise ValueError(f"segment_id {segment_id!r} não registrado.")
+        segment.close()
+        print(f"[SHM] Unregistered segment={segment.name} id={segment_id}")
+
+    def release(self, frame: pb2.SharedFrame) -> None:
+        """
+        Devolve o slot ao cliente sem abrir o frame: request recusado antes de chegar à imagem
+        (modelo desconhecido, admissão). Slot já liberado, com outro frame ou segmento
+        desconhecido: nada a fazer.
+        """
+        with self._lock:
+            segment = self._segments.get(frame.segment_id)
+        if segment is not None and 0 <= frame.slot < segment.slots and segment.holds(frame.slot, frame.seq):
+            segment.mark_done(frame.slot, frame.seq)
+
+    def open(self, frame: pb2.SharedFrame, mono_side: int = 0):
+        """
+        Imagem do slot para o modelo. BGR vira SharedFrameImage (view, liberada depois do predict);
+        mono é convertida já no tamanho do modelo e o slot é liberado na hora.
+        """
+        with self._lock:
+            segment = self._segments.get(frame.segment_id)
+        if segment is None:
+            raise ValueError(f"segment_id {frame.segment_id!r} não registrado.")
+        if 0 <= frame.slot < segment.slots and not segment.holds(frame.slot, frame.seq):
+            # request atrasado/repetido: os pixels são de outro frame, e liberar o slot com
+            # este seq soltaria o frame que o cliente escreveu depois
+            raise StaleFrameError(f"Slot {frame.slot} não tem mais o frame seq={frame.seq}.")
+
+        try:
+            buffer = segment.slot_buffer(frame.slot)
+            img = raw_image_to_bgr(frame.layout, mono_side, buffer)
+        except Exception:
+            # layout inválido: devolve o slot ao cliente antes de propagar o erro
+            if 0 <= frame.slot < segment.slots:
+                segment.mark_done(frame.slot, frame.seq)
+            raise
+        if isinstance(img, np.ndarray) and np.shares_memory(img, np.frombuffer(buffer, dtype=np.uint8)):
+            return SharedFrameImage(segment, frame.slot, frame.seq, img)
+
+        segment.mark_done(frame.slot, frame.seq)
+        return img
+
+    def close(self) -> None:
+        with self._lock:
+            segments = list(self._segments.values())
+            self._segments.clear()
+        for segment in segments:
+            segment.close()
@@ -0,0 +1,294 @@
+import hashlib
+import time
+import zlib
+import numpy as np
+import torch
+from ultralytics import YOLO
+
+from protos import inference_pb2 as pb2
+from infra.image.image_decoder import ScaledImage
+from infra.image.preprocess_pool import PreparedImage
+from infra.image.shared_frames import SharedFrameImage
+from infra.model.micro_batcher import MicroBatcher
+from monitoring.prometheus_metrics import (
+    PRIORITY_BATCHER,
+    PRIORITY_NAMES,
+    PRIORITY_QUEUE_WAIT,
+    STAGE_PREDICT,
+    STAGE_QUEUE_WAIT,
+    ModelMetrics,
+)
+
+
+# =========================
+# CORES (estáveis por nome)
+# =========================
+# 60 cores UI
+UI_COLORS = [
+    "#FF0000", "#00FF00", "#0000FF", "#FFFF00", "#FF00FF", "#00FFFF",
+    "#800000", "#008000", "#000080", "#808000", "#800080", "#008080",
+    "#C00000", "#00C000", "#0000C0", "#C0C000", "#C000C0", "#00C0C0",
+    "#400000", "#004000", "#000040", "#404000", "#400040", "#004040",
+    "#FF4500", "#32CD32", "#1E90FF", "#FFD700", "#ADFF2F", "#FF69B4",
+    "#8A2BE2", "#5F9EA0", "#DC143C", "#00CED1", "#228B22", "#FF1493",
+    "#00BFFF", "#B8860B", "#6A5ACD", "#20B2AA", "#FF8C00", "#9932CC",
+    "#8B0000", "#008B8B", "#2E8B57", "#DA70D6", "#FF6347", "#4682B4",
+    "#9ACD32", "#8FBC8F", "#00FA9A", "#1E90FF"
+]
+MASK_COLORS = [
+    "#000000", "#010101", "#020202", "#030303", "#040404",
+    "#050505", "#060606", "#070707", "#080808", "#090909",
+    "#0A0A0A", "#0B0B0B", "#0C0C0C", "#0D0D0D", "#0E0E0E",
+    "#0F0F0F", "#101010", "#111111", "#121212", "#131313",
+    "#141414", "#151515", "#161616", "#171717", "#181818",
+    "#191919", "#1A1A1A", "#1B1B1B", "#1C1C1C", "#1D1D1D",
+    "#1E1E1E", "#1F1F1F", "#202020", "#212121", "#222222",
+    "#232323", "#242424", "#252525", "#262626", "#272727",
+    "#282828", "#292929", "#2A2A2A", "#2B2B2B", "#2C2C2C",
+    "#2D2D2D", "#2E2E2E", "#2F2F2F", "#303030", "#313131",
+    "#323232", "#333333", "#343434", "#353535", "#363636",
+    "#373737", "#383838", "#393939", "#3A3A3A", "#3B3B3B"
+]
+
+
+# =========================
+# HELPERS
+# =========================
+def hex_to_rgb_tuple(hex_color: str):
+    hex_color = hex_color.lstrip("#")
+    return (int(hex_color[0:2], 16), int(hex_color[2:4], 16), int(hex_color[4:6], 16))
+
+
+def stable_idx(name: str, n: int) -> int:
+    return zlib.crc32(name.strip().lower().encode("utf-8")) % n
+
+
+def dict_defectinfo_to_pb2(d: dict) -> pb2.DefectInfo:
+    return pb2.DefectInfo(
+        name=str(d["name"]),
+        class_id=int(d["class_id"]),
+        ui_color=pb2.RGB(
+            r=int(d["ui_color"]["r"]),
+            g=int(d["ui_color"]["g"]),
+            b=int(d["ui_color"]["b"]),
+        ),
+        mask_color=pb2.RGB(
+            r=int(d["mask_color"]["r"]),
+            g=int(d["mask_color"]["g"]),
+            b=int(d["mask_color"]["b"]),
+        ),
+    )
+
+
+def model_info_etag(name: str, defect_list: list) -> str:
+    """Hash da tabela de classes: muda só quando nomes/ids/cores mudam."""
+    h = hashlib.sha1(name.encode("utf-8"))
+    for d in defect_list:
+        h.update(d.SerializeToString(deterministic=True))
+    return h.hexdigest()[:16]
+
+
+# imagens que apontam para memória compartilhada: retain()/release() por dono
+LEASED_IMAGE_TYPES = (PreparedImage, SharedFrameImage)
+
+
+def _release_item(item) -> None:
+    img, _ = item
+    if isinstance(img, LEASED_IMAGE_TYPES):
+        img.release()
+
+
+def unletterbox_boxes(result, prepared: PreparedImage) -> None:
+    """Leva as bboxes do espaço imgsz x imgsz (letterbox) de volta para a imagem original."""
+    if result.boxes is None or len(result.boxes) == 0:
+        return
+    pad_x, pad_y = prepared.pad
+    h, w = prepared.orig_shape
+    # tensores do predict são "inference tensors": só aceitam update in-place neste modo
+    with torch.inference_mode():
+        xyxy = result.boxes.data[:, :4]
+        xyxy[:, [0, 2]] -= pad_x
+        xyxy[:, [1, 3]] -= pad_y
+        xyxy /= prepared.ratio
+        xyxy[:, [0, 2]] = xyxy[:, [0, 2]].clamp(0, w)
+        xyxy[:, [1, 3]] = xyxy[:, [1, 3]].clamp(0, h)
+
+
+def rescale_boxes(result, scaled: ScaledImage) -> None:
+    """Leva as bboxes da imagem decodificada em resolução reduzida para a original."""
+    if result.boxes is None or len(result.boxes) == 0:
+        return
+    h, w = scaled.orig_shape
+    with torch.inference_mode():
+        xyxy = result.boxes.data[:, :4]
+        xyxy[:, [0, 2]] = (xyxy[:, [0, 2]] * scaled.scale_x).clamp(0, w)
+        xyxy[:, [1, 3]] = (xyxy[:, [1, 3]] * scaled.scale_y).clamp(0, h)
+
+
+def build_defect_list_pb2(names: dict) -> list:
+    out = []
+    for class_id, name in names.items():
+        name_str = str(name)
+
+        ui_hex = UI_COLORS[stable_idx(name_str, len(UI_COLORS))]
+        mk_hex = MASK_COLORS[stable_idx(name_str, len(MASK_COLORS))]
+
+        ur, ug, ub = hex_to_rgb_tuple(ui_hex)
+        mr, mg, mb = hex_to_rgb_tuple(mk_hex)
+
+        out.append(
+            dict_defectinfo_to_pb2({
+                "name": name_str,
+                "class_id": int(class_id),
+                "ui_color": {"r": ur, "g": ug, "b": ub},
+                "mask_color": {"r": mr, "g": mg, "b": mb},
+            })
+        )
+    return out
+
+
+# =========================
+# MODELO CARREGADO
+# =========================
+class LoadedModel:
+    """
+    Um YOLO carregado e tudo que é fixo para ele: nomes das classes,
+    defect_list/ModelInfo em PB2 (montados uma vez) e o batcher próprio do modelo.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        path: str,
+        imgsz: int,
+        device,
+        batch_max_size: int = 8,
+        batch_max_wait_ms: float = 5.0,
+        batch_max_pending: int = 0,
+        priority_max_starve_ms: float = 0.0,
+    ):
+        self.name = name
+        self.path = path
+        self.imgsz = imgsz
+        self.device = device
+
+        self.model = YOLO(self.path)
+
+        # nomes das classes do YOLO
+        self.names = self.model.model.names  # dict[int,str]
+
+        # cache PB2 (monta uma vez)
+        self.defect_list_pb2 = build_defect_list_pb2(self.names)
+        self.model_info_pb2 = pb2.ModelInfo(
+            model_name=self.name,
+            etag=model_info_etag(self.name, self.defect_list_pb2),
+            defect_list=self.defect_list_pb2,
+        )
+
+        # bytes de pesos/buffers (não conta ativações): base do orçamento de memória do registry
+        self.memory_bytes = sum(
+            t.numel() * t.element_size()
+            for t in list(self.model.model.parameters()) + list(self.model.model.buffers())
+        )
+
+        # micro-batching: RPCs concorrentes viram um único predict em lote
+        self.batcher = MicroBatcher(
+            self._predict_batch,
+            max_batch_size=batch_max_size,
+            max_wait_ms=batch_max_wait_ms,
+            name=f"batcher-{self.name}",
+            on_discard=_release_item,
+            on_batch_start=self._observe_batch_start,
+            max_pending=batch_max_pending,
+            on_shed=self._observe_shed,
+            priority_levels=len(PRIORITY_NAMES),
+            max_starve_ms=priority_max_starve_ms,
+            on_batch_done=self._observe_batch_done,
+        )
+
+        self.metrics = ModelMetrics(self.name)
+        # lido só no scrape: nada a atualizar no submit
+        self.metrics.queue_depth.set_function(lambda: self.batcher.pending_count)
+
+    def _observe_batch_start(self, waits: list, priorities: list) -> None:
+        self.metrics.batch_size.observe(len(waits))
+        for w, p in zip(waits, priorities):
+            STAGE_QUEUE_WAIT.observe(w)
+            PRIORITY_QUEUE_WAIT[p].observe(w)
+
+    def _observe_batch_done(self, latencies: list, priorities: list) -> None:
+        for t, p in zip(latencies, priorities):
+            PRIORITY_BATCHER[p].observe(t)
+
+    def _observe_shed(self, reason: str) -> None:
+        self.metrics.shed[reason].inc()
+
+    def _predict(self, source, conf: float) -> list:
+        t0 = time.perf_counter()
+        results = list(
+            self.model.predict(
+                source=source,
+                imgsz=self.imgsz,
+                conf=conf,
+                device=self.device,
+                verbose=False,
+            )
+        )
+        # cada imagem do lote espera o predict inteiro
+        elapsed = time.perf_counter() - t0
+        for _ in results:
+            STAGE_PREDICT.observe(elapsed)
+        return results
+
+    def _predict_batch(self, items):
+        """
+        items: lista de (img, conf). Roda um único predict para o lote inteiro.
+        Usa o menor conf do lote; o filtro por conf de cada request é feito depois.
+
+        img é um ndarray BGR (letterbox feito pelo ultralytics), um ScaledImage (ndarray
+        decodificado em resolução reduzida), um SharedFrameImage (view BGR sobre o slot
+        do cliente, liberado depois do predict) ou um PreparedImage do pool de
+        pré-processamento (tensor já pronto); arrays e tensores viram um predict cada.
+        """
+        conf = min(c for _, c in items)
+        results = [None] * len(items)
+        leased = [img for img, _ in items if isinstance(img, LEASED_IMAGE_TYPES)]
+
+        def release(kind) -> None:
+            for img in [img for img in leased if isinstance(img, kind)]:
+                leased.remove(img)
+                img.release()
+
+        try:
+            arrays = [i for i, (img, _) in enumerate(items) if not isinstance(img, PreparedImage)]
+            if arrays:
+                imgs = [items[i][0] for i in arrays]
+                sources = [img.img if isinstance(img, (ScaledImage, SharedFrameImage)) else img for img in imgs]
+                predicted = self._predict(sources, conf)
+                # o letterbox do ultralytics já copiou os pixels: o cliente pode reescrever o slot
+                release(SharedFrameImage)
+                for i, img, r in zip(arrays, imgs, predicted):
+                    if isinstance(img, ScaledImage):
+                        rescale_boxes(r, img)
+                    results[i] = r
+
+            prepared = [i for i, (img, _) in enumerate(items) if isinstance(img, PreparedImage)]
+            if prepared:
+                batch = torch.from_numpy(np.stack([items[i][0].tensor for i in prepared]))
+                # a cópia do stack libera os slots da memória compartilhada
+                release(PreparedImage)
+                for i, r in zip(prepared, self._predict(batch, conf)):
+                    unletterbox_boxes(r, items[i][0])
+                    results[i] = r
+        finally:
+            # lote que falhou no meio: o MicroBatcher só repassa a exceção, os slots saem daqui
+            release(LEASED_IMAGE_TYPES)
+
+        return results
+
+    def close(self) -> None:
+        # termina o que já está na fila e libera o modelo
+        self.batcher.close()
+        self.model = None
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
@@ -0,0 +1,310 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional
+
+
+class BatcherClosedError(RuntimeError):
+    pass
+
+
+class BatcherRejectedError(RuntimeError):
+    """Item recusado sem passar pelo modelo: fila cheia ou prazo do request curto demais."""
+
+    def __init__(self, reason: str, message: str):
+        super().__init__(message)
+        self.reason = reason
+
+
+class _Pending:
+    __slots__ = ("item", "fut", "enqueued", "deadline", "key", "priority")
+
+    def __init__(self, item, fut: Future, enqueued: float, deadline: Optional[float], key, priority: int):
+        self.item = item
+        self.fut = fut
+        self.enqueued = enqueued
+        self.deadline = deadline
+        self.key = key
+        self.priority = priority
+
+
+class MicroBatcher:
+    """
+    Fila de micro-batching na frente do modelo.
+
+    Várias threads chamam `submit(item)` e recebem um Future. Uma única thread
+    worker junta os itens pendentes até `max_batch_size` ou até `max_wait_ms`
+    desde o primeiro item do lote, chama `process_batch(items)` uma vez e
+    devolve cada saída para o Future correspondente (mesma ordem da entrada).
+
+    `process_batch` é qualquer callable `list[item] -> list[resultado]`, então
+    dá para testar em CPU com um modelo fake no lugar do YOLO.
+    `on_discard(item)` é chamado para itens que saem da fila sem passar pelo
+    modelo (ex: Future cancelado), para liberar recursos presos ao item.
+    `on_batch_start(waits, priorities)` recebe, para cada item do lote que vai rodar,
+    quanto tempo (s) ele esperou na fila e a prioridade dele; `on_batch_done(latencies,
+    priorities)` recebe o tempo da entrada na fila até o resultado (métricas).
+
+    Controle de admissão: com `max_pending` > 0 a fila é limitada e `submit` recusa na
+    hora (BatcherRejectedError "queue_full") em vez de enfileirar. Com `timeout_s` (prazo
+    restante do request), recusa também quando a espera estimada (lotes na frente x média
+    móvel da duração de um lote) já passa do prazo ("deadline"), e itens cujo prazo venceu
+    na fila saem sem rodar ("expired"). `on_shed(reason)` é chamado a cada recusa.
+
+    Coalescing: itens com a mesma `key` (ex: câmera) não se acumulam na fila. Um item
+    novo substitui o da mesma key que ainda espera um lote; o antigo sai sem rodar
+    ("superseded"). Só vale para quem ainda não entrou num lote.
+
+    Prioridades: `priority_levels` filas (0 = mais alta). O lote é montado da fila mais
+    alta para a mais baixa, então frames ao vivo passam na frente de save/audit que
+    ainda não entraram num lote. Anti-starvation: item de prioridade baixa que já esperou
+    `max_starve_ms` entra no próximo lote antes dos outros (0 = sem limite). Com a fila
+    cheia, um item novo de prioridade mais alta tira o mais novo da prioridade mais baixa
+    ("preempted") em vez de ser recusado.
+    """
+
+    def __init__(
+        self,
+        process_batch: Callable[[List[Any]], List[Any]],
+        max_batch_size: int = 8,
+        max_wait_ms: float = 5.0,
+        name: str = "batcher",
+        on_discard: Optional[Callable[[Any], None]] = None,
+        on_batch_start: Optional[Callable[[List[float], List[int]], None]] = None,
+        max_pending: int = 0,
+        on_shed: Optional[Callable[[str], None]] = None,
+        priority_levels: int = 1,
+        max_starve_ms: float = 0.0,
+        on_batch_done: Optional[Callable[[List[float], List[int]], None]] = None,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size deve ser >= 1.")
+        if max_wait_ms < 0:
+            raise ValueError("max_wait_ms deve ser >= 0.")
+        if priority_levels < 1:
+            raise ValueError("priority_levels deve ser >= 1.")
+
+        self.process_batch = process_batch
+        self.max_batch_size = int(max_batch_size)
+        self.max_wait_s = float(max_wait_ms) / 1000.0
+        self.name = name
+        self.on_discard = on_discard
+        self.on_batch_start = on_batch_start
+        self.max_pending = max(0, int(max_pending))
+        self.on_shed = on_shed
+        self.priority_levels = int(priority_levels)
+        self.max_starve_s = max(0.0, float(max_starve_ms)) / 1000.0
+        self.on_batch_done = on_batch_done
+
+        self._queues = [deque() for _ in range(self.priority_levels)]  # uma fila por prioridade
+        self._latest = {}  # key -> _Pending ainda na fila
+        self._cond = threading.Condition()
+        self._closed = False
+        # média móvel da duração de process_batch (s); 0 até o primeiro lote = sem recusa por prazo
+        self._batch_s = 0.0
+        self._busy = False
+
+        self._worker = threading.Thread(target=self._run, name=f"{name}-worker", daemon=True)
+        self._worker.start()
+
+    def submit(self, item: Any, timeout_s: Optional[float] = None, key=None, priority: int = 0) -> Future:
+        """
+        timeout_s: prazo restante do request (None = sem prazo).
+        key: origem do item para o coalescing (None = sem coalescing).
+        priority: 0 = mais alta; fora de 0..priority_levels-1 (ex: enum de proto mais novo) cai na mais baixa.
+        """
+        priority = self._priority(priority)
+        fut = Future()
+        with self._cond:
+            if self._closed:
+                raise BatcherClosedError(f"{self.name} já foi encerrado.")
+            superseded = self._latest.get(key) if key is not None else None
+            preempted = self._admit(timeout_s, priority, replacing=superseded is not None)
+            for old in (superseded, preempted):
+                if old is not None:
+                    self._remove(old)
+            now = time.monotonic()
+            entry = _Pending(item, fut, now, now + timeout_s if timeout_s is not None else None, key, priority)
+            self._queues[priority].append(entry)
+            if key is not None:
+                self._latest[key] = entry
+            self._cond.notify()
+
+        # fora do lock: callbacks do Future e on_discard podem demorar
+        if superseded is not None:
+            self._shed("superseded")
+            self._reject(
+                superseded,
+                BatcherRejectedError("superseded", f"{self.name}: frame substituído por um mais novo da mesma origem."),
+            )
+        if preempted is not None:
+            self._shed("preempted")
+            self._reject(
+                preempted,
+                BatcherRejectedError("preempted", f"{self.name}: fila cheia, lugar cedido a um frame de prioridade maior."),
+            )
+        return fut
+
+    def check_admission(self, timeout_s: Optional[float] = None, priority: int = 0) -> None:
+        """Mesma checagem do submit, sem enfileirar: recusa antes de gastar decode com o request."""
+        with self._cond:
+            self._admit(timeout_s, self._priority(priority), dry_run=True)
+
+    @property
+    def pending_count(self) -> int:
+        return sum(len(q) for q in self._queues)
+
+    def estimated_wait_s(self, priority: int = 0) -> float:
+        """
+        Até um item submetido agora sair do modelo: lote em andamento + lotes na frente + o dele.
+        Na frente = itens da mesma prioridade ou mais alta (para prioridade baixa é um piso:
+        os de prioridade alta que chegarem depois também passam na frente).
+        """
+        queued = sum(len(q) for q in self._queues[: self._priority(priority) + 1])
+        ahead = queued // self.max_batch_size + (1 if self._busy else 0)
+        return (ahead + 1) * self._batch_s
+
+    def _priority(self, priority: int) -> int:
+        return min(max(int(priority), 0), self.priority_levels - 1)
+
+    def _admit(
+        self, timeout_s: Optional[float], priority: int, replacing: bool = False, dry_run: bool = False
+    ) -> Optional[_Pending]:
+        # chamado com self._cond; substituir um item da mesma key não aumenta a fila.
+        # Retorna o item de prioridade mais baixa que perde o lugar (fila cheia), se houver.
+        preempted = None
+        if self.max_pending and not replacing and self.pending_count >= self.max_pending:
+            preempted = self._preemptable(priority)
+            if preempted is None:
+                self._shed("queue_full")
+                raise BatcherRejectedError(
+                    "queue_full", f"{self.name}: fila cheia ({self.max_pending} imagens esperando o modelo)."
+                )
+        if timeout_s is not None:
+            expected = self.estimated_wait_s(priority)
+            if timeout_s < expected:
+                self._shed("deadline")
+                raise BatcherRejectedError(
+                    "deadline",
+                    f"{self.name}: prazo restante {timeout_s * 1000:.0f} ms < espera estimada {expected * 1000:.0f} ms.",
+                )
+        return None if dry_run else preempted
+
+    def _preemptable(self, priority: int) -> Optional[_Pending]:
+        # o mais novo da prioridade mais baixa abaixo de `priority` (o que esperou menos)
+        for q in reversed(self._queues[priority + 1:]):
+            if q:
+                return q[-1]
+        return None
+
+    def _remove(self, entry: _Pending) -> None:
+        self._queues[entry.priority].remove(entry)
+        if entry.key is not None and self._latest.get(entry.key) is entry:
+            del self._latest[entry.key]
+
+    def _shed(self, reason: str) -> None:
+        if self.on_shed is not None:
+            self.on_shed(reason)
+
+    def _reject(self, entry: _Pending, error: BatcherRejectedError) -> None:
+        # item que sai da fila sem rodar: erro para quem espera (se não cancelou) e libera o item
+        if entry.fut.set_running_or_notify_cancel():
+            entry.fut.set_exception(error)
+        if self.on_discard is not None:
+            self.on_discard(entry.item)
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._worker.join()
+
+    # =========================
+    # WORKER
+    # =========================
+    def _take(self) -> list:
+        # chamado com self._cond: quem passou de max_starve_s entra primeiro (senão um fluxo
+        # contínuo de frames ao vivo nunca deixaria a prioridade baixa rodar), depois o resto
+        # da prioridade mais alta para a mais baixa
+        batch = []
+        if self.max_starve_s > 0:
+            starved = time.monotonic() - self.max_starve_s
+            for q in self._queues[1:]:
+                while q and len(batch) < self.max_batch_size and q[0].enqueued <= starved:
+                    batch.append(q.popleft())
+        for q in self._queues:
+            while q and len(batch) < self.max_batch_size:
+                batch.append(q.popleft())
+        return batch
+
+    def _next_batch(self) -> list:
+        with self._cond:
+            while not self.pending_count and not self._closed:
+                self._cond.wait()
+            if not self.pending_count:
+                return []
+
+            # janela de espera conta a partir do momento em que o lote começou
+            deadline = time.monotonic() + self.max_wait_s
+            while self.pending_count < self.max_batch_size and not self._closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            self._busy = True
+            batch = self._take()
+            for entry in batch:
+                if entry.key is not None and self._latest.get(entry.key) is entry:
+                    del self._latest[entry.key]
+            return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                return
+
+            # RPC cancelado ou com prazo vencido antes de entrar no lote não ocupa o modelo
+            running = []
+            waits = []
+            started = time.monotonic()
+            for entry in batch:
+                if entry.deadline is not None and entry.deadline <= started:
+                    self._shed("expired")
+                    self._reject(entry, BatcherRejectedError("expired", f"{self.name}: prazo do request venceu na fila."))
+                elif entry.fut.set_running_or_notify_cancel():
+                    running.append(entry)
+                    waits.append(started - entry.enqueued)
+                elif self.on_discard is not None:
+                    self.on_discard(entry.item)
+            if not running:
+                self._busy = False
+                continue
+            priorities = [entry.priority for entry in running]
+            if self.on_batch_start is not None:
+                self.on_batch_start(waits, priorities)
+            batch = [(entry.item, entry.fut) for entry in running]
+
+            try:
+                outputs = self.process_batch([item for item, _ in batch])
+                if len(outputs) != len(batch):
+                    raise RuntimeError(
+                        f"process_batch retornou {len(outputs)} saídas para {len(batch)} itens."
+                    )
+            except Exception as e:
+                self._busy = False
+                for _, fut in batch:
+                    fut.set_exception(e)
+                continue
+
+            elapsed = time.monotonic() - started
+            self._batch_s = elapsed if self._batch_s == 0.0 else 0.8 * self._batch_s + 0.2 * elapsed
+            self._busy = False
+
+            for (_, fut), out in zip(batch, outputs):
+                fut.set_result(out)
+            if self.on_batch_done is not None:
+                done = time.monotonic()
+                self.on_batch_done([done - entry.enqueued for entry in running], priorities)
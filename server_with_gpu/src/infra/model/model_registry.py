@@ -0,0 +1,158 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+from infra.env.environment import split_env_list
+from infra.model.loaded_model import LoadedModel
+from infra.model.micro_batcher import BatcherClosedError
+
+
+class UnknownModelError(ValueError):
+    pass
+
+
+def load_model_paths_from_env() -> Dict[str, str]:
+    """
+    MODELS="defeito_a=/code/src/models/a.pt,defeito_b=/code/src/models/b.pt"
+    Sem MODELS, cai no modo antigo de um modelo só (MODEL_NAME/MODEL_PATH).
+    """
+    entries = split_env_list("MODELS")
+    if not entries:
+        return {
+            os.getenv("MODEL_NAME", "yolo_detect_default"): os.getenv("MODEL_PATH", "/code/models/main_defect.pt"),
+        }
+
+    out = {}
+    for entry in entries:
+        name, sep, path = entry.partition("=")
+        if not sep or not name.strip() or not path.strip():
+            raise ValueError(f"Entrada inválida em MODELS: {entry!r} (use nome=caminho).")
+        out[name.strip()] = path.strip()
+    return out
+
+
+class ModelRegistry:
+    """
+    Vários modelos num único processo, carregados sob demanda.
+
+    - `get(name)` carrega o modelo na primeira vez (fora do lock global, então
+      requests de outros modelos continuam andando) e marca como usado (LRU).
+    - Com `memory_budget_mb` > 0, ao passar do orçamento descarrega os modelos
+      menos usados recentemente (nunca o que acabou de ser pedido).
+    """
+
+    def __init__(
+        self,
+        model_paths: Dict[str, str],
+        model_factory: Callable[[str, str], LoadedModel],
+        default_model: Optional[str] = None,
+        memory_budget_mb: float = 0,
+    ):
+        if not model_paths:
+            raise RuntimeError("Nenhum modelo configurado (MODELS ou MODEL_PATH).")
+
+        self.model_paths = dict(model_paths)
+        self.model_factory = model_factory
+        self.default_model = default_model or next(iter(self.model_paths))
+        if self.default_model not in self.model_paths:
+            raise RuntimeError(f"Modelo padrão {self.default_model!r} não está em {list(self.model_paths)}.")
+        self.memory_budget_bytes = int(float(memory_budget_mb) * 1024 * 1024)
+
+        self._loaded: "OrderedDict[str, LoadedModel]" = OrderedDict()  # mais recente no fim
+        self._lock = threading.Lock()
+        self._load_locks = {name: threading.Lock() for name in self.model_paths}
+
+    def resolve(self, name: str) -> str:
+        name = name or self.default_model
+        if name not in self.model_paths:
+            raise UnknownModelError(f"Modelo {name!r} não configurado. Disponíveis: {list(self.model_paths)}")
+        return name
+
+    def get(self, name: str = "") -> LoadedModel:
+        name = self.resolve(name)
+
+        model = self._touch(name)
+        if model is not None:
+            return model
+
+        with self._load_locks[name]:
+            model = self._touch(name)
+            if model is not None:
+                return model
+
+            model = self.model_factory(name, self.model_paths[name])
+            with self._lock:
+                self._loaded[name] = model
+                evicted = self._evict_locked(keep=name)
+
+        for old in evicted:
+            print(f"[REGISTRY] Unloaded model_name={old.name} ({old.memory_bytes / 1e6:.1f} MB)")
+            old.close()
+
+        print(
+            f"[REGISTRY] Loaded model_name={name} model_path={model.path} "
+            f"({model.memory_bytes / 1e6:.1f} MB) loaded={self.loaded_names()}"
+        )
+        return model
+
+    def submit(self, name: str, item, timeout_s: Optional[float] = None, key=None, priority: int = 0):
+        """
+        get + batcher.submit. Se o modelo for descarregado entre os dois passos,
+        recarrega e tenta de novo. timeout_s = prazo restante do request (admissão);
+        key = origem do frame (coalescing por câmera); priority = fila no batcher (0 = mais alta).
+        """
+        while True:
+            model = self.get(name)
+            try:
+                return model, model.batcher.submit(item, timeout_s, key, priority)
+            except BatcherClosedError:
+                continue
+
+    def check_admission(self, name: str, timeout_s: Optional[float] = None, priority: int = 0) -> None:
+        """
+        Recusa cedo (BatcherRejectedError) se o batcher do modelo não aceitaria o request agora.
+        Modelo ainda não carregado passa: a checagem de verdade fica para o submit.
+        """
+        model = self._touch(self.resolve(name))
+        if model is not None:
+            model.batcher.check_admission(timeout_s, priority)
+
+    def preload(self, names) -> None:
+        for name in names:
+            self.get(name)
+
+    def loaded_names(self) -> list:
+        with self._lock:
+            return list(self._loaded)
+
+    def close(self) -> None:
+        with self._lock:
+            models = list(self._loaded.values())
+            self._loaded.clear()
+        for model in models:
+            model.close()
+
+    # ------------ helpers ------------
+    def _touch(self, name: str) -> Optional[LoadedModel]:
+        with self._lock:
+            model = self._loaded.get(name)
+            if model is not None:
+                self._loaded.move_to_end(name)
+            return model
+
+    def _evict_locked(self, keep: str) -> list:
+        if self.memory_budget_bytes <= 0:
+            return []
+
+        evicted = []
+        total = sum(m.memory_bytes for m in self._loaded.values())
+        for name in list(self._loaded):
+            if total <= self.memory_budget_bytes:
+                break
+            if name == keep:
+                continue
+            model = self._loaded.pop(name)
+            total -= model.memory_bytes
+            evicted.append(model)
+        return evicted
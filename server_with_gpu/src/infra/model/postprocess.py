@@ -0,0 +1,50 @@
+import numpy as np
+
+from protos import inference_pb2 as pb2
+
+
+def detections_to_numpy(result, conf: float):
+    """
+    Uma única cópia device->host de result.boxes.data e o resto em NumPy:
+    filtro por conf e conversão xyxy -> XYWH top-left em bloco.
+    Retorna (xywh float32 [N,4], scores float32 [N], class_ids int64 [N]).
+    """
+    boxes = result.boxes
+    if boxes is None or len(boxes) == 0:
+        return np.empty((0, 4), np.float32), np.empty((0,), np.float32), np.empty((0,), np.int64)
+
+    # colunas: x1, y1, x2, y2, [track_id,] conf, cls
+    data = boxes.data.detach().cpu().numpy()
+    data = data[data[:, -2] >= conf]
+
+    xywh = data[:, :4].astype(np.float32)
+    xywh[:, 2:] -= xywh[:, :2]
+    return xywh, data[:, -2].astype(np.float32), data[:, -1].astype(np.int64)
+
+
+def boxes_to_pb2(result, names: dict, conf: float) -> list:
+    """BBox PB2 (XYWH top-left) das detecções com score >= conf."""
+    xywh, scores, class_ids = detections_to_numpy(result, conf)
+    if len(scores) == 0:
+        return []
+
+    # nome por classe resolvido uma vez por classe presente, não por box
+    labels = {int(c): str(names.get(int(c), f"class_{int(c)}")) for c in np.unique(class_ids)}
+
+    return [
+        pb2.BBox(x=x, y=y, w=w, h=h, label=labels[c], class_id=c, confidence=s)
+        for (x, y, w, h), s, c in zip(xywh.tolist(), scores.tolist(), class_ids.tolist())
+    ]
+
+
+def boxes_to_packed_pb2(result, conf: float) -> pb2.PackedBBoxes:
+    """Mesmas detecções de boxes_to_pb2, em colunas packed (sem submensagem/label por box)."""
+    xywh, scores, class_ids = detections_to_numpy(result, conf)
+    return pb2.PackedBBoxes(
+        x=xywh[:, 0].tolist(),
+        y=xywh[:, 1].tolist(),
+        w=xywh[:, 2].tolist(),
+        h=xywh[:, 3].tolist(),
+        confidence=scores.tolist(),
+        class_id=class_ids.tolist(),
+    )
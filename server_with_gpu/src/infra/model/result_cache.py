@@ -0,0 +1,111 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+def image_digest(request) -> bytes:
+    """
+    Hash (blake2b 128 bits) do conteúdo do campo `image` do request.
+    Para RawImage entra também todo o layout (dimensões, dtype, stride e bit_depth),
+    senão dois layouts diferentes com os mesmos bytes colidiriam: o mesmo uint16 com
+    bit_depth 8 e 12 é escalado diferente para 8 bits.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    if request.WhichOneof("image") == "raw_image":
+        raw = request.raw_image
+        h.update(f"raw:{raw.width}x{raw.height}x{raw.channels}:{raw.dtype}:{raw.stride}:{raw.bit_depth}:".encode("utf-8"))
+        h.update(raw.data)
+    else:
+        h.update(b"bytes:")
+        h.update(request.image_bytes)
+    return h.digest()
+
+
+class ResultCache:
+    """
+    Cache de resultados endereçado por conteúdo (LRU + TTL + limite de memória).
+
+    Chave é qualquer hashable (ex: (modelo, conf, digest da imagem)); o valor
+    é guardado junto com o tamanho informado pelo chamador. Entradas vencem
+    depois de `ttl_ms`; ao passar de `max_entries` ou `max_bytes`, sai a menos
+    usada recentemente. Thread-safe.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024, ttl_ms: float = 2000.0):
+        if max_entries < 1:
+            raise ValueError("max_entries deve ser >= 1.")
+        if max_bytes < 1:
+            raise ValueError("max_bytes deve ser >= 1.")
+
+        self.max_entries = int(max_entries)
+        self.max_bytes = int(max_bytes)
+        self.ttl_s = float(ttl_ms) / 1000.0 if ttl_ms > 0 else None
+
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (value, size, expires_at)
+        self._lock = threading.Lock()
+        self._bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, size, expires_at = entry
+            if expires_at is not None and expires_at <= now:
+                self._pop_locked(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any, size: int) -> None:
+        size = int(size)
+        if size > self.max_bytes:
+            return
+
+        expires_at = time.monotonic() + self.ttl_s if self.ttl_s is not None else None
+        with self._lock:
+            if key in self._entries:
+                self._pop_locked(key)
+            self._entries[key] = (value, size, expires_at)
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._pop_locked(next(iter(self._entries)))
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / total) if total else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    # ------------ helpers ------------
+    def _pop_locked(self, key: Hashable) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
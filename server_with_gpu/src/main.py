@@ -1,35 +1,67 @@
 # infra/grpc/server/server.py
 
 import os
+import signal
+import asyncio
 import grpc
 from concurrent import futures
 
 from protos import inference_pb2_grpc as pb2_grpc
 from infra.grpc.inference_methods import InferenceMethods  # ✅ sua classe nova
+from infra.grpc.server_aio import serve_aio
+from monitoring.grpc_interceptor import MetricsInterceptor, track_executor_queue
+from monitoring.prometheus_metrics import SerializeTimingInterceptor, start_metrics_server
 
 
-MAX_MSG = 64 * 1024 * 1024
+# limite por mensagem; imagem maior que isso vai pelo InferUpload (em chunks)
+MAX_MSG = int(float(os.getenv("GRPC_MAX_MESSAGE_MB", "64")) * 1024 * 1024)
+# no SIGTERM/SIGINT: tempo para os RPCs em andamento terminarem antes de fechar modelos/pool
+SHUTDOWN_GRACE_SEC = float(os.getenv("GRPC_SHUTDOWN_GRACE_SEC", "5"))
 
 
 def main() -> None:
+    # "sync" (ThreadPoolExecutor) ou "aio" (grpc.aio, event loop)
+    if os.getenv("GRPC_SERVER_MODE", "sync").lower() == "aio":
+        asyncio.run(serve_aio())
+        return
+
     port = int(os.getenv("GRPC_PORT", "50051"))
     max_workers = int(os.getenv("GRPC_MAX_WORKERS", "8"))
+    # acima disso o gRPC responde RESOURCE_EXHAUSTED na hora (0 = sem limite); streams abertos contam
+    max_concurrent_rpcs = int(os.getenv("GRPC_MAX_CONCURRENT_RPCS", "0")) or None
 
+    executor = futures.ThreadPoolExecutor(max_workers=max_workers)
     server = grpc.server(
-        futures.ThreadPoolExecutor(max_workers=max_workers),
+        executor,
+        # MetricsInterceptor por fora: recebe o handler já com o serializer medido
+        interceptors=[MetricsInterceptor(), SerializeTimingInterceptor()],
+        maximum_concurrent_rpcs=max_concurrent_rpcs,
         options=[
             ("grpc.max_send_message_length", MAX_MSG),
             ("grpc.max_receive_message_length", MAX_MSG),
         ],
     )
 
+    track_executor_queue(executor)
+
     # ✅ registra o servicer correto do seu proto (InferenceMethods)
-    pb2_grpc.add_InferenceMethodsServicer_to_server(InferenceMethods(), server)
+    servicer = InferenceMethods()
+    pb2_grpc.add_InferenceMethodsServicer_to_server(servicer, server)
+
+    # docker stop manda SIGTERM: para o servidor e deixa o wait_for_termination voltar
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, lambda *_: server.stop(SHUTDOWN_GRACE_SEC))
 
     server.add_insecure_port(f"[::]:{port}")
+    start_metrics_server()
     server.start()
     print(f"[SERVER] gRPC InferenceMethods started on :{port}")
-    server.wait_for_termination()
+    try:
+        server.wait_for_termination()
+    finally:
+        server.stop(SHUTDOWN_GRACE_SEC).wait()
+        servicer.close()
+        print("[SERVER] Stopped")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,183 @@
+import os
+import threading
+import time
+
+import grpc
+from prometheus_client import REGISTRY, Counter, Gauge, Histogram, start_http_server
+from prometheus_client.core import CounterMetricFamily
+
+
+# 0.5 ms .. 10 s: decode/predict de imagem grande passam de 1 s, serialize fica em sub-ms
+STAGE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BOX_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+# Histogram (não Summary): soma entre réplicas e percentil com histogram_quantile() no Prometheus
+INFERENCE_STAGE_SECONDS = Histogram(
+    "inference_stage_seconds",
+    "Tempo por etapa do caminho de inferência (s)",
+    ["stage"],
+    buckets=STAGE_BUCKETS,
+)
+INFERENCE_BOXES_PER_FRAME = Histogram(
+    "inference_boxes_per_frame", "Bboxes devolvidas por imagem", ["model"], buckets=BOX_BUCKETS
+)
+INFERENCE_BATCH_SIZE = Histogram(
+    "inference_batch_size", "Imagens por predict em lote", ["model"], buckets=(1, 2, 4, 8, 16, 32, 64)
+)
+INFERENCE_QUEUE_DEPTH = Gauge(
+    "inference_queue_depth", "Imagens na fila do batcher do modelo (ainda fora de um lote)", ["model"]
+)
+INFERENCE_SHED = Counter(
+    "inference_shed_total",
+    "Imagens recusadas sem passar pelo modelo (queue_full, deadline = prazo menor que a espera estimada, "
+    "expired = prazo venceu na fila, superseded = frame mais novo da mesma origem, "
+    "preempted = lugar na fila cedido a prioridade maior)",
+    ["model", "reason"],
+)
+SHED_REASONS = ("queue_full", "deadline", "expired", "superseded", "preempted")
+# InferRequest.priority (PRIORITY_FAST = 0, PRIORITY_SLOW = 1) = índice da fila no batcher
+PRIORITY_NAMES = ("fast", "slow")
+INFERENCE_PRIORITY_SECONDS = Histogram(
+    "inference_priority_seconds",
+    "Tempo no batcher por prioridade (s): queue_wait = fila até entrar num lote, "
+    "batcher = fila + predict (da entrada na fila até o resultado)",
+    ["priority", "stage"],
+    buckets=STAGE_BUCKETS,
+)
+INFERENCE_RPC_IN_FLIGHT = Gauge("inference_rpc_in_flight", "RPCs de inferência em andamento", ["method"])
+INFERENCE_ERRORS = Counter(
+    "inference_errors_total",
+    "Erros por método e código gRPC (IN_RESPONSE = erro só no campo error, ex: frame do stream)",
+    ["method", "code"],
+)
+
+# children já resolvidos: no caminho quente só observe(), sem labels() por request
+STAGE_DECODE = INFERENCE_STAGE_SECONDS.labels(stage="decode")
+STAGE_QUEUE_WAIT = INFERENCE_STAGE_SECONDS.labels(stage="queue_wait")
+STAGE_PREDICT = INFERENCE_STAGE_SECONDS.labels(stage="predict")
+STAGE_POSTPROCESS = INFERENCE_STAGE_SECONDS.labels(stage="postprocess")
+STAGE_SERIALIZE = INFERENCE_STAGE_SECONDS.labels(stage="serialize")
+# indexados pela prioridade
+PRIORITY_QUEUE_WAIT = tuple(INFERENCE_PRIORITY_SECONDS.labels(priority=p, stage="queue_wait") for p in PRIORITY_NAMES)
+PRIORITY_BATCHER = tuple(INFERENCE_PRIORITY_SECONDS.labels(priority=p, stage="batcher") for p in PRIORITY_NAMES)
+
+# métodos cujo response_serializer é medido (STAGE_SERIALIZE)
+_SERIALIZE_TIMED_METHODS = (
+    "/model.inference.InferenceMethods/Infer",
+    "/model.inference.InferenceMethods/InferStream",
+    "/model.inference.InferenceMethods/InferMulti",
+    "/model.inference.InferenceMethods/InferUpload",
+)
+
+
+class ModelMetrics:
+    """Children das métricas por modelo, criados uma vez no LoadedModel."""
+
+    def __init__(self, model_name: str):
+        self.boxes_per_frame = INFERENCE_BOXES_PER_FRAME.labels(model=model_name)
+        self.batch_size = INFERENCE_BATCH_SIZE.labels(model=model_name)
+        self.queue_depth = INFERENCE_QUEUE_DEPTH.labels(model=model_name)
+        self.shed = {reason: INFERENCE_SHED.labels(model=model_name, reason=reason) for reason in SHED_REASONS}
+
+
+class _ResultCacheCollector:
+    """
+    inference_result_cache_{hits,misses,evictions,expirations}_total lidos do ResultCache
+    no scrape: o cache já conta sob o próprio lock, nada a mais no caminho quente.
+    """
+
+    _COUNTERS = (
+        ("hits", "Consultas ao cache de resultados que devolveram a resposta guardada"),
+        ("misses", "Consultas ao cache de resultados sem entrada válida (inclui as vencidas)"),
+        ("evictions", "Entradas tiradas do cache por max_entries/max_bytes (LRU)"),
+        ("expirations", "Entradas encontradas vencidas (TTL) e tiradas do cache"),
+    )
+
+    def __init__(self):
+        self.cache = None
+
+    def collect(self):
+        cache = self.cache
+        if cache is None:
+            return
+        stats = cache.stats()
+        for name, doc in self._COUNTERS:
+            yield CounterMetricFamily(f"inference_result_cache_{name}", doc, value=stats[name])
+
+
+_RESULT_CACHE_COLLECTOR = _ResultCacheCollector()
+REGISTRY.register(_RESULT_CACHE_COLLECTOR)
+
+
+def track_result_cache(cache) -> None:
+    """Exporta os contadores do ResultCache do servicer (um por processo; o último vale)."""
+    _RESULT_CACHE_COLLECTOR.cache = cache
+
+
+def rpc_in_flight(method: str):
+    return INFERENCE_RPC_IN_FLIGHT.labels(method=method)
+
+
+def count_error(method: str, code: str) -> None:
+    INFERENCE_ERRORS.labels(method=method, code=code).inc()
+
+
+def start_metrics_server() -> None:
+    """/metrics em METRICS_PORT (9100; 0 = desligado), numa thread ao lado do servidor gRPC."""
+    port = int(os.getenv("METRICS_PORT", "9100"))
+    if port <= 0:
+        return
+    start_http_server(port)
+    print(f"[SERVER] Prometheus /metrics on :{port}")
+
+
+# =========================
+# SERIALIZE (interceptor)
+# =========================
+def _timed_serializer(serializer):
+    def serialize(message):
+        t0 = time.perf_counter()
+        data = serializer(message)
+        STAGE_SERIALIZE.observe(time.perf_counter() - t0)
+        return data
+
+    return serialize
+
+
+class _TimedSerializerCache:
+    """
+    A serialização da resposta acontece dentro do gRPC, fora do servicer: mede trocando o
+    serializer. O handler trocado é montado uma vez por método (o gRPC devolve sempre o
+    mesmo handler registrado), sem alocar nada por RPC.
+    """
+
+    def __init__(self):
+        self._wrapped = {}
+        self._lock = threading.Lock()
+
+    def wrap(self, handler, method: str):
+        if handler is None or method not in _SERIALIZE_TIMED_METHODS or handler.response_serializer is None:
+            return handler
+        cached = self._wrapped.get(method)
+        if cached is not None and cached[0] is handler:
+            return cached[1]
+        with self._lock:
+            wrapped = handler._replace(response_serializer=_timed_serializer(handler.response_serializer))
+            self._wrapped[method] = (handler, wrapped)
+        return wrapped
+
+
+class SerializeTimingInterceptor(grpc.ServerInterceptor):
+    def __init__(self):
+        self._handlers = _TimedSerializerCache()
+
+    def intercept_service(self, continuation, handler_call_details):
+        return self._handlers.wrap(continuation(handler_call_details), handler_call_details.method)
+
+
+class AioSerializeTimingInterceptor(grpc.aio.ServerInterceptor):
+    def __init__(self):
+        self._handlers = _TimedSerializerCache()
+
+    async def intercept_service(self, continuation, handler_call_details):
+        return self._handlers.wrap(await continuation(handler_call_details), handler_call_details.method)
@@ -39,6 +39,36 @@ class InferenceMethodsStub(object):
                 request_serializer=protos_dot_inference__pb2.InferRequest.SerializeToString,
                 response_deserializer=protos_dot_inference__pb2.InferResponse.FromString,
                 _registered_method=True)
+        self.InferStream = channel.stream_stream(
+                '/model.inference.InferenceMethods/InferStream',
+                request_serializer=protos_dot_inference__pb2.InferRequest.SerializeToString,
+                response_deserializer=protos_dot_inference__pb2.InferResponse.FromString,
+                _registered_method=True)
+        self.InferMulti = channel.unary_unary(
+                '/model.inference.InferenceMethods/InferMulti',
+                request_serializer=protos_dot_inference__pb2.InferMultiRequest.SerializeToString,
+                response_deserializer=protos_dot_inference__pb2.InferMultiResponse.FromString,
+                _registered_method=True)
+        self.GetModelInfo = channel.unary_unary(
+                '/model.inference.InferenceMethods/GetModelInfo',
+                request_serializer=protos_dot_inference__pb2.ModelInfoRequest.SerializeToString,
+                response_deserializer=protos_dot_inference__pb2.ModelInfo.FromString,
+                _registered_method=True)
+        self.RegisterSharedMemory = channel.unary_unary(
+                '/model.inference.InferenceMethods/RegisterSharedMemory',
+                request_serializer=protos_dot_inference__pb2.SharedMemoryRegistration.SerializeToString,
+                response_deserializer=protos_dot_inference__pb2.SharedMemoryInfo.FromString,
+                _registered_method=True)
+        self.UnregisterSharedMemory = channel.unary_unary(
+                '/model.inference.InferenceMethods/UnregisterSharedMemory',
+                request_serializer=protos_dot_inference__pb2.SharedMemoryInfo.SerializeToString,
+                response_deserializer=protos_dot_inference__pb2.SharedMemoryInfo.FromString,
+                _registered_method=True)
+        self.InferUpload = channel.stream_unary(
+                '/model.inference.InferenceMethods/InferUpload',
+                request_serializer=protos_dot_inference__pb2.ImageChunk.SerializeToString,
+                response_deserializer=protos_dot_inference__pb2.InferResponse.FromString,
+                _registered_method=True)
 
 
 class InferenceMethodsServicer(object):
@@ -50,6 +80,52 @@ class InferenceMethodsServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def InferStream(self, request_iterator, context):
+        """Stream contínuo de frames (ex: câmera): vários frames em voo no mesmo stream.
+        As respostas podem voltar fora de ordem -> use request_id para correlacionar.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def InferMulti(self, request, context):
+        """Uma imagem, vários modelos: decodifica uma vez e roda os modelos em paralelo.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetModelInfo(self, request, context):
+        """Tabela de classes do modelo (fixa enquanto o modelo não muda): o cliente guarda
+        e só pede de novo quando InferResponse.model_info_etag mudar.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def RegisterSharedMemory(self, request, context):
+        """Transporte por memória compartilhada (cliente e servidor no mesmo host): o cliente cria
+        o segmento e registra aqui; depois InferRequest.shared_frame só aponta para o slot.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def UnregisterSharedMemory(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def InferUpload(self, request_iterator, context):
+        """Imagem grande em pedaços (client streaming): o servidor monta num buffer do tamanho
+        anunciado e decodifica quando chegar o último chunk. Nenhuma mensagem precisa caber
+        a imagem inteira, então GRPC_MAX_MESSAGE_MB pode ficar baixo.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_InferenceMethodsServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -58,6 +134,36 @@ def add_InferenceMethodsServicer_to_server(servicer, server):
                     request_deserializer=protos_dot_inference__pb2.InferRequest.FromString,
                     response_serializer=protos_dot_inference__pb2.InferResponse.SerializeToString,
             ),
+            'InferStream': grpc.stream_stream_rpc_method_handler(
+                    servicer.InferStream,
+                    request_deserializer=protos_dot_inference__pb2.InferRequest.FromString,
+                    response_serializer=protos_dot_inference__pb2.InferResponse.SerializeToString,
+            ),
+            'InferMulti': grpc.unary_unary_rpc_method_handler(
+                    servicer.InferMulti,
+                    request_deserializer=protos_dot_inference__pb2.InferMultiRequest.FromString,
+                    response_serializer=protos_dot_inference__pb2.InferMultiResponse.SerializeToString,
+            ),
+            'GetModelInfo': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetModelInfo,
+                    request_deserializer=protos_dot_inference__pb2.ModelInfoRequest.FromString,
+                    response_serializer=protos_dot_inference__pb2.ModelInfo.SerializeToString,
+            ),
+            'RegisterSharedMemory': grpc.unary_unary_rpc_method_handler(
+                    servicer.RegisterSharedMemory,
+                    request_deserializer=protos_dot_inference__pb2.SharedMemoryRegistration.FromString,
+                    response_serializer=protos_dot_inference__pb2.SharedMemoryInfo.SerializeToString,
+            ),
+            'UnregisterSharedMemory': grpc.unary_unary_rpc_method_handler(
+                    servicer.UnregisterSharedMemory,
+                    request_deserializer=protos_dot_inference__pb2.SharedMemoryInfo.FromString,
+                    response_serializer=protos_dot_inference__pb2.SharedMemoryInfo.SerializeToString,
+            ),
+            'InferUpload': grpc.stream_unary_rpc_method_handler(
+                    servicer.InferUpload,
+                    request_deserializer=protos_dot_inference__pb2.ImageChunk.FromString,
+                    response_serializer=protos_dot_inference__pb2.InferResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'model.inference.InferenceMethods', rpc_method_handlers)
@@ -95,3 +201,165 @@ class InferenceMethods(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def InferStream(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/model.inference.InferenceMethods/InferStream',
+            protos_dot_inference__pb2.InferRequest.SerializeToString,
+            protos_dot_inference__pb2.InferResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def InferMulti(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/model.inference.InferenceMethods/InferMulti',
+            protos_dot_inference__pb2.InferMultiRequest.SerializeToString,
+            protos_dot_inference__pb2.InferMultiResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetModelInfo(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/model.inference.InferenceMethods/GetModelInfo',
+            protos_dot_inference__pb2.ModelInfoRequest.SerializeToString,
+            protos_dot_inference__pb2.ModelInfo.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def RegisterSharedMemory(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/model.inference.InferenceMethods/RegisterSharedMemory',
+            protos_dot_inference__pb2.SharedMemoryRegistration.SerializeToString,
+            protos_dot_inference__pb2.SharedMemoryInfo.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def UnregisterSharedMemory(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/model.inference.InferenceMethods/UnregisterSharedMemory',
+            protos_dot_inference__pb2.SharedMemoryInfo.SerializeToString,
+            protos_dot_inference__pb2.SharedMemoryInfo.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def InferUpload(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(
+            request_iterator,
+            target,
+            '/model.inference.InferenceMethods/InferUpload',
+            protos_dot_inference__pb2.ImageChunk.SerializeToString,
+            protos_dot_inference__pb2.InferResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
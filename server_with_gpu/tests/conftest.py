@@ -0,0 +1,121 @@
+import os
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+# mesmos imports do servidor (rodando de dentro de src/): "from infra...", "from protos..."
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
+
+from protos import inference_pb2 as pb2  # noqa: E402
+from infra.grpc.inference_methods import InferenceMethods  # noqa: E402
+from infra.model.loaded_model import LEASED_IMAGE_TYPES, build_defect_list_pb2, model_info_etag  # noqa: E402
+from infra.model.micro_batcher import MicroBatcher  # noqa: E402
+from monitoring.prometheus_metrics import ModelMetrics  # noqa: E402
+
+
+class FakeBatchModel:
+    """process_batch de teste: guarda cada lote e pode ficar travado até `gate` abrir."""
+
+    def __init__(self, delay_s: float = 0.0):
+        self.batches = []
+        self.gate = threading.Event()
+        self.gate.set()
+        self.delay_s = delay_s
+
+    def __call__(self, items):
+        self.gate.wait(5)
+        self.batches.append(list(items))
+        time.sleep(self.delay_s)
+        return [f"out-{item}" for item in items]
+
+    def occupy(self, batcher):
+        """Trava o worker num lote de 1 item: o que vier depois fica na fila."""
+        self.gate.clear()
+        fut = batcher.submit("blocker")
+        while batcher.pending_count:
+            time.sleep(0.001)
+        return fut
+
+
+@pytest.fixture
+def make_batcher():
+    """make_batcher(delay_s=0.0, **kwargs) -> (MicroBatcher, FakeBatchModel); fecha tudo no fim."""
+    batchers = []
+
+    def make(delay_s: float = 0.0, **kwargs):
+        kwargs.setdefault("max_wait_ms", 0)
+        model = FakeBatchModel(delay_s)
+        batcher = MicroBatcher(model, **kwargs)
+        batchers.append((batcher, model))
+        return batcher, model
+
+    yield make
+    for batcher, model in batchers:
+        model.gate.set()
+        batcher.close()
+
+
+class StandInModel:
+    """
+    LoadedModel de teste para o servicer: nome, defect_list, métricas e batcher próprios,
+    sem YOLO. O predict devolve resultados sem bbox (liberando as imagens do pool/slot)
+    e fica travado enquanto `gate` estiver fechado.
+    """
+
+    def __init__(self, name: str, path: str, memory_bytes: int = 0):
+        self.name = name
+        self.path = path
+        self.memory_bytes = memory_bytes
+        self.names = {0: "defeito"}
+        self.defect_list_pb2 = build_defect_list_pb2(self.names)
+        self.model_info_pb2 = pb2.ModelInfo(
+            model_name=name, etag=model_info_etag(name, self.defect_list_pb2), defect_list=self.defect_list_pb2
+        )
+        self.metrics = ModelMetrics(name)
+        self.gate = threading.Event()
+        self.gate.set()
+        self.closed = False
+        self.batcher = MicroBatcher(self._predict_batch, max_batch_size=1, max_wait_ms=0, name=f"batcher-{name}")
+
+    def _predict_batch(self, items):
+        self.gate.wait(5)
+        for img, _ in items:
+            if isinstance(img, LEASED_IMAGE_TYPES):
+                img.release()
+        return [SimpleNamespace(boxes=None) for _ in items]
+
+    def close(self) -> None:
+        self.closed = True
+        self.gate.set()
+        self.batcher.close()
+
+
+@pytest.fixture
+def stand_in_model():
+    """A classe StandInModel, para testes que montam o próprio loader/ModelRegistry."""
+    return StandInModel
+
+
+@pytest.fixture
+def make_servicer(monkeypatch):
+    """
+    make_servicer(**env) -> InferenceMethods com StandInModel no lugar do YOLO
+    (env padrão: MODELS=fake=/dev/null, USE_GPU=false); fecha tudo no fim.
+    """
+    servicers = []
+
+    def make(cls=InferenceMethods, **env):
+        env = {"MODELS": "fake=/dev/null", "USE_GPU": "false", **env}
+        for name, value in env.items():
+            monkeypatch.setenv(name, str(value))
+        monkeypatch.setattr(InferenceMethods, "_load_model", lambda self, name, path: StandInModel(name, path))
+        servicer = cls()
+        servicers.append(servicer)
+        return servicer
+
+    yield make
+    for servicer in servicers:
+        servicer.close()
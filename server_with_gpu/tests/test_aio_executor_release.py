@@ -0,0 +1,51 @@
+import asyncio
+import threading
+
+from infra.grpc.inference_methods_aio import run_leased_in_executor
+from infra.image.preprocess_pool import PreparedImage
+
+
+class FakePool:
+    def __init__(self):
+        self.freed = []
+
+    def _free_slot(self, slot):
+        self.freed.append(slot)
+
+
+def test_cancelled_rpc_releases_image_prepared_late():
+    pool = FakePool()
+    gate = threading.Event()
+
+    def prepare():
+        gate.wait(5)
+        return PreparedImage(pool, 7, None, (16, 16), 1.0, (0, 0))
+
+    async def main():
+        task = asyncio.ensure_future(run_leased_in_executor(prepare))
+        await asyncio.sleep(0.01)
+        task.cancel()  # cliente cancelou com o worker ainda preparando a imagem
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        assert pool.freed == []
+
+        gate.set()
+        for _ in range(500):
+            if pool.freed:
+                break
+            await asyncio.sleep(0.01)
+
+    asyncio.run(main())
+    assert pool.freed == [7]
+
+
+def test_result_returned_when_not_cancelled():
+    pool = FakePool()
+
+    async def main():
+        return await run_leased_in_executor(lambda: PreparedImage(pool, 1, None, (16, 16), 1.0, (0, 0)))
+
+    img = asyncio.run(main())
+    assert img.slot == 1 and pool.freed == []
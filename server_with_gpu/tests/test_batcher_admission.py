@@ -0,0 +1,44 @@
+import time
+
+import pytest
+
+from infra.model.micro_batcher import BatcherRejectedError
+
+
+def test_queue_full_rejects_at_submit(make_batcher):
+    shed = []
+    batcher, model = make_batcher(max_batch_size=1, max_pending=2, on_shed=shed.append)
+    model.occupy(batcher)
+
+    batcher.submit("a")
+    batcher.submit("b")
+    with pytest.raises(BatcherRejectedError) as exc:
+        batcher.submit("c")
+    assert exc.value.reason == "queue_full"
+    with pytest.raises(BatcherRejectedError):
+        batcher.check_admission()
+    assert shed == ["queue_full", "queue_full"]
+
+
+def test_deadline_rejects_when_estimated_wait_exceeds_timeout(make_batcher):
+    batcher, model = make_batcher(delay_s=0.05, max_batch_size=1)
+    batcher.submit("warmup").result(5)  # média móvel: ~50 ms por lote
+
+    with pytest.raises(BatcherRejectedError) as exc:
+        batcher.submit("late", timeout_s=0.001)
+    assert exc.value.reason == "deadline"
+    assert batcher.submit("ok", timeout_s=5).result(5) == "out-ok"
+
+
+def test_expired_in_queue_does_not_run(make_batcher):
+    batcher, model = make_batcher(max_batch_size=1)
+    model.occupy(batcher)
+
+    fut = batcher.submit("stale", timeout_s=0.01)
+    time.sleep(0.05)
+    model.gate.set()
+
+    with pytest.raises(BatcherRejectedError) as exc:
+        fut.result(5)
+    assert exc.value.reason == "expired"
+    assert ["stale"] not in model.batches
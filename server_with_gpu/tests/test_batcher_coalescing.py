@@ -0,0 +1,41 @@
+import pytest
+
+from infra.model.micro_batcher import BatcherRejectedError
+
+
+def test_same_key_supersedes_queued_item(make_batcher):
+    discarded, shed = [], []
+    batcher, model = make_batcher(
+        max_batch_size=4, max_pending=2, on_discard=discarded.append, on_shed=shed.append
+    )
+    model.occupy(batcher)
+
+    old = batcher.submit("cam-1", key="cam")
+    other = batcher.submit("other-1", key="other")
+    new = batcher.submit("cam-2", key="cam")  # fila cheia, mas substitui: não conta como novo
+
+    # o substituído sai na hora (antes do lote rodar) e só ele passa pelo on_discard
+    assert discarded == ["cam-1"]
+    assert shed == ["superseded"]
+    assert batcher.pending_count == 2
+    with pytest.raises(BatcherRejectedError) as exc:
+        old.result(0)
+    assert exc.value.reason == "superseded"
+
+    model.gate.set()
+    assert new.result(5) == "out-cam-2"
+    assert other.result(5) == "out-other-1"
+    assert model.batches[1] == ["other-1", "cam-2"]
+    assert discarded == ["cam-1"]
+
+
+def test_without_key_nothing_is_coalesced(make_batcher):
+    discarded = []
+    batcher, model = make_batcher(max_batch_size=4, on_discard=discarded.append)
+    model.occupy(batcher)
+
+    futs = [batcher.submit("cam-1"), batcher.submit("cam-1")]
+    model.gate.set()
+
+    assert [f.result(5) for f in futs] == ["out-cam-1", "out-cam-1"]
+    assert discarded == []
@@ -0,0 +1,113 @@
+import time
+
+import pytest
+
+from infra.model.micro_batcher import BatcherRejectedError
+
+
+def test_high_priority_goes_first(make_batcher):
+    batcher, model = make_batcher(max_batch_size=2, priority_levels=2)
+    model.occupy(batcher)
+
+    slow = [batcher.submit(f"slow-{i}", priority=1) for i in range(2)]
+    fast = [batcher.submit(f"fast-{i}", priority=0) for i in range(2)]
+    model.gate.set()
+    for f in slow + fast:
+        f.result(5)
+
+    assert model.batches[1:] == [["fast-0", "fast-1"], ["slow-0", "slow-1"]]
+
+
+def test_full_queue_preempts_lowest_priority(make_batcher):
+    shed = []
+    batcher, model = make_batcher(max_batch_size=1, max_pending=2, priority_levels=2, on_shed=shed.append)
+    model.occupy(batcher)
+
+    slow_old = batcher.submit("slow-old", priority=1)
+    slow_new = batcher.submit("slow-new", priority=1)
+    fast = batcher.submit("fast", priority=0)  # fila cheia: tira o slow mais novo
+
+    with pytest.raises(BatcherRejectedError) as exc:
+        slow_new.result(0)
+    assert exc.value.reason == "preempted"
+    assert shed == ["preempted"]
+    # só fast + slow-old na fila: um slow novo não tem de quem tirar o lugar
+    with pytest.raises(BatcherRejectedError) as exc:
+        batcher.submit("slow-3", priority=1)
+    assert exc.value.reason == "queue_full"
+
+    model.gate.set()
+    assert fast.result(5) == "out-fast"
+    assert slow_old.result(5) == "out-slow-old"
+
+
+def test_starved_low_priority_jumps_ahead(make_batcher):
+    batcher, model = make_batcher(max_batch_size=1, priority_levels=2, max_starve_ms=30)
+    model.occupy(batcher)
+
+    slow = batcher.submit("slow", priority=1)
+    time.sleep(0.06)  # passa de max_starve_ms
+    fast = [batcher.submit(f"fast-{i}", priority=0) for i in range(3)]
+    model.gate.set()
+    slow.result(5)
+    for f in fast:
+        f.result(5)
+
+    assert model.batches[1] == ["slow"]
+
+
+def test_without_starvation_limit_fast_always_first(make_batcher):
+    batcher, model = make_batcher(max_batch_size=1, priority_levels=2)
+    model.occupy(batcher)
+
+    slow = batcher.submit("slow", priority=5)  # fora do range: cai na prioridade mais baixa
+    time.sleep(0.06)
+    fast = [batcher.submit(f"fast-{i}") for i in range(2)]
+    model.gate.set()
+    slow.result(5)
+    for f in fast:
+        f.result(5)
+
+    assert model.batches[-1] == ["slow"]
+
+
+def test_out_of_range_priority_is_clamped(make_batcher):
+    starts = []
+    batcher, model = make_batcher(
+        max_batch_size=1, priority_levels=2, on_batch_start=lambda waits, prios: starts.append(prios)
+    )
+    model.occupy(batcher)
+
+    low = batcher.submit("low", priority=5)  # acima do range: vira a mais baixa (1)
+    neg = batcher.submit("neg", priority=-1)  # abaixo do range: vira a mais alta (0)
+    fast = batcher.submit("fast", priority=0)
+    model.gate.set()
+    for f in (low, neg, fast):
+        f.result(5)
+
+    # -1 divide a fila 0 com "fast" (FIFO); 5 fica atrás dos dois
+    assert model.batches[1:] == [["neg"], ["fast"], ["low"]]
+    assert starts == [[0], [0], [0], [1]]
+
+
+def test_batch_callbacks_report_waits_and_priorities(make_batcher):
+    starts, done = [], []
+    batcher, model = make_batcher(
+        max_batch_size=2,
+        priority_levels=2,
+        on_batch_start=lambda waits, prios: starts.append((len(waits), prios)),
+        on_batch_done=lambda latencies, prios: done.append((len(latencies), prios)),
+    )
+    model.occupy(batcher)
+
+    futs = [batcher.submit("s", priority=1), batcher.submit("f", priority=0)]
+    model.gate.set()
+    for f in futs:
+        f.result(5)
+    # on_batch_done roda depois de set_result: espera o worker terminar o lote
+    deadline = time.monotonic() + 5
+    while len(done) < 2 and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+    assert starts == [(1, [0]), (2, [0, 1])]
+    assert done == starts
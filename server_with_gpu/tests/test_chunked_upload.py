@@ -0,0 +1,71 @@
+import pytest
+
+from protos import inference_pb2 as pb2
+from infra.image.chunked_upload import ChunkedUpload
+
+DATA = bytes(range(50))
+
+
+def chunks(data: bytes = DATA, size: int = 7, header: pb2.InferRequest = None):
+    header = header or pb2.InferRequest(request_id="up-1")
+    out = []
+    for offset in range(0, len(data), size):
+        chunk = pb2.ImageChunk(offset=offset, data=data[offset:offset + size])
+        if offset == 0:
+            chunk.header.CopyFrom(header)
+            chunk.total_bytes = len(data)
+        out.append(chunk)
+    return out
+
+
+def upload(parts, max_bytes: int = 1024) -> ChunkedUpload:
+    up = ChunkedUpload(max_bytes)
+    for chunk in parts:
+        up.add(chunk)
+    return up
+
+
+def test_reassembles_in_preallocated_buffer():
+    header, buffer = upload(chunks()).finish()
+    assert header.request_id == "up-1"
+    assert bytes(buffer) == DATA
+
+
+def test_missing_chunk():
+    parts = chunks()
+    with pytest.raises(ValueError, match="fora de ordem"):
+        upload(parts[:3] + parts[4:])
+    # último chunk nunca chegou
+    with pytest.raises(ValueError, match="incompleto"):
+        upload(parts[:-1]).finish()
+
+
+def test_more_data_than_announced():
+    parts = chunks()
+    parts[-1].data += b"extra"
+    with pytest.raises(ValueError, match="total anunciado"):
+        upload(parts)
+
+
+def test_size_limit_checked_on_first_chunk():
+    with pytest.raises(ValueError, match="limite"):
+        upload(chunks()[:1], max_bytes=len(DATA) - 1)
+    upload(chunks(), max_bytes=len(DATA)).finish()
+
+
+def test_header_rules():
+    no_header = chunks()
+    no_header[0].ClearField("header")
+    with pytest.raises(ValueError, match="header"):
+        upload(no_header)
+
+    with pytest.raises(ValueError, match="header"):
+        upload(chunks(header=pb2.InferRequest(image_bytes=b"jpeg")))
+
+    zero = chunks()
+    zero[0].total_bytes = 0
+    with pytest.raises(ValueError, match="total_bytes"):
+        upload(zero)
+
+    with pytest.raises(ValueError, match="sem nenhum chunk"):
+        ChunkedUpload(1024).finish()
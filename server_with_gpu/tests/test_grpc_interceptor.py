@@ -0,0 +1,37 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from prometheus_client import REGISTRY
+
+from monitoring.grpc_interceptor import track_executor_queue
+
+
+def queued():
+    return REGISTRY.get_sample_value("grpc_server_executor_queued")
+
+
+def test_executor_queue_read_at_scrape():
+    gate = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        track_executor_queue(executor)
+        executor.submit(gate.wait, 5)
+        last = executor.submit(gate.wait, 5)  # sem thread livre: fica na fila
+        assert queued() == 1
+
+        gate.set()
+        last.result(5)
+        assert queued() == 0
+    finally:
+        gate.set()
+        executor.shutdown(wait=True)
+
+
+def test_executor_without_work_queue_is_skipped():
+    class OtherExecutor:
+        pass
+
+    track_executor_queue(ThreadPoolExecutor(max_workers=1))
+    before = queued()
+    track_executor_queue(OtherExecutor())  # não quebra nem troca o gauge registrado antes
+    assert queued() == before
@@ -0,0 +1,44 @@
+import cv2
+import numpy as np
+import pytest
+
+from infra.image.image_decoder import decode_image, decode_image_reduced, jpeg_exif_orientation, jpeg_size
+
+
+def jpeg(h: int, w: int, orientation: int = 0, byte_order: str = "II") -> bytes:
+    """JPEG h x w; com orientation, um APP1 EXIF só com a tag Orientation logo depois do SOI."""
+    img = np.zeros((h, w, 3), dtype=np.uint8)
+    img[: h // 4, : w // 4] = 255  # canto marcado: rotação muda onde ele aparece
+    data = cv2.imencode(".jpg", img)[1].tobytes()
+    if not orientation:
+        return data
+    order = "little" if byte_order == "II" else "big"
+    tiff = (
+        byte_order.encode() + (42).to_bytes(2, order) + (8).to_bytes(4, order)
+        + (1).to_bytes(2, order)  # 1 entrada no IFD0
+        + (0x0112).to_bytes(2, order) + (3).to_bytes(2, order) + (1).to_bytes(4, order)
+        + orientation.to_bytes(2, order) + b"\x00\x00"
+        + (0).to_bytes(4, order)
+    )
+    payload = b"Exif\x00\x00" + tiff
+    app1 = b"\xff\xe1" + (len(payload) + 2).to_bytes(2, "big") + payload
+    return data[:2] + app1 + data[2:]
+
+
+def test_jpeg_header_parsing():
+    assert jpeg_size(jpeg(1000, 2000)) == (1000, 2000)
+    assert jpeg_exif_orientation(jpeg(1000, 2000)) == 1
+    assert jpeg_exif_orientation(jpeg(1000, 2000, 6)) == 6
+    assert jpeg_exif_orientation(jpeg(1000, 2000, 8, "MM")) == 8
+    assert jpeg_size(jpeg(1000, 2000, 6)) == (1000, 2000)  # SOF: antes da rotação
+
+
+@pytest.mark.parametrize("orientation", [0, 1, 3, 6, 8])
+def test_reduced_decode_matches_full_decode_orientation(orientation):
+    data = jpeg(1000, 2000, orientation)
+    full = decode_image(data)
+    img, orig_shape = decode_image_reduced(data, min_side=640)
+
+    assert tuple(orig_shape) == full.shape[:2]
+    # mesma proporção e mesmos eixos que o decode completo
+    assert img.shape[0] / img.shape[1] == pytest.approx(full.shape[0] / full.shape[1], rel=0.01)
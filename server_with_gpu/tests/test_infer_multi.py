@@ -0,0 +1,53 @@
+import threading
+import time
+
+from protos import inference_pb2 as pb2
+from infra.image.preprocess_pool import PreparedImage
+
+
+class FakePool:
+    def __init__(self):
+        self.freed = []
+
+    def _free_slot(self, slot):
+        self.freed.append(slot)
+
+
+class FakeContext:
+    def set_code(self, code):
+        pass
+
+    def set_details(self, details):
+        pass
+
+    def time_remaining(self):
+        return None
+
+
+def test_prepared_image_freed_after_last_model(make_servicer):
+    servicer = make_servicer(MODELS="a=/dev/null,b=/dev/null", MODELS_PRELOAD="a,b")
+    pool = FakePool()
+    # imagem do pool de pré-processamento: uma só para todos os modelos do request
+    servicer._request_image = lambda request: PreparedImage(pool, 3, None, (4, 4), 1.0, (0, 0))
+    slow = servicer.registry.get("b")
+    slow.gate.clear()
+
+    request = pb2.InferMultiRequest(request_id="m-1", model_names=["a", "b", "nao_existe"])
+    out = []
+    rpc = threading.Thread(target=lambda: out.append(servicer.InferMulti(request, FakeContext())))
+    rpc.start()
+
+    # "a" já terminou, "b" ainda está com a imagem: o slot não pode voltar para o pool
+    time.sleep(0.05)
+    assert pool.freed == []
+
+    slow.gate.set()
+    rpc.join(5)
+    assert pool.freed == [3]  # uma vez só, depois do último modelo
+
+    resp = out[0]
+    assert resp.request_id == "m-1" and not resp.error
+    assert resp.results["a"].error == resp.results["b"].error == ""
+    assert resp.results["b"].model_name == "b"
+    # erro de um modelo vai só no resultado dele
+    assert "nao_existe" in resp.results["nao_existe"].error
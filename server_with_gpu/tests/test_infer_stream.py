@@ -0,0 +1,100 @@
+import threading
+import time
+
+from protos import inference_pb2 as pb2
+
+
+class StreamContext:
+    def is_active(self):
+        return True
+
+
+def frame(request_id: str, model_name: str = "") -> pb2.InferRequest:
+    raw = pb2.RawImage(width=4, height=4, channels=3, dtype="uint8", stride=12, data=bytes(48))
+    return pb2.InferRequest(raw_image=raw, request_id=request_id, model_name=model_name)
+
+
+class CountingIterator:
+    """Stream de entrada do cliente: conta quantos frames o servidor já leu; `error` no fim simula cancelamento."""
+
+    def __init__(self, requests, error: Exception = None):
+        self.requests = list(requests)
+        self.error = error
+        self.read = 0
+
+    def __iter__(self):
+        for req in self.requests:
+            self.read += 1
+            yield req
+        if self.error is not None:
+            raise self.error
+
+
+def wait_until(cond, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not cond() and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+
+def test_responses_echo_request_id_out_of_order(make_servicer):
+    servicer = make_servicer(MODELS="slow=/dev/null,fast=/dev/null", MODELS_PRELOAD="slow,fast")
+    slow = servicer.registry.get("slow")
+    slow.gate.clear()
+
+    requests = [frame("s-1", "slow"), frame("f-1", "fast"), frame("f-2", "fast"), frame("x-1", "nao_existe")]
+    responses = servicer.InferStream(iter(requests), StreamContext())
+
+    # o modelo "slow" travado não segura as respostas dos outros frames
+    first = [next(responses) for _ in range(3)]
+    assert sorted(r.request_id for r in first) == ["f-1", "f-2", "x-1"]
+    errors = {r.request_id: r.error for r in first}
+    assert errors["f-1"] == errors["f-2"] == ""
+    assert "nao_existe" in errors["x-1"]  # erro por frame, o stream continua
+
+    slow.gate.set()
+    last = list(responses)
+    assert [(r.request_id, r.model_name, r.error) for r in last] == [("s-1", "slow", "")]
+
+
+def test_in_flight_limit_stops_reading(make_servicer):
+    servicer = make_servicer(STREAM_MAX_IN_FLIGHT=2)
+    model = servicer.registry.get("fake")
+    model.gate.clear()
+
+    requests = CountingIterator(frame(f"r-{i}") for i in range(6))
+    responses = servicer.InferStream(requests, StreamContext())
+    got = []
+    consumer = threading.Thread(target=lambda: got.extend(responses), daemon=True)
+    consumer.start()
+
+    # 2 em voo + o 3o lido esperando vaga: o resto fica no cliente
+    wait_until(lambda: requests.read == 3)
+    time.sleep(0.05)
+    assert requests.read == 3
+
+    model.gate.set()
+    consumer.join(5)
+    assert sorted(r.request_id for r in got) == [f"r-{i}" for i in range(6)]
+
+
+def test_half_close_ends_stream_after_pending_responses(make_servicer):
+    servicer = make_servicer()
+    model = servicer.registry.get("fake")
+    model.gate.clear()
+
+    # cliente manda 3 e fecha o lado dele: as 3 respostas ainda saem, depois o stream termina
+    responses = servicer.InferStream(CountingIterator(frame(f"r-{i}") for i in range(3)), StreamContext())
+    threading.Timer(0.05, model.gate.set).start()
+
+    assert [r.request_id for r in responses] == ["r-0", "r-1", "r-2"]
+
+
+def test_read_error_ends_stream_after_submitted_frames(make_servicer):
+    servicer = make_servicer()
+
+    # leitura falha no meio (ex: cliente cancelou): o que já foi lido ainda recebe resposta
+    requests = CountingIterator([frame("r-0"), frame("r-1")], error=RuntimeError("stream cancelado"))
+    responses = list(servicer.InferStream(requests, StreamContext()))
+
+    assert sorted(r.request_id for r in responses) == ["r-0", "r-1"]
+    assert all(not r.error for r in responses)
@@ -0,0 +1,27 @@
+import time
+
+
+def test_batches_up_to_max_batch_size(make_batcher):
+    batcher, model = make_batcher(max_batch_size=4)
+    model.occupy(batcher)
+
+    futs = [batcher.submit(i) for i in range(10)]
+    model.gate.set()
+
+    # cada Future recebe a saída do próprio item, na ordem da entrada
+    assert [f.result(5) for f in futs] == [f"out-{i}" for i in range(10)]
+    assert [len(b) for b in model.batches] == [1, 4, 4, 2]
+
+
+def test_flushes_partial_batch_after_max_wait(make_batcher):
+    batcher, model = make_batcher(max_batch_size=8, max_wait_ms=50)
+
+    t0 = time.monotonic()
+    futs = [batcher.submit(i) for i in range(3)]
+    for f in futs:
+        f.result(5)
+    elapsed = time.monotonic() - t0
+
+    # lote incompleto sai sozinho depois da janela, com os 3 juntos
+    assert model.batches == [[0, 1, 2]]
+    assert 0.04 <= elapsed < 1.0
@@ -0,0 +1,93 @@
+import grpc
+import pytest
+
+from protos import inference_pb2 as pb2
+from infra.model.model_registry import ModelRegistry, UnknownModelError
+
+MB = 1024 * 1024
+
+
+@pytest.fixture
+def make_registry(stand_in_model):
+    """make_registry(budget_mb) -> (ModelRegistry de a/b/c com 1 MB cada, lista de modelos carregados)."""
+    registries = []
+
+    def make(memory_budget_mb: float = 0):
+        loads = []
+
+        def loader(name, path):
+            model = stand_in_model(name, path, memory_bytes=MB)
+            loads.append(model)
+            return model
+
+        paths = {"a": "/models/a.pt", "b": "/models/b.pt", "c": "/models/c.pt"}
+        registry = ModelRegistry(paths, loader, memory_budget_mb=memory_budget_mb)
+        registries.append(registry)
+        return registry, loads
+
+    yield make
+    for registry in registries:
+        registry.close()
+
+
+def test_loads_once_and_default_is_first(make_registry):
+    registry, loads = make_registry()
+    assert registry.get() is registry.get("a")
+    assert [m.name for m in loads] == ["a"]
+
+
+def test_evicts_least_recently_used_over_budget(make_registry):
+    registry, loads = make_registry(memory_budget_mb=2.5)
+    a, b = registry.get("a"), registry.get("b")
+    registry.get("a")  # "b" passa a ser o menos usado
+
+    registry.get("c")
+
+    assert registry.loaded_names() == ["a", "c"]
+    assert b.closed and not a.closed
+
+
+def test_reloads_after_eviction(make_registry):
+    registry, loads = make_registry(memory_budget_mb=1)
+    first = registry.get("a")
+    registry.get("b")  # orçamento de 1 modelo: "a" sai
+    assert first.closed
+
+    again = registry.get("a")
+    assert again is not first and not again.closed
+    assert [m.name for m in loads] == ["a", "b", "a"]
+    model, fut = registry.submit("a", (None, 0.25))
+    assert model is again and fut.result(5)
+
+
+def test_unknown_model(make_registry):
+    registry, loads = make_registry()
+    with pytest.raises(UnknownModelError):
+        registry.get("nao_existe")
+    with pytest.raises(UnknownModelError):
+        registry.check_admission("nao_existe")
+    assert loads == []
+
+
+class FakeContext:
+    code = None
+
+    def set_code(self, code):
+        self.code = code
+
+    def set_details(self, details):
+        pass
+
+    def time_remaining(self):
+        return None
+
+
+def test_unknown_model_is_not_found(make_servicer):
+    servicer = make_servicer()
+    raw = pb2.RawImage(width=4, height=4, channels=3, dtype="uint8", stride=12, data=bytes(48))
+    context = FakeContext()
+
+    resp = servicer.Infer(pb2.InferRequest(raw_image=raw, model_name="nao_existe"), context)
+
+    assert context.code == grpc.StatusCode.NOT_FOUND
+    assert "nao_existe" in resp.error
@@ -0,0 +1,76 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from protos import inference_pb2 as pb2
+from infra.model.postprocess import boxes_to_packed_pb2, boxes_to_pb2
+
+NAMES = {0: "risco", 1: "mancha"}
+
+
+class FakeTensor:
+    """result.boxes.data de teste: só o caminho detach().cpu().numpy()."""
+
+    def __init__(self, rows):
+        self._data = np.array(rows, dtype=np.float32).reshape(-1, 6)
+
+    def detach(self):
+        return self
+
+    def cpu(self):
+        return self
+
+    def numpy(self):
+        return self._data
+
+    def __len__(self):
+        return len(self._data)
+
+
+def fake_result(rows):
+    class Boxes:
+        def __init__(self):
+            self.data = FakeTensor(rows)
+
+        def __len__(self):
+            return len(self.data)
+
+    return SimpleNamespace(boxes=Boxes())
+
+
+# x1, y1, x2, y2, conf, cls
+ROWS = [
+    [10, 20, 30, 60, 0.9, 0],
+    [0, 0, 5, 5, 0.2, 1],  # abaixo do conf
+    [100, 50, 150, 80, 0.5, 1],
+]
+
+
+def test_packed_matches_list_encoding():
+    r = fake_result(ROWS)
+    boxes = boxes_to_pb2(r, NAMES, 0.25)
+    packed = boxes_to_packed_pb2(r, 0.25)
+
+    assert [(b.x, b.y, b.w, b.h) for b in boxes] == [(10, 20, 20, 40), (100, 50, 50, 30)]
+    assert list(zip(packed.x, packed.y, packed.w, packed.h)) == [(b.x, b.y, b.w, b.h) for b in boxes]
+    assert list(packed.class_id) == [b.class_id for b in boxes] == [0, 1]
+    assert np.allclose(packed.confidence, [b.confidence for b in boxes])
+    assert [b.label for b in boxes] == ["risco", "mancha"]
+
+
+def test_packed_is_smaller_on_the_wire():
+    rows = [[i, i, i + 10, i + 10, 0.9, i % 2] for i in range(100)]
+    r = fake_result(rows)
+    as_list = pb2.InferResponse(list_bbox=boxes_to_pb2(r, NAMES, 0.25))
+    as_packed = pb2.InferResponse(packed_bbox=boxes_to_packed_pb2(r, 0.25))
+
+    assert len(as_packed.packed_bbox.x) == 100
+    # sem tag/tamanho de submensagem nem label por box
+    assert as_packed.ByteSize() < as_list.ByteSize()
+
+
+def test_no_detections():
+    for r in (SimpleNamespace(boxes=None), fake_result([])):
+        assert boxes_to_pb2(r, NAMES, 0.25) == []
+        packed = boxes_to_packed_pb2(r, 0.25)
+        assert len(packed.x) == len(packed.class_id) == 0
@@ -0,0 +1,54 @@
+import cv2
+import numpy as np
+import pytest
+
+from infra.image.preprocess_pool import PreprocessPool
+from infra.model import loaded_model
+from infra.model.loaded_model import LoadedModel
+
+SLOTS = 2
+
+
+class FailingYOLO:
+    """YOLO de teste: sem pesos e com predict que sempre falha."""
+
+    def __init__(self, path):
+        self.model = self
+        self.names = {0: "defeito"}
+
+    def parameters(self):
+        return []
+
+    def buffers(self):
+        return []
+
+    def predict(self, **kwargs):
+        raise RuntimeError("predict falhou")
+
+
+@pytest.fixture
+def pool():
+    pool = PreprocessPool(num_workers=1, imgsz=32, slots=SLOTS)
+    yield pool
+    pool.close()
+
+
+@pytest.fixture
+def model(monkeypatch):
+    monkeypatch.setattr(loaded_model, "YOLO", FailingYOLO)
+    model = LoadedModel("release-test", "/dev/null", imgsz=32, device="cpu")
+    yield model
+    model.close()
+
+
+def test_failed_mixed_batch_frees_prepared_slots(pool, model):
+    ok, jpeg = cv2.imencode(".jpg", np.zeros((16, 16, 3), dtype=np.uint8))
+    prepared = [pool.prepare(jpeg.tobytes()) for _ in range(SLOTS)]
+    assert pool._free.qsize() == 0
+
+    # o predict dos ndarrays falha antes de chegar aos PreparedImage
+    items = [(np.zeros((16, 16, 3), dtype=np.uint8), 0.25)] + [(p, 0.25) for p in prepared]
+    with pytest.raises(RuntimeError):
+        model._predict_batch(items)
+
+    assert pool._free.qsize() == SLOTS
@@ -0,0 +1,81 @@
+import time
+
+from prometheus_client import REGISTRY
+
+from protos import inference_pb2 as pb2
+from infra.model.result_cache import ResultCache, image_digest
+from monitoring.prometheus_metrics import track_result_cache
+
+
+def raw_request(**layout) -> pb2.InferRequest:
+    raw = dict(width=2, height=1, channels=1, dtype="uint16", stride=4, data=b"\x00\x01\x00\x02")
+    raw.update(layout)
+    return pb2.InferRequest(raw_image=pb2.RawImage(**raw))
+
+
+def test_raw_digest_depends_on_layout():
+    base = image_digest(raw_request(bit_depth=12))
+    assert image_digest(raw_request(bit_depth=12)) == base
+    # mesmos bytes, decode diferente: chaves diferentes
+    assert image_digest(raw_request(bit_depth=8)) != base
+    assert image_digest(raw_request(bit_depth=12, width=1, stride=4, height=2)) != base
+    assert image_digest(raw_request(bit_depth=12, dtype="uint8", width=4)) != base
+
+
+def test_lru_evicts_least_recently_used():
+    cache = ResultCache(max_entries=2, ttl_ms=0)
+    cache.put("a", "A", 1)
+    cache.put("b", "B", 1)
+    assert cache.get("a") == "A"  # "b" passa a ser o menos usado
+    cache.put("c", "C", 1)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    assert cache.get("c") == "C"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entry_expires_after_ttl():
+    cache = ResultCache(ttl_ms=20)
+    cache.put("a", "A", 1)
+    assert cache.get("a") == "A"
+    time.sleep(0.05)
+
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert (stats["entries"], stats["expirations"], stats["hits"], stats["misses"]) == (0, 1, 1, 1)
+
+
+def test_max_bytes_bounds_memory():
+    cache = ResultCache(max_bytes=100, ttl_ms=0)
+    cache.put("big", "X", 101)  # maior que o cache inteiro: nem entra
+    assert cache.get("big") is None
+
+    for i in range(5):
+        cache.put(i, i, 40)
+    stats = cache.stats()
+    assert stats["bytes"] <= 100
+    assert (stats["entries"], stats["evictions"]) == (2, 3)
+    assert cache.get(3) == 3 and cache.get(4) == 4
+
+    # mesma chave de novo: troca o tamanho, não soma
+    cache.put(4, 4, 10)
+    assert cache.stats()["bytes"] == 50
+
+
+def test_counters_exported_to_prometheus():
+    cache = ResultCache(max_entries=1, ttl_ms=0)
+    track_result_cache(cache)
+    try:
+        cache.put("a", "A", 1)
+        cache.get("a")
+        cache.get("b")
+        cache.put("b", "B", 1)
+
+        sample = REGISTRY.get_sample_value
+        assert sample("inference_result_cache_hits_total") == 1
+        assert sample("inference_result_cache_misses_total") == 1
+        assert sample("inference_result_cache_evictions_total") == 1
+        assert sample("inference_result_cache_expirations_total") == 0
+    finally:
+        track_result_cache(None)
@@ -0,0 +1,193 @@
+import sys
+import threading
+import time
+import uuid
+from multiprocessing import resource_tracker, shared_memory
+
+import grpc
+import numpy as np
+import pytest
+
+from protos import inference_pb2 as pb2
+from infra.grpc.inference_methods import InferenceMethods
+from infra.image.shared_frames import SLOT_HEADER_BYTES, SharedFrameImage
+from infra.model.micro_batcher import MicroBatcher
+
+SLOTS = 2
+SLOT_BYTES = 64
+
+
+class FakeModel:
+    """Só o que o servicer usa antes do predict: nome e batcher (modelo travado num Event)."""
+
+    def __init__(self, name: str, path: str, max_pending: int):
+        self.name = name
+        self.path = path
+        self.memory_bytes = 0
+        self.gate = threading.Event()
+        self.batcher = MicroBatcher(self._predict, max_batch_size=1, max_wait_ms=0, max_pending=max_pending)
+
+    def _predict(self, items):
+        self.gate.wait(5)
+        return items
+
+    def close(self):
+        self.gate.set()
+        self.batcher.close()
+
+
+class FakeContext:
+    def __init__(self, time_remaining=None):
+        self._time_remaining = time_remaining
+        self.code = None
+
+    def set_code(self, code):
+        self.code = code
+
+    def set_details(self, details):
+        pass
+
+    def time_remaining(self):
+        return self._time_remaining
+
+
+@pytest.fixture
+def servicer(monkeypatch):
+    monkeypatch.setenv("MODELS", "fake=/dev/null")
+    monkeypatch.setenv("USE_GPU", "false")
+    monkeypatch.setenv("BATCH_MAX_PENDING", "1")
+    monkeypatch.setattr(InferenceMethods, "_load_model", lambda self, name, path: FakeModel(name, path, 1))
+    svc = InferenceMethods()
+    yield svc
+    svc.close()
+
+
+@pytest.fixture
+def segment(servicer):
+    """Segmento do "cliente" com SLOTS slots, registrado no servicer."""
+    stride = SLOT_HEADER_BYTES + SLOT_BYTES
+    shm = shared_memory.SharedMemory(name=f"test_{uuid.uuid4().hex[:16]}", create=True, size=SLOTS * stride)
+    headers = np.ndarray((SLOTS, 2), dtype=np.uint64, buffer=shm.buf, strides=(stride, 8))
+    headers[:] = 0
+    segment_id = servicer.shared_frames.register(shm.name, SLOTS, SLOT_BYTES)
+    if sys.version_info < (3, 13):
+        # o attach do servidor (aqui no mesmo processo) tira o segmento do resource_tracker
+        resource_tracker.register(shm._name, "shared_memory")
+    yield segment_id, headers
+    # o que ainda estiver registrado sai no shared_frames.close() do servicer
+    del headers
+    shm.close()
+    shm.unlink()
+
+
+def publish(segment, slot: int, seq: int) -> pb2.SharedFrame:
+    segment_id, headers = segment
+    headers[slot, 0] = seq
+    layout = pb2.RawImage(width=4, height=4, channels=3, dtype="uint8", stride=12)
+    return pb2.SharedFrame(segment_id=segment_id, slot=slot, seq=seq, layout=layout)
+
+
+def fill_queue(servicer) -> FakeModel:
+    # um item preso no modelo + um na fila: BATCH_MAX_PENDING=1 cheio
+    model = servicer.registry.get("fake")
+    model.batcher.submit("running")
+    while model.batcher.pending_count:
+        time.sleep(0.001)
+    model.batcher.submit("queued")
+    return model
+
+
+@pytest.mark.parametrize("model_name", ["nao_existe", "fake"])
+def test_rejected_shared_frame_releases_slot(servicer, segment, model_name):
+    if model_name == "fake":
+        fill_queue(servicer)
+        expected = grpc.StatusCode.RESOURCE_EXHAUSTED
+    else:
+        expected = grpc.StatusCode.NOT_FOUND
+
+    _, headers = segment
+    # mais recusas que slots: sem a liberação o anel do cliente travaria
+    for seq in range(1, 2 * SLOTS + 1):
+        slot = seq % SLOTS
+        assert headers[slot, 0] == headers[slot, 1], "slot ainda preso pelo request anterior"
+        frame = publish(segment, slot, seq)
+
+        context = FakeContext()
+        resp = servicer.Infer(pb2.InferRequest(shared_frame=frame, model_name=model_name), context)
+
+        assert context.code == expected
+        assert resp.error
+        assert headers[slot, 1] == seq
+
+
+def test_deadline_rejected_shared_frame_releases_slot(servicer, segment):
+    model = servicer.registry.get("fake")
+    # um lote de ~50 ms: a espera estimada passa a ser maior que o prazo de 1 ms abaixo
+    threading.Timer(0.05, model.gate.set).start()
+    model.batcher.submit("slow").result(5)
+
+    frame = publish(segment, 0, 1)
+    context = FakeContext(time_remaining=0.001)
+    servicer.Infer(pb2.InferRequest(shared_frame=frame, model_name="fake"), context)
+
+    assert context.code == grpc.StatusCode.RESOURCE_EXHAUSTED
+    _, headers = segment
+    assert headers[0, 1] == 1
+
+
+def test_release_after_unregister_is_noop(servicer, segment):
+    segment_id, _ = segment
+    img = servicer.shared_frames.open(publish(segment, 0, 1))
+    assert isinstance(img, SharedFrameImage)
+
+    # cliente desregistra com o frame ainda num lote: o release depois do predict não pode falhar
+    servicer.shared_frames.unregister(segment_id)
+    img.release()
+
+
+def test_open_bgr_is_view_until_release(servicer, segment):
+    _, headers = segment
+    frame = publish(segment, 1, 5)
+    img = servicer.shared_frames.open(frame)
+
+    assert isinstance(img, SharedFrameImage)
+    assert img.img.shape == (4, 4, 3)
+    assert headers[1, 1] == 0  # preso até o predict terminar
+    img.release()
+    assert headers[1, 1] == 5
+
+
+def test_open_mono_releases_slot_at_once(servicer, segment):
+    _, headers = segment
+    frame = publish(segment, 0, 3)
+    frame.layout.CopyFrom(pb2.RawImage(width=4, height=4, channels=1, dtype="uint8", stride=4))
+    img = servicer.shared_frames.open(frame)
+
+    assert not isinstance(img, SharedFrameImage)
+    assert headers[0, 1] == 3
+
+
+def test_release_unopened_frame(servicer, segment):
+    _, headers = segment
+    frame = publish(segment, 0, 2)
+    servicer.shared_frames.release(frame)
+    assert headers[0, 1] == 2
+
+    # segmento desconhecido ou slot fora do segmento: nada a fazer
+    servicer.shared_frames.release(pb2.SharedFrame(segment_id="nao_existe", slot=0, seq=3))
+    servicer.shared_frames.release(pb2.SharedFrame(segment_id=frame.segment_id, slot=SLOTS, seq=3))
+
+
+@pytest.mark.parametrize("request_seq", [1, 3])
+def test_stale_seq_is_invalid_argument(servicer, segment, request_seq):
+    _, headers = segment
+    frame = publish(segment, 0, 2)  # o cliente já escreveu o seq 2 no slot
+    frame.seq = request_seq
+
+    context = FakeContext()
+    resp = servicer.Infer(pb2.InferRequest(shared_frame=frame, model_name="fake"), context)
+
+    assert context.code == grpc.StatusCode.INVALID_ARGUMENT
+    assert resp.error
+    # nem o seq atrasado nem o adiantado podem liberar o frame 2, ainda do cliente
+    assert headers[0, 1] == 0